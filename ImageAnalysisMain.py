@@ -1,64 +1,286 @@
 # ImageAnalysisMain.py
+import logging
+from contextlib import contextmanager
+from functools import partial
 from pathlib import Path
 
-from utils.ImageLoader import load_image
-from utils.Binarization import binarize_and_fill
-from utils.ContourProcessing import find_main_contour
+import pandas as pd
+
+from utils.ImageLoader import load_image, LeitorImagens, PROFUNDIDADE_LEITURA
+from utils.Binarization import binarize, fill_holes, binarize_and_fill
+from utils.ContourProcessing import find_main_contour, find_all_contours, MARGEM_ROI
 from utils.ShapeDescriptors import compute_descriptors
+from utils.DescriptorEngine import DESCRITORES, descritores_objetos, parametros_engine
+from utils.DescriptorCache import hash_conteudo
+from utils.Checkpoints import (CheckpointsEtapas, ETAPAS, codificar_segmentacao, decodificar_segmentacao,
+                               codificar_cantos, decodificar_cantos, codificar_distancias, decodificar_distancias)
+from utils.Thresholding import LIMIAR_FIXO, BLOCO_ADAPTATIVO, C_ADAPTATIVO
 from utils.Transformations import generate_transformations, compare_transformations
-from utils.Visualization import plot_full_analysis
+from utils.Visualization import plot_full_analysis, RenderizadorRelatorios, modo_headless
+from utils.Dataset import descobrir_imagens
+from utils.LogConfig import configurar_log
 
+logger = logging.getLogger(__name__)
 
-def analisar_imagem_detalhada(img_path: str):
-    print("=" * 80)
-    print(f"ANÁLISE DETALHADA DA IMAGEM: {Path(img_path).name}")
-    print("=" * 80)
 
-    # 1. carregar
-    img_original, img_gray, mean_val = load_image(img_path)
+def _parametros_etapas(modo_cantos="harris", usar_roi=False, backend="contornos", modo_limiar="fixo", reducao=1):
+    """Parâmetros que alteram cada etapa (e as anteriores), para a chave dos checkpoints"""
+    segmentacao = {
+        "modo_limiar": modo_limiar,
+        "limiar": LIMIAR_FIXO,
+        "bloco_adaptativo": BLOCO_ADAPTATIVO,
+        "c_adaptativo": C_ADAPTATIVO,
+        "backend": backend,
+        "usar_roi": usar_roi,
+        "margem_roi": MARGEM_ROI,
+        "reducao": reducao,
+    }
+    motor = {chave: valor for chave, valor in parametros_engine().items() if chave != "descritores"}
+    cantos = {**segmentacao, "modo_cantos": modo_cantos, **motor}
+    return {
+        "segmentacao": segmentacao,
+        "cantos": cantos,
+        # ROI nas transformações: imagem inteira transformada, recorte só no preenchimento e no Harris
+        "transformacoes": {**cantos, "descritores": list(DESCRITORES), "roi_transformacoes": "imagem_inteira"},
+    }
+
+
+def _segmentar(img_gray, intensidade, usar_roi=False, backend="contornos", modo_limiar="fixo"):
+    """Etapas 2-4: (binary, binary_filled, contorno_info); None se não houver contorno"""
+    if usar_roi:
+        # 2/3. modo ROI: o contorno externo não muda com o preenchimento de
+        # buracos, então o contorno sai da imagem binária e só a região do
+        # objeto é preenchida
+        logger.info("\n[2] BINARIZAÇÃO (ROI)...")
+        binary = binarize(img_gray, intensidade, modo_limiar)
+        contorno_info = find_main_contour(binary, img_gray, backend)
+        if contorno_info is None:
+            return None
+        binary_filled = fill_holes(binary, roi=contorno_info["bbox"])
+    else:
+        # 2. binarizar
+        binary, binary_filled, bbox = binarize_and_fill(img_gray, intensidade, backend, modo_limiar, com_bbox=True)
+
+        # 3. contorno
+        contorno_info = find_main_contour(binary_filled, img_gray, backend, bbox)
+        if contorno_info is None:
+            return None
+    return binary, binary_filled, contorno_info
+
+
+def _analisar(img_path, modo_cantos="harris", usar_roi=False, backend="contornos", modo_limiar="fixo",
+              reducao=1, carregada=None, checkpoints=None, refazer=None):
+    """
+    Etapas 1-6 de uma imagem; retorna os argumentos de criar_figura_analise (None se falhar).
+    carregada: resultado de load_image já lido (leitura antecipada).
+    checkpoints: CheckpointsEtapas; as etapas já gravadas (ETAPAS, ver utils/Checkpoints.py)
+    são retomadas e as que faltam são calculadas e gravadas. refazer: etapa a partir da
+    qual os checkpoints são ignorados e regravados (ex.: "cantos" depois de mudar o detector).
+    """
+    if refazer is not None and refazer not in ETAPAS:
+        raise ValueError(f"refazer deve ser uma de {ETAPAS}, recebido: {refazer!r}")
+
+    # 1. carregar (com o histograma, reaproveitado pela binarização e pelas transformações)
+    if carregada is None:
+        carregada = load_image(img_path, reducao=reducao)
+    img_original, img_gray, intensidade = carregada
     if img_gray is None:
-        return
+        return None
 
-    # 2. binarizar
-    binary, binary_filled = binarize_and_fill(img_gray, mean_val)
+    parametros = _parametros_etapas(modo_cantos, usar_roi, backend, modo_limiar, reducao)
+    retomaveis = ETAPAS[:ETAPAS.index(refazer)] if refazer is not None else ETAPAS
+    h = hash_conteudo(img_path) if checkpoints is not None else None
 
-    # 3. contorno
-    contorno_info = find_main_contour(binary_filled, img_gray)
-    if contorno_info is None:
-        return
+    def retomar(etapa):
+        if checkpoints is None or etapa not in retomaveis:
+            return None
+        return checkpoints.obter(h, etapa, parametros[etapa])
 
-    # 4/5. descritores
-    descritores, coords = compute_descriptors(contorno_info, binary_filled, img_gray)
+    def gravar(etapa, dados):
+        if checkpoints is not None:
+            checkpoints.guardar(h, etapa, parametros[etapa], dados)
 
-    # 6. transformações
-    transformacoes = generate_transformations(img_gray, mean_val)
-    distancias_trans = compare_transformations(
-        transformacoes,
-        contorno_info["img_area"],
-        descritores
+    # 2-4. binarização e contorno
+    dados = retomar("segmentacao")
+    if dados is not None:
+        segmentacao = decodificar_segmentacao(dados)
+    else:
+        segmentacao = _segmentar(img_gray, intensidade, usar_roi, backend, modo_limiar)
+        gravar("segmentacao", codificar_segmentacao(*(segmentacao or (None, None, None))))
+    if segmentacao is None:
+        return None
+    binary, binary_filled, contorno_info = segmentacao
+
+    # 4/5. descritores (sempre recalculados: são baratos a partir das primitivas e dos cantos)
+    dados = retomar("cantos")
+    descritores, coords = compute_descriptors(
+        contorno_info, binary_filled, img_gray, modo_cantos=modo_cantos,
+        roi_margem=MARGEM_ROI if usar_roi else None,
+        coords=decodificar_cantos(dados) if dados is not None else None
     )
+    if dados is None:
+        gravar("cantos", codificar_cantos(coords))
+
+    # 6. transformações
+    transformacoes = generate_transformations(img_gray, intensidade)
+    dados = retomar("transformacoes")
+    if dados is not None:
+        distancias_trans = decodificar_distancias(dados)
+    else:
+        distancias_trans = compare_transformations(
+            transformacoes,
+            transformacoes["Original"].size,
+            descritores,
+            modo_cantos=modo_cantos,
+            intensidade=intensidade,
+            modo_limiar=modo_limiar,
+            usar_roi=usar_roi
+        )
+        gravar("transformacoes", codificar_distancias(distancias_trans))
+
+    return {
+        "img_path": img_path,
+        "img_original": img_original,
+        "img_gray": img_gray,
+        "binary": binary,
+        "binary_filled": binary_filled,
+        "contorno_info": contorno_info,
+        "descritores": descritores,
+        "coords": coords,
+        "transformacoes": transformacoes,
+        "distancias_trans": distancias_trans,
+    }
+
+
+@contextmanager
+def _abrir_checkpoints(checkpoints):
+    # caminho: abre e fecha aqui; objeto (ou None): usado como está
+    if not isinstance(checkpoints, (str, Path)):
+        yield checkpoints
+        return
+    with CheckpointsEtapas(checkpoints) as aberto:
+        yield aberto
+
+
+def analisar_imagem_detalhada(img_path: str, modo_cantos: str = "harris", usar_roi: bool = False, saida=None,
+                              backend: str = "contornos", modo_limiar: str = "fixo", reducao: int = 1,
+                              checkpoints=None, refazer=None):
+    """
+    saida: caminho .png/.svg da figura (None abre a janela do matplotlib).
+    backend: segmentação "contornos" ou "componentes" (ver utils/ContourProcessing.py).
+    modo_limiar: binarização "fixo", "otsu" ou "adaptativo" (ver utils/Thresholding.py).
+    reducao: 1, 2, 4 ou 8; decodifica a imagem em resolução reduzida (ver utils/ImageLoader.py).
+    checkpoints: caminho (SQLite) ou CheckpointsEtapas; retoma as etapas já gravadas
+    (ver utils/Checkpoints.py). refazer: etapa a partir da qual recalcular.
+    """
+    print("=" * 80)
+    print(f"ANÁLISE DETALHADA DA IMAGEM: {Path(img_path).name}")
+    print("=" * 80)
+
+    with _abrir_checkpoints(checkpoints) as checkpoints:
+        dados = _analisar(img_path, modo_cantos, usar_roi, backend, modo_limiar, reducao,
+                          checkpoints=checkpoints, refazer=refazer)
+    if dados is None:
+        return
 
     # 7. visualização
-    plot_full_analysis(
-        img_path,
-        img_original,
-        img_gray,
-        binary,
-        binary_filled,
-        contorno_info,
-        descritores,
-        coords,
-        transformacoes,
-        distancias_trans
-    )
+    plot_full_analysis(**dados, saida=saida)
 
     print("\n" + "=" * 80)
     print("ANÁLISE CONCLUÍDA!")
     print("=" * 80)
 
-    return descritores, distancias_trans
+    return dados["descritores"], dados["distancias_trans"]
+
+
+def analisar_dataset(dataset_path, pasta_relatorios, formato="png", n_workers_render=1,
+                     modo_cantos="harris", usar_roi=False, usar_modelo=True, backend="contornos",
+                     modo_limiar="fixo", reducao=1, profundidade_leitura=PROFUNDIDADE_LEITURA,
+                     checkpoints=None, refazer=None):
+    """
+    Relatório (figura completa) de cada imagem do dataset, gravado em
+    pasta_relatorios/<imagem>.<formato>. As figuras são geradas por um pool
+    de processos em segundo plano enquanto as próximas imagens são analisadas.
+    Retorna um DataFrame com descritores, distâncias e tempo de renderização.
+    usar_modelo: reaproveita a mesma figura entre relatórios PNG (ModeloRelatorio).
+    backend: segmentação "contornos" ou "componentes" (ver utils/ContourProcessing.py).
+    modo_limiar: binarização "fixo", "otsu" ou "adaptativo" (ver utils/Thresholding.py).
+    reducao: 1, 2, 4 ou 8; decodifica as imagens em resolução reduzida (ver utils/ImageLoader.py).
+    profundidade_leitura: imagens carregadas antecipadamente em threads (LeitorImagens).
+    checkpoints: caminho (SQLite) ou CheckpointsEtapas com os resultados intermediários;
+    numa segunda execução só as etapas que faltam (ou a partir de refazer) são calculadas.
+    """
+    linhas = []
+    leitor = LeitorImagens(descobrir_imagens(dataset_path), profundidade_leitura,
+                           carregar=partial(load_image, reducao=reducao))
+    with _abrir_checkpoints(checkpoints) as checkpoints, \
+            RenderizadorRelatorios(pasta_relatorios, formato, n_workers_render,
+                                   usar_modelo=usar_modelo) as renderizador:
+        for img_path, carregada in leitor:
+            dados = _analisar(img_path, modo_cantos, usar_roi, backend, modo_limiar, reducao, carregada,
+                              checkpoints, refazer)
+            if dados is None:
+                logger.warning("Sem contorno, relatório não gerado: %s", img_path)
+                continue
+            caminho = renderizador.submeter(Path(img_path).stem, **dados)
+            linhas.append({"Imagem": Path(img_path).name, "Relatorio": caminho,
+                           **dados["descritores"], **dados["distancias_trans"]})
+
+    logger.info("Leitura: %d imagens, %.0f ms esperando o disco", leitor.lidas, leitor.espera_ms)
+    if checkpoints is not None:
+        logger.info("Checkpoints: %d etapas retomadas, %d calculadas (%.1f KiB gravados)",
+                    checkpoints.acertos, checkpoints.gravadas, checkpoints.bytes_gravados / 1024)
+    tempos = renderizador.tempos_ms
+    df = pd.DataFrame(linhas)
+    df["Render_ms"] = [tempos.get(caminho) for caminho in df["Relatorio"]]
+    return df
+
+
+def analisar_objetos(img_path, modo_cantos="contorno", modo_limiar="fixo", reducao=1):
+    """
+    Modo multiobjeto: descritores de cada objeto da imagem (find_all_contours),
+    um por linha, do maior para o menor. Retorna um DataFrame (None se a imagem falhar).
+    """
+    # só o cinza é usado: decodifica direto em cinza
+    _, img_gray, intensidade = load_image(img_path, cor=False, reducao=reducao)
+    if img_gray is None:
+        return None
+    binary, binary_filled = binarize_and_fill(img_gray, intensidade, modo_limiar=modo_limiar)
+    objetos = find_all_contours(binary_filled, img_gray)
+
+    df = pd.DataFrame(descritores_objetos(objetos, modo_cantos), columns=list(DESCRITORES))
+    df.insert(0, "Objeto", range(len(objetos)))
+    df.insert(1, "Area", [objeto["area"] for objeto in objetos])
+    df.insert(2, "BBox", [objeto["bbox"] for objeto in objetos])
+    return df
 
 
 if __name__ == "__main__":
     caminho_imagem = "Kimia99_DB/trainimage1_2.png"
-    analisar_imagem_detalhada(caminho_imagem)
+    modo_log = "normal"  # "detalhado" mostra a área de cada contorno; "silencioso" só avisos
+
+    # relatórios de todas as imagens em arquivos (sem janelas); None = só a imagem acima
+    pasta_relatorios = None  # ex.: "relatorios"
+    formato = "png"          # ou "svg"
+    n_workers_render = 2
+    usar_modelo = True       # False = monta cada figura do zero (mais lento)
+    backend = "contornos"    # "componentes" = componentes conexos (bem mais rápido em imagens grandes)
+    modo_limiar = "fixo"     # "otsu" ou "adaptativo" (iluminação desigual, digitalizações)
+    reducao = 1              # 2, 4 ou 8 = decodifica em resolução reduzida (digitalizações grandes)
+    checkpoints = None       # ex.: "checkpoints.sqlite" = retoma segmentação, cantos e distâncias já calculados
+    refazer = None           # "segmentacao", "cantos" ou "transformacoes" = recalcula a partir dessa etapa
+
+    if pasta_relatorios is None:
+        resumo_log = configurar_log(modo_log)
+        analisar_imagem_detalhada(caminho_imagem, backend=backend, modo_limiar=modo_limiar,
+                                  reducao=reducao, checkpoints=checkpoints, refazer=refazer)
+    else:
+        modo_headless()
+        resumo_log = configurar_log("silencioso")
+        df = analisar_dataset("Kimia99_DB", pasta_relatorios, formato, n_workers_render,
+                              usar_modelo=usar_modelo, backend=backend, modo_limiar=modo_limiar,
+                              reducao=reducao, checkpoints=checkpoints, refazer=refazer)
+        df.to_csv(Path(pasta_relatorios) / "resumo.csv", index=False)
+        print(f"{len(df)} relatórios em {pasta_relatorios}/ (renderização por figura: "
+              f"p50 {df['Render_ms'].median():.0f} ms, p95 {df['Render_ms'].quantile(0.95):.0f} ms)")
+    print("\n" + resumo_log.texto())
@@ -0,0 +1,96 @@
+import argparse
+import json
+import pickle
+import platform
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import cv2
+
+from benchmarks.bench_pipeline import _versao_git
+from ImageAnalysisMain import _analisar
+from utils.Checkpoints import CheckpointsEtapas, codificar_segmentacao, codificar_cantos, ETAPAS
+from utils.Dataset import listar_imagens
+from utils.ImageLoader import load_image
+from utils.LogConfig import configurar_log
+
+# ============================================
+# BENCHMARK DOS CHECKPOINTS
+# ============================================
+
+def medir(carregadas, opcoes, checkpoints=None, refazer=None):
+    """Tempo (ms) das etapas 2-6 de todas as imagens, já carregadas"""
+    inicio = time.perf_counter()
+    for img_path, carregada in carregadas:
+        _analisar(img_path, **opcoes, carregada=carregada, checkpoints=checkpoints, refazer=refazer)
+    return (time.perf_counter() - inicio) * 1000
+
+
+def tamanhos(carregadas, opcoes):
+    """Bytes por imagem: formato compacto x pickle dos mesmos objetos"""
+    compacto, bruto = 0, 0
+    for img_path, carregada in carregadas:
+        dados = _analisar(img_path, **opcoes, carregada=carregada)
+        if dados is None:
+            continue
+        compacto += len(codificar_segmentacao(dados["binary"], dados["binary_filled"], dados["contorno_info"]))
+        compacto += len(codificar_cantos(dados["coords"]))
+        bruto += len(pickle.dumps((dados["binary"], dados["binary_filled"], dados["contorno_info"], dados["coords"])))
+    return compacto / len(carregadas), bruto / len(carregadas)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Análise detalhada: do zero x retomada dos checkpoints")
+    parser.add_argument("--dataset", default="./Kimia99_DB")
+    parser.add_argument("--modo-cantos", default="harris")
+    parser.add_argument("--saida", default="bench_results")
+    parser.add_argument("--rotulo", default="", help="sufixo do arquivo de resultados")
+    args = parser.parse_args()
+
+    resumo_log = configurar_log("silencioso")
+    # carregamento fora da medição: os checkpoints não mudam a leitura
+    carregadas = [(img_path, load_image(img_path)) for img_path in listar_imagens(args.dataset)]
+    opcoes = {"modo_cantos": args.modo_cantos}
+    medir(carregadas[:5], opcoes)  # aquecimento (imports e alocações da primeira chamada)
+
+    resultados = {"imagens": len(carregadas), "sem_checkpoints_ms": medir(carregadas, opcoes)}
+    with tempfile.TemporaryDirectory() as pasta_tmp, \
+            CheckpointsEtapas(Path(pasta_tmp) / "checkpoints.sqlite") as checkpoints:
+        resultados["gravando_ms"] = medir(carregadas, opcoes, checkpoints)
+        checkpoints.salvar()
+        resultados["retomando_ms"] = medir(carregadas, opcoes, checkpoints)
+        for etapa in ETAPAS:
+            resultados[f"refazendo_{etapa}_ms"] = medir(carregadas, opcoes, checkpoints, refazer=etapa)
+        resultados["sqlite_kib"] = (Path(pasta_tmp) / "checkpoints.sqlite").stat().st_size / 1024
+    resultados["compacto_bytes_por_imagem"], resultados["pickle_bytes_por_imagem"] = tamanhos(carregadas, opcoes)
+
+    print(f"\n{len(carregadas)} imagens, cantos {args.modo_cantos} (etapas 2-6, sem leitura):")
+    print(f"   sem checkpoints          {resultados['sem_checkpoints_ms']:8.0f} ms")
+    print(f"   gravando                 {resultados['gravando_ms']:8.0f} ms")
+    print(f"   retomando tudo           {resultados['retomando_ms']:8.0f} ms")
+    for etapa in ETAPAS:
+        print(f"   refazendo {etapa:<14} {resultados[f'refazendo_{etapa}_ms']:8.0f} ms")
+    print(f"   por imagem: {resultados['compacto_bytes_por_imagem']:.0f} bytes "
+          f"(pickle: {resultados['pickle_bytes_por_imagem']:.0f}); SQLite {resultados['sqlite_kib']:.0f} KiB")
+
+    saida = Path(args.saida)
+    saida.mkdir(parents=True, exist_ok=True)
+    nome = datetime.now().strftime("%Y%m%d_%H%M%S") + "_checkpoints" + (f"_{args.rotulo}" if args.rotulo else "")
+    with open(saida / f"{nome}.json", "w", encoding="utf-8") as f:
+        json.dump({
+            "data": datetime.now().isoformat(timespec="seconds"),
+            "git": _versao_git(),
+            "plataforma": platform.platform(),
+            "opencv": cv2.__version__,
+            "argumentos": vars(args),
+            "resultados": resultados,
+        }, f, indent=2, ensure_ascii=False)
+
+    print("\n" + resumo_log.texto())
+    print(f"\nResultados salvos em {saida / nome}.json")
+
+
+if __name__ == "__main__":
+    main()
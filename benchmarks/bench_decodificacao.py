@@ -0,0 +1,114 @@
+import argparse
+import json
+import platform
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from benchmarks.bench_pipeline import gerar_sintetico, _versao_git
+from utils.Dataset import listar_imagens
+from utils.ImageLoader import decodificar, REDUCOES
+from utils.LogConfig import configurar_log
+
+# ============================================
+# BENCHMARK DA DECODIFICAÇÃO
+# ============================================
+
+def _colorida(caminho_cinza, formato):
+    # "digitalização" colorida: a forma com um leve tom de papel
+    cinza = cv2.imread(str(caminho_cinza), cv2.IMREAD_GRAYSCALE)
+    colorida = cv2.merge([cinza, (cinza * 0.97).astype(np.uint8), (cinza * 0.92).astype(np.uint8)])
+    caminho = caminho_cinza.with_name(f"{caminho_cinza.stem}_cor.{formato}")
+    cv2.imwrite(str(caminho), colorida)
+    return caminho
+
+
+def _leitura_dupla(caminho):
+    # como load_image fazia antes: cor e cinza decodificados separadamente
+    return cv2.imread(str(caminho)), cv2.imread(str(caminho), cv2.IMREAD_GRAYSCALE)
+
+
+def _leitura_unica(caminho):
+    img = decodificar(caminho, cor=True)
+    return img, cv2.cvtColor(img, cv2.COLOR_BGR2GRAY) if img.ndim == 3 else img
+
+
+def _cronometrar(func, *args, repeticoes=3, **kwargs):
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        func(*args, **kwargs)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor * 1000
+
+
+def medir_arquivo(caminho):
+    """Tempos (ms, melhor de 3) de cada forma de decodificar um arquivo"""
+    linha = {
+        "arquivo": caminho.name,
+        "formato": caminho.suffix[1:],
+        "leitura_dupla_ms": _cronometrar(_leitura_dupla, caminho),
+        "leitura_unica_cor_ms": _cronometrar(_leitura_unica, caminho),
+        "so_cinza_ms": _cronometrar(decodificar, caminho),
+    }
+    dados = caminho.read_bytes()
+    linha["bytes_cinza_ms"] = _cronometrar(decodificar, dados)
+    for reducao in REDUCOES:
+        if reducao > 1:
+            linha[f"cinza_1_{reducao}_ms"] = _cronometrar(decodificar, caminho, reducao=reducao)
+    return linha
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Decodificação: leitura dupla x única x reduzida")
+    parser.add_argument("--dataset", default="./Kimia99_DB")
+    parser.add_argument("--lados", type=int, nargs="*", default=[2048, 4096, 8192])
+    parser.add_argument("--n-sintetico", type=int, default=5, help="formas base usadas em cada lado")
+    parser.add_argument("--formatos", nargs="*", default=["jpg", "png"])
+    parser.add_argument("--saida", default="bench_results")
+    parser.add_argument("--rotulo", default="", help="sufixo do arquivo de resultados")
+    args = parser.parse_args()
+
+    resumo_log = configurar_log("silencioso")
+    imagens = listar_imagens(args.dataset)
+
+    resultados = []
+    with tempfile.TemporaryDirectory() as pasta_tmp:
+        for lado in args.lados:
+            cinzas = gerar_sintetico(imagens[:args.n_sintetico], lado, "escala", Path(pasta_tmp) / str(lado))
+            for formato in args.formatos:
+                linhas = [medir_arquivo(_colorida(caminho, formato)) for caminho in cinzas]
+                resumo = {"lado": lado, "formato": formato, "arquivos": len(linhas)}
+                for chave in linhas[0]:
+                    if chave.endswith("_ms"):
+                        resumo[chave.replace("_ms", "_p50_ms")] = float(np.median([l[chave] for l in linhas]))
+                resultados.append(resumo)
+
+                print(f"\n{lado} px, {formato} colorido ({len(linhas)} arquivos), p50:")
+                for chave, valor in resumo.items():
+                    if chave.endswith("_ms"):
+                        print(f"   {chave:<26} {valor:10.1f} ms")
+
+    saida = Path(args.saida)
+    saida.mkdir(parents=True, exist_ok=True)
+    nome = datetime.now().strftime("%Y%m%d_%H%M%S") + "_decodificacao" + (f"_{args.rotulo}" if args.rotulo else "")
+    with open(saida / f"{nome}.json", "w", encoding="utf-8") as f:
+        json.dump({
+            "data": datetime.now().isoformat(timespec="seconds"),
+            "git": _versao_git(),
+            "plataforma": platform.platform(),
+            "opencv": cv2.__version__,
+            "argumentos": vars(args),
+            "resultados": resultados,
+        }, f, indent=2, ensure_ascii=False)
+
+    print("\n" + resumo_log.texto())
+    print(f"\nResultados salvos em {saida / nome}.json")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+import argparse
+import contextlib
+import io
+import json
+import platform
+import shutil
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import cv2
+
+from benchmarks.bench_pacote import replicar
+from benchmarks.bench_pipeline import _versao_git
+from main import _parte1_em_lote, _parte1_incremental, DESCRITORES_SEPARACAO
+from utils.ClassSeparation import analisar_separacao
+from utils.Dataset import listar_imagens
+from utils.LogConfig import configurar_log
+
+# ============================================
+# BENCHMARK DA REANÁLISE INCREMENTAL
+# ============================================
+
+OPCOES = {'modo_cantos': 'harris', 'usar_roi': False, 'avaliacao': 'raster', 'modo_limiar': 'fixo'}
+
+
+def _completa(pasta):
+    # Parte 1 do zero + separação entre classes
+    tabela, _, _ = _parte1_em_lote(pasta, OPCOES, 1, None, None, float, 0)
+    colunas = [tabela.nomes.index(nome) for nome in DESCRITORES_SEPARACAO]
+    analisar_separacao(tabela.valores[:, colunas], tabela.codigos_classe, len(tabela.classes))
+
+
+def _incremental(pasta, pasta_estado):
+    _, _, _, estado = _parte1_incremental(pasta, OPCOES, 1, None, None, float, 0, pasta_estado)
+    estado.separacao.resultados()
+
+
+def _cronometrar(func, *args):
+    inicio = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        func(*args)
+    return (time.perf_counter() - inicio) * 1000
+
+
+def alterar(pasta, imagens, n, rodada):
+    """n imagens novas (cópias) e n com conteúdo alterado (espelhadas)"""
+    for i in range(n):
+        origem = Path(imagens[i % len(imagens)])
+        shutil.copyfile(origem, pasta / f"{origem.stem}_novo{rodada}_{i}{origem.suffix}")
+    originais = [img_path for img_path in listar_imagens(pasta) if "_novo" not in Path(img_path).stem]
+    for img_path in originais[:n]:
+        cv2.imwrite(str(img_path), cv2.flip(cv2.imread(str(img_path), cv2.IMREAD_GRAYSCALE), 1))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parte 1 + separação: do zero x incremental")
+    parser.add_argument("--dataset", default="./Kimia99_DB")
+    parser.add_argument("--imagens", type=int, default=1000, help="tamanho do dataset (replicado)")
+    parser.add_argument("--alteradas", type=int, nargs="*", default=[1, 10, 50],
+                        help="imagens novas e alteradas em cada rodada (n de cada)")
+    parser.add_argument("--saida", default="bench_results")
+    parser.add_argument("--rotulo", default="", help="sufixo do arquivo de resultados")
+    args = parser.parse_args()
+
+    resumo_log = configurar_log("silencioso")
+    imagens = listar_imagens(args.dataset)
+
+    resultados = []
+    with tempfile.TemporaryDirectory() as pasta_tmp:
+        pasta = replicar(imagens, args.imagens, Path(pasta_tmp) / "dataset")
+        pasta_estado = Path(pasta_tmp) / "estado"
+        inicial = {"completa_ms": _cronometrar(_completa, pasta),
+                   "estado_inicial_ms": _cronometrar(_incremental, pasta, pasta_estado)}
+        inicial["sem_mudancas_ms"] = _cronometrar(_incremental, pasta, pasta_estado)
+        print(f"\n{args.imagens} imagens: do zero {inicial['completa_ms']:.0f} ms, "
+              f"criando o estado {inicial['estado_inicial_ms']:.0f} ms, "
+              f"sem mudanças {inicial['sem_mudancas_ms']:.0f} ms")
+
+        for rodada, n in enumerate(args.alteradas):
+            alterar(pasta, imagens, n, rodada)
+            linha = {"novas": n, "alteradas": n,
+                     "incremental_ms": _cronometrar(_incremental, pasta, pasta_estado),
+                     "completa_ms": _cronometrar(_completa, pasta)}
+            resultados.append(linha)
+            print(f"   +{n} novas, {n} alteradas: incremental {linha['incremental_ms']:8.0f} ms   "
+                  f"do zero {linha['completa_ms']:8.0f} ms")
+
+    saida = Path(args.saida)
+    saida.mkdir(parents=True, exist_ok=True)
+    nome = datetime.now().strftime("%Y%m%d_%H%M%S") + "_incremental" + (f"_{args.rotulo}" if args.rotulo else "")
+    with open(saida / f"{nome}.json", "w", encoding="utf-8") as f:
+        json.dump({
+            "data": datetime.now().isoformat(timespec="seconds"),
+            "git": _versao_git(),
+            "plataforma": platform.platform(),
+            "opencv": cv2.__version__,
+            "argumentos": vars(args),
+            "resultados": {"inicial": inicial, "rodadas": resultados},
+        }, f, indent=2, ensure_ascii=False)
+
+    print("\n" + resumo_log.texto())
+    print(f"\nResultados salvos em {saida / nome}.json")
+
+
+if __name__ == "__main__":
+    main()
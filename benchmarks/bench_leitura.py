@@ -0,0 +1,90 @@
+import argparse
+import json
+import platform
+import time
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+
+import cv2
+
+from benchmarks.bench_pipeline import _versao_git
+from main import _descritores_imagem_worker, TRANSFORMACOES
+from utils.Dataset import listar_imagens
+from utils.ImageLoader import LeitorImagens, decodificar
+from utils.LogConfig import configurar_log
+
+# ============================================
+# BENCHMARK DA LEITURA ANTECIPADA
+# ============================================
+
+def _disco_lento(img_path, latencia_ms):
+    # latência fixa por arquivo (disco de rede), sem segurar o GIL, e depois a decodificação
+    time.sleep(latencia_ms / 1000)
+    return decodificar(img_path)
+
+
+def medir(imagens, latencia_ms, profundidade, n_threads, opcoes):
+    """Parte 1 em série (base + transformações) com leitura antecipada; tempo total e espera"""
+    leitor = LeitorImagens(imagens, profundidade, n_threads,
+                           carregar=partial(_disco_lento, latencia_ms=latencia_ms))
+    inicio = time.perf_counter()
+    for img_path, img in leitor:
+        _descritores_imagem_worker((img_path, True, list(TRANSFORMACOES), opcoes), img)
+    total_ms = (time.perf_counter() - inicio) * 1000
+    return {
+        "latencia_ms": latencia_ms,
+        "profundidade": profundidade,
+        "threads": leitor.n_threads,
+        "imagens": leitor.lidas,
+        "total_ms": total_ms,
+        "espera_ms": leitor.espera_ms,
+        "fracao_esperando": leitor.espera_ms / total_ms,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Leitura antecipada (LeitorImagens) com disco lento simulado")
+    parser.add_argument("--dataset", default="./Kimia99_DB")
+    parser.add_argument("--latencias", type=float, nargs="*", default=[0, 10, 40],
+                        help="latência simulada por arquivo (ms)")
+    parser.add_argument("--profundidades", type=int, nargs="*", default=[0, 1, 2, 4, 8])
+    parser.add_argument("--threads", type=int, default=None,
+                        help="threads de leitura (padrão: uma por imagem em leitura)")
+    parser.add_argument("--modo-cantos", default="contorno")
+    parser.add_argument("--saida", default="bench_results")
+    parser.add_argument("--rotulo", default="", help="sufixo do arquivo de resultados")
+    args = parser.parse_args()
+
+    resumo_log = configurar_log("silencioso")
+    imagens = listar_imagens(args.dataset)
+    opcoes = {"modo_cantos": args.modo_cantos, "usar_roi": False, "avaliacao": "raster", "modo_limiar": "fixo"}
+
+    resultados = []
+    for latencia in args.latencias:
+        print(f"\nLatência {latencia:g} ms por arquivo ({len(imagens)} imagens):")
+        for profundidade in args.profundidades:
+            linha = medir(imagens, latencia, profundidade, args.threads, opcoes)
+            resultados.append(linha)
+            print(f"   profundidade {profundidade:>2}: total {linha['total_ms']:8.0f} ms   "
+                  f"esperando leitura {linha['espera_ms']:7.0f} ms ({100 * linha['fracao_esperando']:.0f}%)")
+
+    saida = Path(args.saida)
+    saida.mkdir(parents=True, exist_ok=True)
+    nome = datetime.now().strftime("%Y%m%d_%H%M%S") + "_leitura" + (f"_{args.rotulo}" if args.rotulo else "")
+    with open(saida / f"{nome}.json", "w", encoding="utf-8") as f:
+        json.dump({
+            "data": datetime.now().isoformat(timespec="seconds"),
+            "git": _versao_git(),
+            "plataforma": platform.platform(),
+            "opencv": cv2.__version__,
+            "argumentos": vars(args),
+            "resultados": resultados,
+        }, f, indent=2, ensure_ascii=False)
+
+    print("\n" + resumo_log.texto())
+    print(f"\nResultados salvos em {saida / nome}.json")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+import argparse
+import json
+import platform
+import time
+from datetime import datetime
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_pipeline import _fundo_branco, _versao_git
+from utils.Dataset import listar_imagens
+from utils.Binarization import fill_holes
+from utils.ContourProcessing import find_main_contour
+from utils.Thresholding import analisar_intensidade, binarizar, MODOS_LIMIAR
+from utils.LogConfig import configurar_log
+
+# ============================================
+# BENCHMARK DOS MODOS DE LIMIARIZAÇÃO
+# ============================================
+
+def digitalizar(img, escurecimento, ruido, rng):
+    """
+    Simula uma digitalização: iluminação caindo linearmente da esquerda para a
+    direita (o lado direito fica com 1 - escurecimento do brilho), um leve
+    desfoque e ruído gaussiano (desvio padrão em níveis de cinza)
+    """
+    ganho = np.linspace(1.0, 1.0 - escurecimento, img.shape[1], dtype=np.float32)[None, :]
+    digitalizada = cv2.GaussianBlur(img, (3, 3), 0).astype(np.float32) * ganho
+    digitalizada += rng.normal(0, ruido, img.shape).astype(np.float32)
+    return np.clip(digitalizada, 0, 255).astype(np.uint8)
+
+
+def _cronometrar(func, *args, repeticoes=5, **kwargs):
+    melhor, resultado = float("inf"), None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = func(*args, **kwargs)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor * 1000, resultado
+
+
+def _iou(a, b):
+    a, b = a > 0, b > 0
+    uniao = np.count_nonzero(a | b)
+    return np.count_nonzero(a & b) / uniao if uniao else 1.0
+
+
+def _mascara(binary, img_gray):
+    # máscara do objeto principal (preenchida), como no pipeline
+    contorno_info = find_main_contour(fill_holes(binary), img_gray)
+    mascara = np.zeros_like(binary)
+    if contorno_info is not None:
+        cv2.drawContours(mascara, [contorno_info["contorno"]], -1, 255, cv2.FILLED)
+    return mascara
+
+
+def medir_modos(pares):
+    """
+    Custo (ms, melhor de 5) e qualidade de cada modo. pares: (nome, imagem limpa, imagem a
+    segmentar); a referência é o modo "fixo" na imagem limpa. Mede também o custo da
+    análise de intensidade (histograma + borda) contra o np.mean que ela substitui.
+    """
+    linhas = []
+    for nome, limpa, img in pares:
+        referencia = _mascara(binarizar(limpa)[0], limpa)
+        t_media, _ = _cronometrar(np.mean, img)
+        t_intensidade, intensidade = _cronometrar(analisar_intensidade, img)
+        linha = {"imagem": nome, "pixels": img.size, "np_mean_ms": t_media, "analisar_intensidade_ms": t_intensidade}
+        for modo in MODOS_LIMIAR:
+            # cópia a cada repetição: o limiar de Otsu (guardado no dict) entra no custo
+            t_modo, (binary, limiar) = _cronometrar(lambda: binarizar(img, dict(intensidade), modo))
+            linha[f"{modo}_ms"] = t_modo
+            linha[f"{modo}_limiar"] = limiar
+            linha[f"{modo}_iou"] = _iou(_mascara(binary, img), referencia)
+        linhas.append(linha)
+    return pd.DataFrame(linhas)
+
+
+def _resumo(nome, df):
+    resumo = {"dataset": nome, "imagens": len(df),
+              "np_mean_p50_ms": float(df["np_mean_ms"].median()),
+              "analisar_intensidade_p50_ms": float(df["analisar_intensidade_ms"].median())}
+    for modo in MODOS_LIMIAR:
+        resumo[f"{modo}_p50_ms"] = float(df[f"{modo}_ms"].median())
+        resumo[f"{modo}_iou_medio"] = float(df[f"{modo}_iou"].mean())
+        resumo[f"{modo}_iou_min"] = float(df[f"{modo}_iou"].min())
+        resumo[f"{modo}_acertos"] = int((df[f"{modo}_iou"] >= 0.9).sum())
+    return resumo
+
+
+def _imprimir(resumo):
+    print(f"\n{resumo['dataset']}: {resumo['imagens']} imagens "
+          f"(np.mean {resumo['np_mean_p50_ms']:.3f} ms, histograma + borda "
+          f"{resumo['analisar_intensidade_p50_ms']:.3f} ms)")
+    for modo in MODOS_LIMIAR:
+        print(f"   {modo:<11} {resumo[f'{modo}_p50_ms']:8.3f} ms   IoU médio {resumo[f'{modo}_iou_medio']:.3f}"
+              f"   mínimo {resumo[f'{modo}_iou_min']:.3f}   IoU >= 0.9: {resumo[f'{modo}_acertos']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Limiarização: fixo x Otsu x adaptativo (custo e qualidade)")
+    parser.add_argument("--dataset", default="./Kimia99_DB")
+    parser.add_argument("--escurecimentos", type=float, nargs="*", default=[0.3, 0.6],
+                        help="queda de iluminação (fração do brilho) nas digitalizações simuladas")
+    parser.add_argument("--ruido", type=float, default=8.0, help="desvio padrão do ruído (níveis de cinza)")
+    parser.add_argument("--escala", type=float, default=1.0, help="amplia as imagens (custo em resoluções maiores)")
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--saida", default="bench_results")
+    parser.add_argument("--rotulo", default="", help="sufixo do arquivo de resultados")
+    args = parser.parse_args()
+
+    resumo_log = configurar_log("silencioso")
+    rng = np.random.default_rng(args.semente)
+
+    limpas = []
+    for img_path in listar_imagens(args.dataset):
+        img = cv2.imread(str(img_path), cv2.IMREAD_GRAYSCALE)
+        if img is None:
+            continue
+        if args.escala != 1.0:
+            img = cv2.resize(img, None, fx=args.escala, fy=args.escala, interpolation=cv2.INTER_NEAREST)
+        limpas.append((Path(img_path).name, _fundo_branco(img)))
+
+    conjuntos = {Path(args.dataset).name: [(nome, img, img) for nome, img in limpas]}
+    for escurecimento in args.escurecimentos:
+        conjuntos[f"digitalizado_{escurecimento:g}"] = [
+            (nome, img, digitalizar(img, escurecimento, args.ruido, rng)) for nome, img in limpas
+        ]
+
+    resumos, tabelas = [], []
+    for nome, pares in conjuntos.items():
+        df = medir_modos(pares)
+        df["dataset"] = nome
+        resumos.append(_resumo(nome, df))
+        tabelas.append(df)
+        _imprimir(resumos[-1])
+
+    saida = Path(args.saida)
+    saida.mkdir(parents=True, exist_ok=True)
+    nome = datetime.now().strftime("%Y%m%d_%H%M%S") + "_limiarizacao" + (f"_{args.rotulo}" if args.rotulo else "")
+    with open(saida / f"{nome}.json", "w", encoding="utf-8") as f:
+        json.dump({
+            "data": datetime.now().isoformat(timespec="seconds"),
+            "git": _versao_git(),
+            "plataforma": platform.platform(),
+            "opencv": cv2.__version__,
+            "argumentos": vars(args),
+            "resultados": resumos,
+        }, f, indent=2, ensure_ascii=False)
+    pd.concat(tabelas, ignore_index=True).to_csv(saida / f"{nome}_por_imagem.csv", index=False)
+
+    print("\n" + resumo_log.texto())
+    print(f"\nResultados salvos em {saida / nome}.json e {saida / nome}_por_imagem.csv")
+
+
+if __name__ == "__main__":
+    main()
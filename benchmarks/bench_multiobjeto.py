@@ -0,0 +1,134 @@
+import argparse
+import itertools
+import json
+import platform
+import time
+from datetime import datetime
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from benchmarks.bench_pipeline import _fundo_branco, _versao_git
+from utils.Dataset import listar_imagens
+from utils.Binarization import binarize_and_fill
+from utils.ContourProcessing import estatisticas_contornos, find_all_contours
+from utils.DescriptorEngine import descritores_objetos
+from utils.LogConfig import configurar_log
+
+# ============================================
+# BENCHMARK DO MODO MULTIOBJETO
+# ============================================
+
+def gerar_mosaico(imagens_base, n_objetos, celula=48, borda=4):
+    """Imagem com n_objetos formas (as bases reduzidas para celula - 2*borda, repetidas) em grade"""
+    lado = celula - 2 * borda
+    formas = []
+    for img_path in imagens_base:
+        img = cv2.imread(str(img_path), cv2.IMREAD_GRAYSCALE)
+        if img is not None:
+            formas.append(cv2.resize(_fundo_branco(img), (lado, lado), interpolation=cv2.INTER_AREA))
+
+    colunas = int(np.ceil(np.sqrt(n_objetos)))
+    linhas = -(-n_objetos // colunas)
+    mosaico = np.full((linhas * celula, colunas * celula), 255, dtype=np.uint8)
+    for k, forma in zip(range(n_objetos), itertools.cycle(formas)):
+        y0 = (k // colunas) * celula + borda
+        x0 = (k % colunas) * celula + borda
+        mosaico[y0:y0 + lado, x0:x0 + lado] = forma
+    return mosaico
+
+
+def _laco_areas(contours, img_area):
+    # filtro por área como era feito antes: contourArea duas vezes por contorno
+    validos = [c for c in contours if 0 < cv2.contourArea(c) < 0.95 * img_area]
+    return max(validos, key=cv2.contourArea) if validos else None
+
+
+def _laco_estatisticas(contours):
+    # as mesmas estatísticas de estatisticas_contornos, uma chamada OpenCV por contorno
+    return [(cv2.contourArea(c), cv2.arcLength(c, True), cv2.boundingRect(c)) for c in contours]
+
+
+def _cronometrar(func, *args, repeticoes=3, **kwargs):
+    melhor, resultado = float("inf"), None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = func(*args, **kwargs)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor * 1000, resultado
+
+
+def medir_mosaico(mosaico, modos_cantos=("contorno",)):
+    """Tempos (ms, melhor de 3) de cada etapa do modo multiobjeto numa imagem"""
+    _, binary_filled = binarize_and_fill(mosaico)
+    img_area = mosaico.shape[0] * mosaico.shape[1]
+
+    t_find, (contours, _) = _cronometrar(cv2.findContours, binary_filled,
+                                         cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    t_laco, _ = _cronometrar(_laco_areas, contours, img_area)
+    t_laco_estat, _ = _cronometrar(_laco_estatisticas, contours)
+    t_estat, _ = _cronometrar(estatisticas_contornos, contours)
+    t_todos, objetos = _cronometrar(find_all_contours, binary_filled, mosaico)
+
+    linha = {
+        "lado": mosaico.shape[0],
+        "contornos": len(contours),
+        "objetos": len(objetos),
+        "findContours_ms": t_find,
+        "laco_contourArea_ms": t_laco,
+        "laco_estatisticas_ms": t_laco_estat,
+        "estatisticas_contornos_ms": t_estat,
+        "find_all_contours_ms": t_todos,
+    }
+    for modo in modos_cantos:
+        descritores_objetos(objetos[:1], modo)  # aquecimento (imports e caches do skimage)
+        t_desc, _ = _cronometrar(descritores_objetos, objetos, modo, repeticoes=1)
+        linha[f"descritores_{modo}_ms"] = t_desc
+        linha[f"descritores_{modo}_us_por_objeto"] = 1000 * t_desc / max(len(objetos), 1)
+    return linha
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do modo multiobjeto (find_all_contours)")
+    parser.add_argument("--dataset", default="./Kimia99_DB")
+    parser.add_argument("--objetos", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    parser.add_argument("--celula", type=int, default=48, help="lado (pixels) da célula de cada objeto")
+    parser.add_argument("--harris", action="store_true", help="mede também os descritores com cantos Harris")
+    parser.add_argument("--saida", default="bench_results")
+    parser.add_argument("--rotulo", default="", help="sufixo do arquivo de resultados")
+    args = parser.parse_args()
+
+    resumo_log = configurar_log("silencioso")
+    imagens = listar_imagens(args.dataset)
+    modos = ("contorno", "harris") if args.harris else ("contorno",)
+
+    resultados = []
+    for n_objetos in args.objetos:
+        linha = medir_mosaico(gerar_mosaico(imagens, n_objetos, args.celula), modos)
+        resultados.append(linha)
+        print(f"\n{n_objetos} objetos ({linha['lado']} px, {linha['contornos']} contornos, "
+              f"{linha['objetos']} válidos):")
+        for chave, valor in linha.items():
+            if chave.endswith("_ms") or chave.endswith("_us_por_objeto"):
+                print(f"   {chave:<36} {valor:10.2f}")
+
+    saida = Path(args.saida)
+    saida.mkdir(parents=True, exist_ok=True)
+    nome = datetime.now().strftime("%Y%m%d_%H%M%S") + "_multiobjeto" + (f"_{args.rotulo}" if args.rotulo else "")
+    with open(saida / f"{nome}.json", "w", encoding="utf-8") as f:
+        json.dump({
+            "data": datetime.now().isoformat(timespec="seconds"),
+            "git": _versao_git(),
+            "plataforma": platform.platform(),
+            "opencv": cv2.__version__,
+            "argumentos": vars(args),
+            "resultados": resultados,
+        }, f, indent=2, ensure_ascii=False)
+
+    print("\n" + resumo_log.texto())
+    print(f"\nResultados salvos em {saida / nome}.json")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import argparse
+import json
+import platform
+import shutil
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import cv2
+
+from benchmarks.bench_pipeline import _versao_git
+from utils.Dataset import listar_imagens
+from utils.ImageLoader import decodificar
+from utils.PackedDataset import empacotar, DatasetEmpacotado, FORMATOS_PACOTE
+from utils.LogConfig import configurar_log
+
+# ============================================
+# BENCHMARK DO DATASET EMPACOTADO
+# ============================================
+
+def replicar(imagens, n, pasta):
+    """n arquivos copiados do dataset (em ciclo), com nomes que mantêm a classe"""
+    pasta.mkdir(parents=True, exist_ok=True)
+    for i in range(n):
+        origem = Path(imagens[i % len(imagens)])
+        shutil.copyfile(origem, pasta / f"{origem.stem}_{i}{origem.suffix}")
+    return pasta
+
+
+def _arquivos(pasta):
+    # como a Parte 1 carrega hoje: listar a pasta e decodificar arquivo por arquivo
+    return sum(decodificar(img_path).size for img_path in listar_imagens(pasta))
+
+
+def _pacote(caminho, mmap):
+    return sum(mascara.size for _, mascara in DatasetEmpacotado(caminho, mmap=mmap))
+
+
+def _cronometrar(func, *args, repeticoes=3):
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        func(*args)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Carregar o dataset: arquivos x pacote único (.kpak)")
+    parser.add_argument("--dataset", default="./Kimia99_DB")
+    parser.add_argument("--tamanhos", type=int, nargs="*", default=[99, 1000, 5000],
+                        help="número de imagens (o dataset é replicado)")
+    parser.add_argument("--pasta-tmp", default=None, help="onde criar as cópias (padrão: diretório temporário)")
+    parser.add_argument("--saida", default="bench_results")
+    parser.add_argument("--rotulo", default="", help="sufixo do arquivo de resultados")
+    args = parser.parse_args()
+
+    resumo_log = configurar_log("silencioso")
+    imagens = listar_imagens(args.dataset)
+
+    resultados = []
+    with tempfile.TemporaryDirectory(dir=args.pasta_tmp) as pasta_tmp:
+        for n in args.tamanhos:
+            pasta = replicar(imagens, n, Path(pasta_tmp) / str(n))
+            linha = {
+                "imagens": n,
+                "arquivos_kib": sum(p.stat().st_size for p in pasta.iterdir()) / 1024,
+                "arquivos_ms": _cronometrar(_arquivos, pasta),
+            }
+            for formato in FORMATOS_PACOTE:
+                caminho = Path(pasta_tmp) / f"{n}_{formato}.kpak"
+                inicio = time.perf_counter()
+                empacotar(pasta, caminho, formato)
+                linha[f"empacotar_{formato}_ms"] = (time.perf_counter() - inicio) * 1000
+                linha[f"pacote_{formato}_kib"] = caminho.stat().st_size / 1024
+                linha[f"pacote_{formato}_mmap_ms"] = _cronometrar(_pacote, caminho, True)
+                linha[f"pacote_{formato}_leitura_ms"] = _cronometrar(_pacote, caminho, False)
+            resultados.append(linha)
+
+            print(f"\n{n} imagens (arquivos: {linha['arquivos_kib']:.0f} KiB):")
+            print(f"   arquivos (listar + decodificar) {linha['arquivos_ms']:9.1f} ms")
+            for formato in FORMATOS_PACOTE:
+                print(f"   pacote {formato:<5} ({linha[f'pacote_{formato}_kib']:7.0f} KiB)  "
+                      f"mmap {linha[f'pacote_{formato}_mmap_ms']:7.1f} ms   "
+                      f"leitura única {linha[f'pacote_{formato}_leitura_ms']:7.1f} ms")
+
+    print("\nObs.: os arquivos acabaram de ser gravados e estão no cache de páginas do sistema;"
+          " o custo de disco frio (um acesso por arquivo x uma leitura sequencial) não entra nesses tempos.")
+
+    saida = Path(args.saida)
+    saida.mkdir(parents=True, exist_ok=True)
+    nome = datetime.now().strftime("%Y%m%d_%H%M%S") + "_pacote" + (f"_{args.rotulo}" if args.rotulo else "")
+    with open(saida / f"{nome}.json", "w", encoding="utf-8") as f:
+        json.dump({
+            "data": datetime.now().isoformat(timespec="seconds"),
+            "git": _versao_git(),
+            "plataforma": platform.platform(),
+            "opencv": cv2.__version__,
+            "argumentos": vars(args),
+            "resultados": resultados,
+        }, f, indent=2, ensure_ascii=False)
+
+    print("\n" + resumo_log.texto())
+    print(f"\nResultados salvos em {saida / nome}.json")
+
+
+if __name__ == "__main__":
+    main()
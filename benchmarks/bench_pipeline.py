@@ -0,0 +1,244 @@
+import argparse
+import itertools
+import json
+import os
+import platform
+import resource
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pandas as pd
+
+from utils.Dataset import listar_imagens
+from utils.ImageLoader import load_image
+from utils.Binarization import binarize_and_fill
+from utils.ContourProcessing import find_main_contour, BACKENDS
+from utils.ShapeDescriptors import compute_descriptors
+from utils.Transformations import generate_transformations, compare_transformations
+from utils.LogConfig import configurar_log
+
+# ============================================
+# BENCHMARK DAS ETAPAS DO PIPELINE
+# ============================================
+
+ETAPAS = [
+    "load_image",
+    "binarize_and_fill",
+    "find_main_contour",
+    "compute_descriptors",
+    "generate_transformations",
+    "compare_transformations",
+]
+
+
+def _medir(tempos, memoria, nome, func, *args, **kwargs):
+    if memoria is not None:
+        tracemalloc.reset_peak()
+    inicio = time.perf_counter()
+    resultado = func(*args, **kwargs)
+    tempos[nome] = (time.perf_counter() - inicio) * 1000
+    if memoria is not None:
+        memoria[nome] = tracemalloc.get_traced_memory()[1] / 2**20
+    return resultado
+
+
+def medir_imagem(img_path, medir_memoria=False, backend="contornos"):
+    """Tempo (ms) de cada etapa para uma imagem; None se a imagem falhar"""
+    tempos = {}
+    memoria = {} if medir_memoria else None
+
+    img_original, img_gray, intensidade = _medir(tempos, memoria, "load_image", load_image, img_path)
+    if img_gray is None:
+        return None
+    binary, binary_filled, bbox = _medir(tempos, memoria, "binarize_and_fill",
+                                         binarize_and_fill, img_gray, intensidade, backend, com_bbox=True)
+    contorno_info = _medir(tempos, memoria, "find_main_contour",
+                           find_main_contour, binary_filled, img_gray, backend, bbox)
+    if contorno_info is None:
+        return None
+    descritores, _ = _medir(tempos, memoria, "compute_descriptors",
+                            compute_descriptors, contorno_info, binary_filled, img_gray)
+    transformacoes = _medir(tempos, memoria, "generate_transformations",
+                            generate_transformations, img_gray, intensidade)
+    _medir(tempos, memoria, "compare_transformations",
+           compare_transformations, transformacoes, contorno_info["img_area"], descritores,
+           intensidade=intensidade)
+
+    linha = {f"{etapa}_ms": tempos[etapa] for etapa in ETAPAS}
+    linha["total_ms"] = sum(tempos.values())
+    if memoria is not None:
+        linha.update({f"{etapa}_pico_mb": memoria[etapa] for etapa in ETAPAS})
+    return linha
+
+
+# ============================================
+# DATASETS SINTÉTICOS
+# ============================================
+
+def _fundo_branco(img):
+    # objeto preto em fundo branco, como no Kimia99
+    return img if np.mean(img) > 127 else 255 - img
+
+
+def gerar_sintetico(imagens_base, lado, modo, pasta):
+    """
+    Grava uma versão lado x lado de cada forma base em pasta:
+    modo="escala" amplia a forma para ocupar o quadro;
+    modo="mosaico" repete a forma (no tamanho original) lado a lado.
+    """
+    pasta.mkdir(parents=True, exist_ok=True)
+    caminhos = []
+    for img_path in imagens_base:
+        img = cv2.imread(str(img_path), cv2.IMREAD_GRAYSCALE)
+        if img is None:
+            continue
+        img = _fundo_branco(img)
+
+        if modo == "escala":
+            fator = lado / max(img.shape)
+            ampliada = cv2.resize(img, None, fx=fator, fy=fator, interpolation=cv2.INTER_NEAREST)
+            sintetica = np.full((lado, lado), 255, dtype=np.uint8)
+            h, w = ampliada.shape[:2]
+            y0, x0 = (lado - h) // 2, (lado - w) // 2
+            sintetica[y0:y0 + h, x0:x0 + w] = ampliada[:lado, :lado]
+        else:
+            reps_y = -(-lado // img.shape[0])
+            reps_x = -(-lado // img.shape[1])
+            sintetica = np.tile(img, (reps_y, reps_x))[:lado, :lado]
+
+        caminho = pasta / f"{Path(img_path).stem}_{modo}_{lado}.png"
+        cv2.imwrite(str(caminho), sintetica)
+        caminhos.append(caminho)
+    return caminhos
+
+
+# ============================================
+# EXECUÇÃO
+# ============================================
+
+def _percentis(valores):
+    valores = np.asarray(valores)
+    return {
+        "media_ms": float(valores.mean()),
+        "p50_ms": float(np.percentile(valores, 50)),
+        "p95_ms": float(np.percentile(valores, 95)),
+        "max_ms": float(valores.max()),
+    }
+
+
+def rodar_dataset(nome, caminhos, n_imagens=None, medir_memoria=False, backend="contornos"):
+    """Mede todas as etapas em n_imagens (repetindo os caminhos se necessário)"""
+    n_imagens = n_imagens or len(caminhos)
+    linhas = []
+
+    inicio = time.perf_counter()
+    for img_path in itertools.islice(itertools.cycle(caminhos), n_imagens):
+        linha = medir_imagem(img_path, medir_memoria, backend)
+        if linha is not None:
+            linha["dataset"] = nome
+            linha["imagem"] = Path(img_path).name
+            linhas.append(linha)
+    duracao = time.perf_counter() - inicio
+
+    df = pd.DataFrame(linhas)
+    resumo = {
+        "dataset": nome,
+        "imagens": len(df),
+        "duracao_s": duracao,
+        "imagens_por_s": len(df) / duracao if duracao > 0 else 0.0,
+        "pico_memoria_processo_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "etapas": {etapa: _percentis(df[f"{etapa}_ms"]) for etapa in ETAPAS + ["total"]},
+    }
+    if medir_memoria:
+        resumo["pico_tracemalloc_mb"] = {etapa: float(df[f"{etapa}_pico_mb"].max()) for etapa in ETAPAS}
+    return resumo, df
+
+
+def _versao_git():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _imprimir_resumo(resumo):
+    print(f"\n{resumo['dataset']}: {resumo['imagens']} imagens, "
+          f"{resumo['imagens_por_s']:.2f} imagens/s, "
+          f"pico de memória {resumo['pico_memoria_processo_mb']:.0f} MB")
+    for etapa, p in resumo["etapas"].items():
+        print(f"   {etapa:<26} p50 {p['p50_ms']:9.2f} ms   p95 {p['p95_ms']:9.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark das etapas do pipeline de descritores")
+    parser.add_argument("--dataset", default="./Kimia99_DB")
+    parser.add_argument("--max-imagens", type=int, default=None, help="limite de imagens do dataset real")
+    parser.add_argument("--lados", type=int, nargs="*", default=[1024, 2048, 4096, 8192],
+                        help="lados (pixels) dos datasets sintéticos; vazio para pular")
+    parser.add_argument("--modo-sintetico", choices=("escala", "mosaico"), default="escala")
+    parser.add_argument("--n-sintetico", type=int, default=20,
+                        help="imagens por dataset sintético (as formas base são repetidas)")
+    parser.add_argument("--backend", choices=BACKENDS, default="contornos",
+                        help="segmentação: findContours + filtro ou componentes conexos")
+    parser.add_argument("--memoria", action="store_true", help="pico de memória por etapa (tracemalloc, mais lento)")
+    parser.add_argument("--saida", default="bench_results")
+    parser.add_argument("--rotulo", default="", help="sufixo do arquivo de resultados")
+    parser.add_argument("--log", choices=("silencioso", "normal", "detalhado"), default="silencioso",
+                        help="saída das etapas (o custo dela entra nos tempos medidos)")
+    args = parser.parse_args()
+
+    resumo_log = configurar_log(args.log)
+
+    if args.memoria:
+        tracemalloc.start()
+
+    imagens = listar_imagens(args.dataset)[:args.max_imagens]
+    resumos, tabelas = [], []
+
+    resumo, df = rodar_dataset(Path(args.dataset).name, imagens, medir_memoria=args.memoria,
+                               backend=args.backend)
+    _imprimir_resumo(resumo)
+    resumos.append(resumo)
+    tabelas.append(df)
+
+    with tempfile.TemporaryDirectory() as pasta_tmp:
+        for lado in args.lados:
+            caminhos = gerar_sintetico(imagens, lado, args.modo_sintetico, Path(pasta_tmp) / str(lado))
+            resumo, df = rodar_dataset(f"sintetico_{args.modo_sintetico}_{lado}", caminhos,
+                                       args.n_sintetico, args.memoria, args.backend)
+            _imprimir_resumo(resumo)
+            resumos.append(resumo)
+            tabelas.append(df)
+            for caminho in caminhos:
+                caminho.unlink()
+
+    saida = Path(args.saida)
+    saida.mkdir(parents=True, exist_ok=True)
+    nome = datetime.now().strftime("%Y%m%d_%H%M%S") + (f"_{args.rotulo}" if args.rotulo else "")
+
+    with open(saida / f"{nome}.json", "w", encoding="utf-8") as f:
+        json.dump({
+            "data": datetime.now().isoformat(timespec="seconds"),
+            "git": _versao_git(),
+            "plataforma": platform.platform(),
+            "python": platform.python_version(),
+            "opencv": cv2.__version__,
+            "cpus": os.cpu_count(),
+            "argumentos": vars(args),
+            "resultados": resumos,
+        }, f, indent=2, ensure_ascii=False)
+    pd.concat(tabelas, ignore_index=True).to_csv(saida / f"{nome}_por_imagem.csv", index=False)
+
+    print("\n" + resumo_log.texto())
+    print(f"\nResultados salvos em {saida / nome}.json e {saida / nome}_por_imagem.csv")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+import argparse
+import json
+import platform
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_pipeline import gerar_sintetico, _versao_git
+from utils.Dataset import listar_imagens
+from utils.Binarization import binarize_and_fill
+from utils.ContourProcessing import find_main_contour, BACKENDS
+from utils.LogConfig import configurar_log
+from utils.Thresholding import analisar_intensidade
+
+# ============================================
+# BENCHMARK DOS BACKENDS DE SEGMENTAÇÃO
+# ============================================
+
+def medir_backends(caminhos):
+    """Tempos (ms) de binarize_and_fill e find_main_contour em cada backend, por imagem"""
+    linhas = []
+    for img_path in caminhos:
+        img = cv2.imread(str(img_path), cv2.IMREAD_GRAYSCALE)
+        if img is None:
+            continue
+        intensidade = analisar_intensidade(img)
+        linha = {"imagem": Path(img_path).name, "lado": img.shape[0]}
+        contornos = {}
+        for backend in BACKENDS:
+            inicio = time.perf_counter()
+            _, binary_filled, bbox = binarize_and_fill(img, intensidade, backend=backend, com_bbox=True)
+            meio = time.perf_counter()
+            contorno_info = find_main_contour(binary_filled, img, backend=backend, bbox_componente=bbox)
+            fim = time.perf_counter()
+            linha[f"{backend}_binarize_and_fill_ms"] = (meio - inicio) * 1000
+            linha[f"{backend}_find_main_contour_ms"] = (fim - meio) * 1000
+            linha[f"{backend}_total_ms"] = (fim - inicio) * 1000
+            contornos[backend] = contorno_info
+        a, b = contornos["contornos"], contornos["componentes"]
+        linha["mesmo_contorno"] = a is not None and b is not None and np.array_equal(a["contorno"], b["contorno"])
+        linhas.append(linha)
+    return pd.DataFrame(linhas)
+
+
+def _resumo(nome, df):
+    resumo = {"dataset": nome, "imagens": len(df), "mesmo_contorno": int(df["mesmo_contorno"].sum())}
+    for coluna in df.columns:
+        if coluna.endswith("_ms"):
+            resumo[coluna.replace("_ms", "_p50_ms")] = float(df[coluna].median())
+    resumo["aceleracao_total"] = resumo["contornos_total_p50_ms"] / resumo["componentes_total_p50_ms"]
+    return resumo
+
+
+def _imprimir(resumo):
+    print(f"\n{resumo['dataset']}: {resumo['imagens']} imagens, "
+          f"mesmo contorno em {resumo['mesmo_contorno']}")
+    for backend in BACKENDS:
+        print(f"   {backend:<12} binarize_and_fill {resumo[f'{backend}_binarize_and_fill_p50_ms']:9.2f} ms"
+              f"   find_main_contour {resumo[f'{backend}_find_main_contour_p50_ms']:9.2f} ms"
+              f"   total {resumo[f'{backend}_total_p50_ms']:9.2f} ms")
+    print(f"   aceleração (p50 do total): {resumo['aceleracao_total']:.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Segmentação: findContours + filtro x componentes conexos")
+    parser.add_argument("--dataset", default="./Kimia99_DB")
+    parser.add_argument("--lados", type=int, nargs="*", default=[1024, 2048, 4096, 8192])
+    parser.add_argument("--modo-sintetico", choices=("escala", "mosaico"), default="escala")
+    parser.add_argument("--n-sintetico", type=int, default=10, help="formas base usadas em cada lado")
+    parser.add_argument("--saida", default="bench_results")
+    parser.add_argument("--rotulo", default="", help="sufixo do arquivo de resultados")
+    args = parser.parse_args()
+
+    resumo_log = configurar_log("silencioso")
+    imagens = listar_imagens(args.dataset)
+
+    resumos, tabelas = [], []
+    df = medir_backends(imagens)
+    df["dataset"] = Path(args.dataset).name
+    resumos.append(_resumo(Path(args.dataset).name, df))
+    tabelas.append(df)
+    _imprimir(resumos[-1])
+
+    with tempfile.TemporaryDirectory() as pasta_tmp:
+        for lado in args.lados:
+            nome = f"sintetico_{args.modo_sintetico}_{lado}"
+            caminhos = gerar_sintetico(imagens[:args.n_sintetico], lado, args.modo_sintetico,
+                                       Path(pasta_tmp) / str(lado))
+            df = medir_backends(caminhos)
+            df["dataset"] = nome
+            resumos.append(_resumo(nome, df))
+            tabelas.append(df)
+            _imprimir(resumos[-1])
+            for caminho in caminhos:
+                caminho.unlink()
+
+    saida = Path(args.saida)
+    saida.mkdir(parents=True, exist_ok=True)
+    nome = datetime.now().strftime("%Y%m%d_%H%M%S") + "_segmentacao" + (f"_{args.rotulo}" if args.rotulo else "")
+    with open(saida / f"{nome}.json", "w", encoding="utf-8") as f:
+        json.dump({
+            "data": datetime.now().isoformat(timespec="seconds"),
+            "git": _versao_git(),
+            "plataforma": platform.platform(),
+            "opencv": cv2.__version__,
+            "argumentos": vars(args),
+            "resultados": resumos,
+        }, f, indent=2, ensure_ascii=False)
+    pd.concat(tabelas, ignore_index=True).to_csv(saida / f"{nome}_por_imagem.csv", index=False)
+
+    print("\n" + resumo_log.texto())
+    print(f"\nResultados salvos em {saida / nome}.json e {saida / nome}_por_imagem.csv")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import argparse
+import time
+import numpy as np
+from pathlib import Path
+
+from main import processar_imagem, parametros_descritores_base
+from utils.Dataset import listar_imagens, extrair_classe
+from utils.DescriptorCache import assinatura_parametros
+from utils.DescriptorTable import TabelaDescritores
+from utils.ImageLoader import LeitorImagens
+from utils.ShapeIndex import IndiceFormas, METODOS
+
+# ============================================
+# BUSCA DE FORMAS SEMELHANTES
+# ============================================
+
+def construir_tabela(dataset_path, modo_cantos="harris"):
+    """Descritores base de todas as imagens do dataset"""
+    imagens = listar_imagens(dataset_path)
+    tabela = TabelaDescritores(capacidade=len(imagens))
+    # as próximas imagens são lidas em threads enquanto a atual é processada
+    for img_path, img in LeitorImagens(imagens):
+        resultado = processar_imagem(img_path, modo_cantos, img=img)
+        if resultado is not None:
+            tabela.adicionar(img_path, list(resultado[0].values()), extrair_classe(img_path))
+    tabela.parametros = parametros_descritores_base(modo_cantos)
+    return tabela
+
+
+def carregar_ou_construir_tabela(caminho_tabela, dataset_path, modo_cantos="harris"):
+    """
+    Tabela salva, se foi calculada com os mesmos parâmetros das consultas
+    (modo de cantos, limiar...); senão é recalculada e regravada.
+    """
+    if Path(caminho_tabela).with_suffix(".npy").exists():
+        tabela = TabelaDescritores.carregar(caminho_tabela)
+        esperados = parametros_descritores_base(modo_cantos)
+        if tabela.parametros is not None \
+                and assinatura_parametros(tabela.parametros) == assinatura_parametros(esperados):
+            return tabela
+        print(f"{caminho_tabela} foi calculada com outros parâmetros (ou sem registro deles): recalculando")
+
+    print(f"Calculando descritores de {dataset_path}...")
+    tabela = construir_tabela(dataset_path, modo_cantos)
+    tabela.salvar(caminho_tabela)
+    print(f"Tabela salva em {caminho_tabela} ({len(tabela)} formas)")
+    return tabela
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Busca as formas mais parecidas com uma imagem de consulta")
+    parser.add_argument("consulta", nargs="+", help="imagem(ns) de consulta")
+    parser.add_argument("-k", type=int, default=5, help="número de vizinhos (padrão: 5)")
+    parser.add_argument("--dataset", default="./Kimia99_DB", help="dataset usado se a tabela não existir")
+    parser.add_argument("--tabela", default="descritores_kimia99", help="TabelaDescritores salva (.npy/.json)")
+    parser.add_argument("--metodo", choices=METODOS, default="kdtree")
+    parser.add_argument("--modo-cantos", choices=("harris", "contorno"), default="harris")
+    args = parser.parse_args()
+
+    tabela = carregar_ou_construir_tabela(args.tabela, args.dataset, args.modo_cantos)
+
+    inicio = time.perf_counter()
+    indice = IndiceFormas.de_tabela(tabela, metodo=args.metodo)
+    print(f"Índice {args.metodo} com {len(indice)} formas construído em "
+          f"{(time.perf_counter() - inicio) * 1000:.1f} ms")
+
+    for caminho in args.consulta:
+        resultado = processar_imagem(caminho, args.modo_cantos)
+        if resultado is None:
+            print(f"\n{caminho}: nenhum contorno encontrado")
+            continue
+        vetor = np.array(list(resultado[0].values()))
+
+        inicio = time.perf_counter()
+        vizinhos = indice.buscar_formas(vetor, args.k)
+        tempo_ms = (time.perf_counter() - inicio) * 1000
+
+        print(f"\nConsulta: {caminho} ({tempo_ms:.3f} ms)")
+        print("-" * 60)
+        for posicao, (id_forma, classe, dist) in enumerate(vizinhos, 1):
+            print(f"  {posicao}. {Path(id_forma).name:<25} {classe or '':<12} dist = {dist:.4f}")
+
+
+if __name__ == "__main__":
+    main()
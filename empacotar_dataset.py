@@ -0,0 +1,37 @@
+import argparse
+import time
+from pathlib import Path
+
+from utils.Dataset import listar_imagens
+from utils.PackedDataset import empacotar, DatasetEmpacotado, FORMATOS_PACOTE, EXTENSAO_PACOTE
+
+# ============================================
+# EMPACOTAMENTO DO DATASET
+# ============================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Grava as silhuetas de um dataset num único arquivo (.kpak)")
+    parser.add_argument("dataset", help="pasta com as imagens")
+    parser.add_argument("destino", nargs="?", help=f"arquivo de saída (padrão: <dataset>{EXTENSAO_PACOTE})")
+    parser.add_argument("--formato", choices=FORMATOS_PACOTE, default="bits",
+                        help="bits: 1 bit por pixel; bytes: 1 byte por pixel, máscaras sem cópia")
+    args = parser.parse_args()
+
+    destino = Path(args.destino or Path(args.dataset).name + EXTENSAO_PACOTE)
+    if destino.suffix != EXTENSAO_PACOTE:
+        parser.error(f"o destino deve ter a extensão {EXTENSAO_PACOTE} (é assim que o dataset é reconhecido)")
+
+    inicio = time.perf_counter()
+    n = empacotar(args.dataset, destino, args.formato)
+    tempo_ms = (time.perf_counter() - inicio) * 1000
+
+    tamanho_original = sum(Path(p).stat().st_size for p in listar_imagens(args.dataset))
+    pacote = DatasetEmpacotado(destino)
+    print(f"{n} imagens ({len(pacote.classes)} classes) empacotadas em {destino} ({tempo_ms:.0f} ms)")
+    print(f"  Arquivos originais: {tamanho_original / 1024:.1f} KiB")
+    print(f"  Pacote ({args.formato}): {destino.stat().st_size / 1024:.1f} KiB")
+    print(f"Use {destino} no lugar da pasta do dataset (ex.: parte1_robustez('{destino}'))")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+import os
 import cv2
 import numpy as np
 import matplotlib.pyplot as plt
@@ -5,111 +6,75 @@ from pathlib import Path
 import pandas as pd
 from sklearn.preprocessing import StandardScaler
 import seaborn as sns
-from scipy.spatial import distance
-from skimage import util, feature
 from scipy.ndimage import binary_fill_holes
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from utils.DescriptorEngine import DESCRITORES, PrimitivasForma, extrair_descritores, parametros_engine
+from utils.AnalyticTransforms import matriz_rotacao, matriz_escala, transformar_primitivas
+from utils.DescriptorCache import CacheDescritores, hash_conteudo
+from utils.DescriptorTable import TabelaDescritores
+from utils.Dataset import listar_imagens, descobrir_imagens, extrair_classe
+from utils.StreamingPipeline import executar as executar_pipeline, TAMANHO_FILA
+from utils.ClassSeparation import analisar_separacao, pares_mais_proximos, salvar_separacao
+from utils.Incremental import EstadoIncremental, comparar_manifesto
+from utils.Robustness import desvios, distancias as distancias_transformacoes, tabela_resumo, descritor_menos_estavel
+from utils.Binarization import fill_holes
+from utils.ContourProcessing import MARGEM_ROI
+from utils.Instrumentation import instrumentar, imagem_atual
+from utils.Thresholding import analisar_intensidade, binarizar, MODOS_LIMIAR, LIMIAR_FIXO
+from utils.Visualization import modo_headless, mostrar_ou_salvar
+from utils.ImageLoader import decodificar, LeitorImagens, PROFUNDIDADE_LEITURA
 
 # Configuração
 plt.rcParams['figure.figsize'] = (12, 8)
 sns.set_style("whitegrid")
 
+# Segmentação (limiar: ver utils/Thresholding.py)
+AREA_MIN_REL = 0.01  # contornos menores que 1% da imagem são ruído
+AREA_MAX_REL = 0.95  # contornos maiores que 95% da imagem são moldura
+
+# Descritores do gráfico e da análise de separação da Parte 2 (você pode modificar)
+DESCRITORES_SEPARACAO = ('Circularidade', 'Alongamento')
+
 # ============================================
 # FUNÇÕES AUXILIARES
 # ============================================
 
-def calcular_descritores(contorno, area, perimetro, binary_img):
+@instrumentar("descritores")
+def calcular_descritores(contorno, area, perimetro, binary_img, nomes=None, modo_cantos="harris", roi_margem=None):
     """Calcula diversos descritores de forma"""
-    descritores = {}
-    
-    # Momentos
-    M = cv2.moments(contorno)
-    
-    # Excentricidade
-    if M['mu20'] + M['mu02'] != 0:
-        excentricidade = ((M['mu20'] - M['mu02'])**2 + 4*M['mu11']**2)**0.5 / (M['mu20'] + M['mu02'])
-    else:
-        excentricidade = 0
-    descritores['Excentricidade'] = excentricidade
-    
-    # Circularidade
-    if perimetro > 0:
-        circularidade = (4 * np.pi * area) / (perimetro ** 2)
-    else:
-        circularidade = 0
-    descritores['Circularidade'] = circularidade
-    
-    # Compacidade
-    if area > 0:
-        compacidade = (perimetro ** 2) / area
-    else:
-        compacidade = 0
-    descritores['Compacidade'] = compacidade
-    
-    # Razão Perímetro/Área
-    if area > 0:
-        razao_pa = perimetro / area
-    else:
-        razao_pa = 0
-    descritores['Razao_P_A'] = razao_pa
-    
-    # Convex Hull e Solidez
-    hull = cv2.convexHull(contorno)
-    hull_area = cv2.contourArea(hull)
-    if hull_area > 0:
-        solidez = area / hull_area
-    else:
-        solidez = 0
-    descritores['Solidez'] = solidez
-    
-    # Alongamento (Aspect Ratio)
-    x, y, w, h = cv2.boundingRect(contorno)
-    if h > 0:
-        alongamento = w / h
-    else:
-        alongamento = 0
-    descritores['Alongamento'] = alongamento
-    
-    # Extent (razão entre área do contorno e área do bounding box)
-    rect_area = w * h
-    if rect_area > 0:
-        extent = area / rect_area
-    else:
-        extent = 0
-    descritores['Extent'] = extent
-    
-    # Número de cantos usando Harris Corner Detection
-    image_float = util.img_as_float(binary_img)
-    harris_response = feature.corner_harris(image_float, k=0.04, sigma=1.5)
-    coords = feature.corner_peaks(harris_response, min_distance=5, threshold_rel=0.05)
-    num_cantos = len(coords)
-    descritores['Num_Cantos'] = num_cantos
-    
-    return descritores
+    primitivas = PrimitivasForma(contorno, binary_img, modo_cantos, roi_margem,
+                                 area=area, perimetro=perimetro)
+    return extrair_descritores(primitivas, nomes)
 
-def processar_imagem(img_path):
-    """Processa uma imagem e retorna seus descritores"""
-    # Carregar imagem
-    img = cv2.imread(str(img_path), cv2.IMREAD_GRAYSCALE)
-    
-    if img is None:
-        return None
-    
-    # Verificar se o fundo é branco ou preto
-    mean_val = np.mean(img)
-    
-    # Se a média for alta, o fundo é branco (objeto preto)
-    if mean_val > 127:
-        # Binarização normal (objeto fica branco, fundo preto)
-        _, binary = cv2.threshold(img, 127, 255, cv2.THRESH_BINARY_INV)
+def _mascara_cantos(binary_filled, avaliacao):
+    # na avaliação analítica a base conta os cantos como as formas transformadas:
+    # sem a máscara, o Harris roda sobre o contorno rasterizado (PrimitivasForma)
+    return None if avaliacao == "analitica" else binary_filled
+
+@instrumentar("segmentar", medidas=lambda r: {"pontos_contorno": len(r[1])})
+def segmentar(img, usar_roi=False, modo_limiar="fixo", intensidade=None):
+    """
+    Binariza, preenche buracos e escolhe o contorno principal (None se não houver contornos)
+    
+    intensidade: dict de analisar_intensidade (polaridade e histograma); as imagens
+    transformadas usam o da original em vez de recalcular.
+    """
+    # Objeto branco em fundo preto, qualquer que seja a cor do fundo (detectada pela borda)
+    binary, _ = binarizar(img, intensidade, modo_limiar)
+    
+    if usar_roi:
+        # O contorno externo não muda com o preenchimento de buracos:
+        # os contornos saem da binária e só a ROI do objeto é preenchida
+        binary_filled = None
+        contours, _ = cv2.findContours(binary, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
     else:
-        # Binarização invertida (objeto já é branco)
-        _, binary = cv2.threshold(img, 127, 255, cv2.THRESH_BINARY)
-    
-    # Preencher buracos
-    binary_filled = binary_fill_holes(binary > 0).astype(np.uint8) * 255
-    
-    # Encontrar contornos
-    contours, _ = cv2.findContours(binary_filled, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        # Preencher buracos
+        binary_filled = binary_fill_holes(binary > 0).astype(np.uint8) * 255
+        
+        # Encontrar contornos
+        contours, _ = cv2.findContours(binary_filled, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
     
     if len(contours) == 0:
         return None
@@ -120,7 +85,7 @@ def processar_imagem(img_path):
     for cnt in contours:
         area = cv2.contourArea(cnt)
         # Ignorar contornos menores que 1% ou maiores que 95% da imagem
-        if 0.01 * img_area < area < 0.95 * img_area:
+        if AREA_MIN_REL * img_area < area < AREA_MAX_REL * img_area:
             valid_contours.append(cnt)
     
     if len(valid_contours) == 0:
@@ -130,37 +95,64 @@ def processar_imagem(img_path):
         # Pegar o maior contorno válido
         contorno = max(valid_contours, key=cv2.contourArea)
     
-    # Calcular área e perímetro
-    area = cv2.contourArea(contorno)
-    perimetro = cv2.arcLength(contorno, True)
+    if usar_roi:
+        binary_filled = fill_holes(binary, roi=cv2.boundingRect(contorno))
     
-    # Calcular descritores
-    descritores = calcular_descritores(contorno, area, perimetro, binary_filled)
-    
-    return descritores, img, binary_filled, contorno
+    return binary_filled, contorno
 
-def aplicar_rotacao(img, angulo):
+def processar_imagem(img_path, modo_cantos="harris", usar_roi=False, modo_limiar="fixo", img=None,
+                     avaliacao="raster"):
+    """
+    Processa uma imagem e retorna seus descritores
+    
+    img_path: caminho ou bytes da imagem; img: imagem já decodificada (cinza), se houver.
+    avaliacao: "analitica" conta os cantos Harris sobre o contorno rasterizado,
+    como nas transformações analíticas (a identidade dá distância zero).
+    """
+    with imagem_atual("<bytes>" if isinstance(img_path, (bytes, bytearray, memoryview)) else img_path):
+        # Carregar imagem
+        if img is None:
+            img = decodificar(img_path)
+        
+        if img is None:
+            return None
+        
+        segmentacao = segmentar(img, usar_roi, modo_limiar)
+        if segmentacao is None:
+            return None
+        binary_filled, contorno = segmentacao
+        
+        # Calcular área e perímetro
+        area = cv2.contourArea(contorno)
+        perimetro = cv2.arcLength(contorno, True)
+        
+        # Calcular descritores
+        descritores = calcular_descritores(contorno, area, perimetro, _mascara_cantos(binary_filled, avaliacao),
+                                           modo_cantos=modo_cantos,
+                                           roi_margem=MARGEM_ROI if usar_roi else None)
+        
+        return descritores, img, binary_filled, contorno
+
+def aplicar_rotacao(img, angulo, intensidade=None):
     """Aplica rotação na imagem"""
     h, w = img.shape
     centro = (w // 2, h // 2)
     M = cv2.getRotationMatrix2D(centro, angulo, 1.0)
     
-    # Determinar cor de fundo baseado na média
-    mean_val = np.mean(img)
-    border_value = 255 if mean_val > 127 else 0
+    # Cor de fundo detectada pela borda (histograma da original, se dado)
+    border_value = (intensidade or analisar_intensidade(img))["valor_fundo"]
     
     rotacionada = cv2.warpAffine(img, M, (w, h), borderValue=border_value)
     return rotacionada
 
-def aplicar_escala(img, fator):
+def aplicar_escala(img, fator, intensidade=None):
     """Aplica escala na imagem"""
     h, w = img.shape
     novo_w, novo_h = int(w * fator), int(h * fator)
     escalada = cv2.resize(img, (novo_w, novo_h))
     
     # Determinar cor de fundo
-    mean_val = np.mean(img)
-    border_value = 255 if mean_val > 127 else 0
+    border_value = (intensidade or analisar_intensidade(img))["valor_fundo"]
     
     # Adicionar padding para manter o tamanho original
     if fator < 1:
@@ -172,96 +164,510 @@ def aplicar_escala(img, fator):
     return escalada
 
 # ============================================
-# PARTE 1: ROBUSTEZ DOS DESCRITORES
+# TRANSFORMAÇÕES DA PARTE 1
 # ============================================
 
-def parte1_robustez(dataset_path):
-    """Avalia a robustez dos descritores"""
-    print("=" * 60)
-    print("PARTE 1: ROBUSTEZ DOS DESCRITORES")
-    print("=" * 60)
-    
-    # Coletar todas as imagens
-    imagens = list(Path(dataset_path).rglob("*.png")) + \
-              list(Path(dataset_path).rglob("*.jpg")) + \
-              list(Path(dataset_path).rglob("*.bmp"))
+# Definidas no nível do módulo (função, parâmetro) para poderem ser enviadas
+# aos processos do pool
+TRANSFORMACOES = {
+    'Rotacao_45': (aplicar_rotacao, 45),
+    'Rotacao_90': (aplicar_rotacao, 90),
+    'Rotacao_180': (aplicar_rotacao, 180),
+    'Escala_50': (aplicar_escala, 0.5)
+}
+
+# Matriz 2x3 equivalente a cada função, para a avaliação analítica
+# (transformação aplicada direto no contorno, sem gerar a imagem)
+MATRIZES = {
+    aplicar_rotacao: matriz_rotacao,
+    aplicar_escala: matriz_escala
+}
+
+AVALIACOES = ("raster", "analitica")
+
+def primitivas_base(img, modo_cantos="harris", usar_roi=False, modo_limiar="fixo", intensidade=None):
+    """
+    PrimitivasForma da imagem original (None se não houver contorno), para a
+    avaliação analítica. Quem avalia várias transformações da mesma imagem
+    calcula uma vez e passa a todas (descritores_transformacao(primitivas=...)).
+    Os cantos Harris saem do contorno rasterizado, como os das formas transformadas.
+    """
+    if intensidade is None:
+        intensidade = analisar_intensidade(img)
+    segmentacao = segmentar(img, usar_roi, modo_limiar, intensidade)
+    if segmentacao is None:
+        return None
+    _, contorno = segmentacao
+    return PrimitivasForma(contorno, None, modo_cantos)
+
+def _dados_base(img, opcoes, intensidade=None):
+    # histograma e (no modo analítico) primitivas da original, compartilhados pelas transformações
+    if intensidade is None:
+        intensidade = analisar_intensidade(img)
+    primitivas = None
+    if opcoes.get('avaliacao') == "analitica":
+        primitivas = primitivas_base(img, opcoes.get('modo_cantos', "harris"), opcoes.get('usar_roi', False),
+                                     opcoes.get('modo_limiar', "fixo"), intensidade)
+    return {'intensidade': intensidade, 'primitivas': primitivas}
+
+@instrumentar("transformacao")
+def descritores_transformacao(img, nome_trans, modo_cantos="harris", usar_roi=False, avaliacao="raster",
+                              modo_limiar="fixo", intensidade=None, primitivas=None):
+    """
+    Aplica uma transformação e retorna os descritores da imagem transformada (None se não houver contorno)
+    
+    avaliacao: "raster" gera a imagem transformada e a segmenta de novo (referência);
+    "analitica" transforma o contorno da imagem original (ver utils/AnalyticTransforms.py).
+    intensidade: dict de analisar_intensidade da original (None = calculado aqui).
+    primitivas: primitivas_base da original, no modo analítico (None = calculadas aqui).
+    Para várias transformações da mesma imagem, passe os dois.
+    """
+    func_trans, parametro = TRANSFORMACOES[nome_trans]
+    if intensidade is None:
+        intensidade = analisar_intensidade(img)
+    
+    if avaliacao == "analitica":
+        if primitivas is None:
+            primitivas = primitivas_base(img, modo_cantos, usar_roi, modo_limiar, intensidade)
+        if primitivas is None:
+            return None
+        h, w = img.shape
+        matriz = MATRIZES[func_trans](parametro, (w // 2, h // 2))
+        return extrair_descritores(transformar_primitivas(primitivas, [matriz])[0])
+    
+    # Aplicar transformação (polaridade e limiar da original valem para a transformada)
+    img_trans = func_trans(img, parametro, intensidade)
+    
+    # Processar imagem transformada
+    segmentacao = segmentar(img_trans, usar_roi, modo_limiar, intensidade)
+    if segmentacao is None:
+        return None
+    binary_trans, contorno = segmentacao
     
-    print(f"\nTotal de imagens encontradas: {len(imagens)}")
+    area = cv2.contourArea(contorno)
+    perimetro = cv2.arcLength(contorno, True)
     
-    # Armazenar descritores base
-    descritores_base = []
-    imagens_validas = []
+    # Calcular descritores transformados
+    return calcular_descritores(contorno, area, perimetro, binary_trans,
+                                modo_cantos=modo_cantos,
+                                roi_margem=MARGEM_ROI if usar_roi else None)
+
+def calcular_distancia_transformacao(img, vetor_base, nome_trans, **opcoes):
+    """Aplica uma transformação e retorna a distância ao vetor base (None se não houver contorno)"""
+    desc_trans = descritores_transformacao(img, nome_trans, **opcoes)
+    if desc_trans is None:
+        return None
+    vetor_trans = np.array(list(desc_trans.values()))
     
-    print("\n1. Calculando descritores base...")
-    for img_path in imagens:
-        resultado = processar_imagem(img_path)
-        if resultado is not None:
-            desc, _, _, _ = resultado
-            descritores_base.append(desc)
-            imagens_validas.append(img_path)
+    # Calcular distância euclidiana
+    return np.linalg.norm(vetor_base - vetor_trans)
+
+# ============================================
+# EXECUÇÃO EM PARALELO (POOL DE PROCESSOS)
+# ============================================
+
+def _vetor(descritores):
+    # vetor vazio = sem contorno (o mesmo que o cache grava)
+    return np.empty(0) if descritores is None else np.array(list(descritores.values()))
+
+def _descritores_imagem_worker(unidade, img=None):
+    """
+    Unidade de trabalho do pool: vetor base e vetores das transformações de uma imagem,
+    com uma única decodificação. com_base=False quando o vetor base já está no cache;
+    nomes_trans: transformações a calcular; img: imagem já decodificada (leitura antecipada).
+    Retorna (vetor_base, {transformação: vetor}), com vetor vazio onde não houve contorno.
+    """
+    img_path, com_base, nomes_trans, opcoes = unidade
+    if img is None:
+        img = decodificar(img_path)
+    if img is None:
+        return np.empty(0), {}
+    
+    vetor_base = None
+    if com_base:
+        resultado = processar_imagem(img_path, opcoes['modo_cantos'], opcoes['usar_roi'],
+                                     opcoes['modo_limiar'], img=img, avaliacao=opcoes['avaliacao'])
+        if resultado is None:
+            return np.empty(0), {}
+        vetor_base = _vetor(resultado[0])
+    
+    with imagem_atual(img_path):
+        base = _dados_base(img, opcoes) if nomes_trans else {}
+        vetores_trans = {nome_trans: _vetor(descritores_transformacao(img, nome_trans, **opcoes, **base))
+                         for nome_trans in nomes_trans}
+    return vetor_base, vetores_trans
+
+def _tamanho_chunk(n_unidades, n_workers, chunksize):
+    if chunksize is not None:
+        return chunksize
+    # ~4 chunks por worker equilibra carga sem excesso de comunicação
+    return max(1, n_unidades // (n_workers * 4))
+
+def _executar(executor, func, unidades, n_workers, chunksize):
+    """Aplica func às unidades, em série ou no pool, preservando a ordem"""
+    if executor is None:
+        return map(func, unidades)
+    return executor.map(func, unidades, chunksize=_tamanho_chunk(len(unidades), n_workers, chunksize))
+
+def _executar_com_leitura(leitor, func, unidades):
+    """Em série, com as imagens das próximas unidades lidas em threads (unidade[0] = caminho)"""
+    for unidade, (_, img) in zip(unidades, leitor):
+        yield func(unidade, img)
+
+# ============================================
+# CACHE DE DESCRITORES
+# ============================================
+
+def parametros_pipeline(modo_cantos="harris", usar_roi=False, avaliacao="raster", modo_limiar="fixo"):
+    """Parâmetros que alteram os descritores; mudar qualquer um invalida o cache"""
+    return {
+        'limiar': LIMIAR_FIXO,
+        'modo_limiar': modo_limiar,
+        'area_min_rel': AREA_MIN_REL,
+        'area_max_rel': AREA_MAX_REL,
+        'modo_cantos': modo_cantos,
+        'usar_roi': usar_roi,
+        'avaliacao': avaliacao,
+        'margem_roi': MARGEM_ROI,
+        'transformacoes': {nome: [func.__name__, param] for nome, (func, param) in TRANSFORMACOES.items()},
+        # na analítica os cantos Harris da base saem do contorno rasterizado (_mascara_cantos)
+        **({'cantos_base': 'contorno_rasterizado'} if avaliacao == "analitica" else {}),
+        **parametros_engine()
+    }
+
+def parametros_descritores_base(modo_cantos="harris", usar_roi=False, avaliacao="raster", modo_limiar="fixo"):
+    """
+    Parâmetros que alteram os descritores base (os da TabelaDescritores): os do
+    pipeline sem os das transformações e sem o ROI, que não muda os valores.
+    A avaliação fica: na analítica os cantos Harris da base saem do contorno rasterizado
+    """
+    parametros = parametros_pipeline(modo_cantos, usar_roi, avaliacao, modo_limiar)
+    for chave in ('transformacoes', 'usar_roi', 'margem_roi'):
+        del parametros[chave]
+    return parametros
+
+def _consultar_cache(cache, h):
+    """(vetor base, {transformação: vetor}) de uma imagem no cache; None onde não há entrada"""
+    if cache is None:
+        return None, dict.fromkeys(TRANSFORMACOES)
+    base = cache.obter(h, 'base')
+    if base is not None and len(base) == 0:
+        # imagem sem contorno: as transformações não são calculadas
+        return base, {}
+    return base, {nome_trans: cache.obter(h, nome_trans) for nome_trans in TRANSFORMACOES}
+
+def _pendente(base, trans):
+    return base is None or any(vetor is None for vetor in trans.values())
+
+# ============================================
+# PARTE 1 EM LOTE
+# ============================================
+
+def _parte1_em_lote(dataset_path, opcoes, n_workers, chunksize, cache, dtype,
+                    profundidade_leitura=PROFUNDIDADE_LEITURA, imagens=None):
+    """
+    Parte 1 em série ou no pool, com cache opcional. Cada imagem é uma unidade de
+    trabalho, decodificada uma única vez para o vetor base e as transformações;
+    com cache, só o que falta no cache é calculado. Em série, as próximas
+    profundidade_leitura imagens são lidas em threads (LeitorImagens); no pool,
+    cada processo lê as suas e a leitura de um se sobrepõe ao cálculo dos outros.
+    imagens: só essas imagens do dataset (None = todas).
+    Retorna a tabela base, as imagens válidas e os vetores transformados
+    (imagens x transformações x descritores, NaN onde não houve contorno).
+    """
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+    
+    fechar_cache = isinstance(cache, (str, Path))
+    if fechar_cache:
+        cache = CacheDescritores(cache, parametros_pipeline(**opcoes))
     
-    print(f"   Imagens processadas com sucesso: {len(descritores_base)}")
+    # Coletar todas as imagens
+    if imagens is None:
+        imagens = listar_imagens(dataset_path)
     
-    # Transformações
-    transformacoes = {
-        'Rotacao_45': lambda img: aplicar_rotacao(img, 45),
-        'Rotacao_90': lambda img: aplicar_rotacao(img, 90),
-        'Rotacao_180': lambda img: aplicar_rotacao(img, 180),
-        'Escala_50': lambda img: aplicar_escala(img, 0.5)
-    }
+    print(f"\nTotal de imagens encontradas: {len(imagens)}")
     
-    # Calcular distâncias
-    distancias = {t: [] for t in transformacoes.keys()}
+    hashes = [hash_conteudo(img_path) if cache is not None else None for img_path in imagens]
     
-    print("\n2. Aplicando transformações e calculando distâncias...")
-    for idx, img_path in enumerate(imagens_validas):
-        img = cv2.imread(str(img_path), cv2.IMREAD_GRAYSCALE)
-        desc_base = descritores_base[idx]
-        vetor_base = np.array(list(desc_base.values()))
+    # Armazenar descritores base (tabela colunar, uma linha por imagem válida)
+    tabela = TabelaDescritores(dtype=dtype, capacidade=len(imagens))
+    imagens_validas = []
+    transformados = []
+    
+    # Consulta o cache antes: só as imagens com algo faltando viram unidades de trabalho
+    consultas = [_consultar_cache(cache, h) for h in hashes]
+    unidades = [
+        (img_path, base is None, [nome for nome, vetor in trans.items() if vetor is None], opcoes)
+        for img_path, (base, trans) in zip(imagens, consultas)
+        if _pendente(base, trans)
+    ]
+    
+    executor = ProcessPoolExecutor(max_workers=n_workers) if n_workers > 1 else None
+    leitor = None
+    
+    try:
+        print("\n1-2. Descritores base e transformações (uma decodificação por imagem)...")
+        # A ordem das imagens é preservada, então as listas de distâncias
+        # são as mesmas em série, no pool ou com cache
+        if executor is None:
+            leitor = LeitorImagens([unidade[0] for unidade in unidades], profundidade_leitura)
+            calculados = _executar_com_leitura(leitor, _descritores_imagem_worker, unidades)
+        else:
+            calculados = _executar(executor, _descritores_imagem_worker, unidades, n_workers, chunksize)
         
-        for nome_trans, func_trans in transformacoes.items():
-            # Aplicar transformação
-            img_trans = func_trans(img)
-            
-            # Processar imagem transformada
-            mean_val = np.mean(img_trans)
-            if mean_val > 127:
-                _, binary_trans = cv2.threshold(img_trans, 127, 255, cv2.THRESH_BINARY_INV)
-            else:
-                _, binary_trans = cv2.threshold(img_trans, 127, 255, cv2.THRESH_BINARY)
+        for i, (img_path, h, (base, trans)) in enumerate(zip(imagens, hashes, consultas)):
+            if _pendente(base, trans):
+                base_calculada, trans_calculadas = next(calculados)
+                nova_base = base is None
+                if nova_base:
+                    base = base_calculada
+                trans.update(trans_calculadas)
+                if cache is not None:
+                    if nova_base:
+                        cache.guardar(h, 'base', base)
+                    for nome_trans, vetor in trans_calculadas.items():
+                        cache.guardar(h, nome_trans, vetor)
             
-            binary_trans = binary_fill_holes(binary_trans > 0).astype(np.uint8) * 255
+            if (i + 1) % 20 == 0:
+                print(f"   Processadas {i + 1}/{len(imagens)} imagens")
+            if len(base) == 0:
+                continue
             
-            # Encontrar contornos
-            contours, _ = cv2.findContours(binary_trans, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-            
-            if len(contours) > 0:
-                # Filtrar contornos
-                img_area = img_trans.shape[0] * img_trans.shape[1]
-                valid_contours = [cnt for cnt in contours 
-                                 if 0.01 * img_area < cv2.contourArea(cnt) < 0.95 * img_area]
-                
-                if len(valid_contours) == 0:
-                    contorno = max(contours, key=cv2.contourArea)
-                else:
-                    contorno = max(valid_contours, key=cv2.contourArea)
-                
-                area = cv2.contourArea(contorno)
-                perimetro = cv2.arcLength(contorno, True)
-                
-                # Calcular descritores transformados
-                desc_trans = calcular_descritores(contorno, area, perimetro, binary_trans)
-                vetor_trans = np.array(list(desc_trans.values()))
-                
-                # Calcular distância euclidiana
-                dist = np.linalg.norm(vetor_base - vetor_trans)
-                distancias[nome_trans].append(dist)
+            tabela.adicionar(img_path, base, extrair_classe(img_path))
+            imagens_validas.append(img_path)
+            # NaN = transformação sem contorno
+            transformados.append([trans[nome] if trans.get(nome) is not None and len(trans[nome])
+                                  else np.full(len(base), np.nan) for nome in TRANSFORMACOES])
         
-        if (idx + 1) % 20 == 0:
-            print(f"   Processadas {idx + 1}/{len(imagens_validas)} imagens")
+        print(f"   Imagens processadas com sucesso: {len(tabela)}")
+        if leitor is not None:
+            print(f"   Leitura: {leitor.lidas} imagens, {leitor.espera_ms:.0f} ms esperando o disco")
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        if cache is not None:
+            cache.salvar()
+            print(f"   Cache: {cache.acertos} reaproveitados, {cache.falhas} calculados")
+            if fechar_cache:
+                cache.fechar()
+    
+    transformados = np.array(transformados, dtype=np.float64).reshape(-1, len(TRANSFORMACOES), len(DESCRITORES))
+    return tabela, imagens_validas, transformados
+
+# ============================================
+# PARTE 1 INCREMENTAL
+# ============================================
+
+def _parte1_incremental(dataset_path, opcoes, n_workers, chunksize, cache, dtype, profundidade_leitura,
+                        pasta_estado):
+    """
+    Parte 1 só com as imagens novas ou alteradas desde a execução anterior
+    (manifesto em pasta_estado: caminho, tamanho, mtime e hash). As removidas e
+    as alteradas saem do estado, as novas e alteradas são processadas e entram;
+    as médias e a separação entre classes são atualizadas com essas diferenças.
+    Retorna a tabela (todas as imagens válidas), os IDs, os vetores transformados
+    e o EstadoIncremental já gravado.
+    """
+    estado = EstadoIncremental.carregar(pasta_estado, parametros_pipeline(**opcoes), DESCRITORES,
+                                        TRANSFORMACOES, DESCRITORES_SEPARACAO)
+    manifesto, novas, alteradas, removidas = comparar_manifesto(listar_imagens(dataset_path),
+                                                                estado.manifesto)
+    print(f"\nIncremental: {len(novas)} novas, {len(alteradas)} alteradas, {len(removidas)} removidas, "
+          f"{len(manifesto) - len(novas) - len(alteradas)} inalteradas")
+    
+    estado.remover(removidas + [str(img_path) for img_path in alteradas])
+    pendentes = novas + alteradas
+    if pendentes:
+        tabela_nova, validas, transformados = _parte1_em_lote(
+            dataset_path, opcoes, n_workers, chunksize, cache, dtype, profundidade_leitura, imagens=pendentes
+        )
+        estado.adicionar(validas, tabela_nova.rotulos, tabela_nova.valores, transformados)
+    estado.manifesto = manifesto
+    estado.salvar(pasta_estado)
+    
+    tabela = TabelaDescritores(dtype=dtype, capacidade=len(estado))
+    for id_imagem, vetor, classe in zip(estado.ids, estado.base, estado.classes):
+        tabela.adicionar(id_imagem, vetor, classe)
+    print(f"   Estado em {pasta_estado}: {len(estado)} imagens válidas")
+    return tabela, list(estado.ids), estado.transformados, estado
+
+# ============================================
+# PIPELINE EM STREAMING
+# ============================================
+
+# Cada etapa recebe e devolve um dicionário com os dados da imagem; os
+# dados que não serão mais usados são descartados ao longo do caminho
+
+def _etapa_segmentar(item, usar_roi=False, modo_limiar="fixo"):
+    # cada etapa roda na sua thread: o ID da imagem é marcado em cada uma
+    with imagem_atual(item['caminho']):
+        # histograma calculado uma vez, reaproveitado pelas transformações
+        item['intensidade'] = analisar_intensidade(item['img'])
+        segmentacao = segmentar(item['img'], usar_roi, modo_limiar, item['intensidade'])
+    if segmentacao is None:
+        return None
+    item['binary_filled'], item['contorno'] = segmentacao
+    return item
+
+def _etapa_descrever(item, modo_cantos="harris", usar_roi=False, avaliacao="raster"):
+    contorno = item.pop('contorno')
+    area = cv2.contourArea(contorno)
+    perimetro = cv2.arcLength(contorno, True)
+    with imagem_atual(item['caminho']):
+        descritores = calcular_descritores(contorno, area, perimetro,
+                                           _mascara_cantos(item.pop('binary_filled'), avaliacao),
+                                           modo_cantos=modo_cantos,
+                                           roi_margem=MARGEM_ROI if usar_roi else None)
+    item['vetor_base'] = np.array(list(descritores.values()))
+    return item
+
+def _etapa_transformar(item, opcoes):
+    img = item.pop('img')
+    intensidade = item.pop('intensidade')
+    item['vetores_trans'] = {}
+    with imagem_atual(item['caminho']):
+        base = _dados_base(img, opcoes, intensidade)
+        for nome_trans in TRANSFORMACOES:
+            desc_trans = descritores_transformacao(img, nome_trans, **opcoes, **base)
+            if desc_trans is not None:
+                item['vetores_trans'][nome_trans] = np.array(list(desc_trans.values()))
+    return item
+
+def _etapa_distancias(item):
+    # uma linha por transformação, na ordem de TRANSFORMACOES (NaN = sem contorno)
+    vetores_trans = item.pop('vetores_trans')
+    transformados = np.full((len(TRANSFORMACOES), len(item['vetor_base'])), np.nan)
+    for j, nome_trans in enumerate(TRANSFORMACOES):
+        if nome_trans in vetores_trans:
+            transformados[j] = vetores_trans[nome_trans]
+    
+    dist = distancias_transformacoes(item['vetor_base'][None], transformados[None])[0]
+    item['transformados'] = transformados
+    item['distancias'] = {nome_trans: d for nome_trans, d in zip(TRANSFORMACOES, dist)
+                          if nome_trans in vetores_trans}
+    return item
+
+def parte1_streaming(dataset_path, sink, modo_cantos="harris", usar_roi=False, avaliacao="raster",
+                     tamanho_fila=TAMANHO_FILA, modo_limiar="fixo", profundidade_leitura=PROFUNDIDADE_LEITURA):
+    """
+    Parte 1 como pipeline de geradores: descobrir -> carregar -> binarizar/contorno ->
+    descritores -> transformações -> distâncias. Cada imagem é decodificada uma
+    única vez, as etapas são ligadas por filas limitadas e cada resultado
+    ({'caminho', 'vetor_base', 'transformados', 'distancias'}) é entregue ao sink assim que fica
+    pronto. Retorna o número de imagens processadas.
+    profundidade_leitura: imagens lidas e decodificadas antecipadamente em threads (LeitorImagens).
+    """
+    opcoes = {'modo_cantos': modo_cantos, 'usar_roi': usar_roi}
+    # decodificada uma única vez: base e transformações usam a mesma imagem
+    leitor = LeitorImagens(descobrir_imagens(dataset_path), profundidade_leitura)
+    fonte = ({'caminho': img_path, 'img': img} for img_path, img in leitor if img is not None)
+    etapas = [
+        partial(_etapa_segmentar, usar_roi=usar_roi, modo_limiar=modo_limiar),
+        partial(_etapa_descrever, **opcoes, avaliacao=avaliacao),
+        partial(_etapa_transformar, opcoes={**opcoes, 'avaliacao': avaliacao, 'modo_limiar': modo_limiar}),
+        _etapa_distancias,
+    ]
+    return executar_pipeline(fonte, etapas, sink, tamanho_fila)
+
+def _parte1_em_streaming(dataset_path, opcoes, dtype, profundidade_leitura=PROFUNDIDADE_LEITURA):
+    """Parte 1 via parte1_streaming, acumulando só a tabela e os vetores transformados"""
+    tabela = TabelaDescritores(dtype=dtype)
+    imagens_validas = []
+    transformados = []
     
-    # Calcular distâncias médias
-    distancias_medias = {t: np.mean(dists) for t, dists in distancias.items()}
+    def coletar(item):
+        tabela.adicionar(item['caminho'], item['vetor_base'], extrair_classe(item['caminho']))
+        imagens_validas.append(item['caminho'])
+        transformados.append(item['transformados'])
+        if len(tabela) % 20 == 0:
+            print(f"   Processadas {len(tabela)} imagens")
+    
+    print("\n1-2. Descritores base, transformações e distâncias (streaming)...")
+    parte1_streaming(dataset_path, coletar, profundidade_leitura=profundidade_leitura, **opcoes)
+    print(f"   Imagens processadas com sucesso: {len(tabela)}")
+    
+    transformados = np.array(transformados).reshape(-1, len(TRANSFORMACOES), len(DESCRITORES))
+    return tabela, imagens_validas, transformados
+
+# ============================================
+# PARTE 1: ROBUSTEZ DOS DESCRITORES
+# ============================================
+
+def parte1_robustez(dataset_path, n_workers=1, chunksize=None, modo_cantos="harris", usar_roi=False,
+                    cache=None, dtype=np.float64, streaming=False, avaliacao="raster",
+                    normalizacao="nenhuma", saida_desvios=None, saida_figura=None, modo_limiar="fixo",
+                    profundidade_leitura=PROFUNDIDADE_LEITURA, incremental=None):
+    """
+    Avalia a robustez dos descritores
+    
+    n_workers: número de processos (1 = serial, None = todos os núcleos).
+    chunksize: imagens enviadas por vez a cada processo (cada unidade de trabalho é uma
+    imagem inteira: descritores base e transformações, com uma decodificação).
+    modo_cantos: "harris" ou "contorno" (ver utils/DescriptorEngine.py).
+    usar_roi: preenchimento de buracos e Harris só em volta do objeto.
+    cache: caminho (ou CacheDescritores) do cache em disco; só imagens novas
+    ou alteradas são recalculadas.
+    dtype: tipo das colunas da TabelaDescritores retornada (float64 ou float32).
+    streaming: usa o pipeline de geradores (parte1_streaming), com memória
+    constante e uma decodificação por imagem; n_workers, chunksize e cache
+    não se aplicam nesse modo.
+    avaliacao: "raster" (padrão) gera e segmenta cada imagem transformada;
+    "analitica" aplica a transformação direto no contorno original, muito
+    mais barato e sem o ruído da reamostragem (ver utils/AnalyticTransforms.py).
+    normalizacao: "nenhuma", "desvio_padrao" ou "amplitude"; divide cada descritor
+    pela sua escala no dataset antes das distâncias e desvios (ver utils/Robustness.py).
+    saida_desvios: caminho .npz para gravar os desvios (imagens x transformações x descritores).
+    saida_figura: caminho .png/.svg do gráfico; None abre a janela (plt.show).
+    modo_limiar: binarização "fixo" (limiar 127), "otsu" ou "adaptativo" (ver utils/Thresholding.py).
+    profundidade_leitura: imagens lidas e decodificadas antecipadamente em threads enquanto
+    a atual é processada (em série e em streaming); 0 = sem leitura antecipada.
+    incremental: pasta do estado entre execuções; só as imagens novas ou alteradas
+    são processadas, as removidas saem, e as médias e a separação entre classes
+    (ver parte2_discriminacao) são atualizadas em vez de recalculadas. A tabela
+    segue a ordem de entrada no estado. Não se aplica ao modo streaming.
+    O resultado é idêntico ao da execução serial e segue a ordem das imagens.
+    """
+    print("=" * 60)
+    print("PARTE 1: ROBUSTEZ DOS DESCRITORES")
+    print("=" * 60)
+    
+    if avaliacao not in AVALIACOES:
+        raise ValueError(f"avaliacao deve ser uma de {AVALIACOES}, recebido: {avaliacao!r}")
+    if modo_limiar not in MODOS_LIMIAR:
+        raise ValueError(f"modo_limiar deve ser um de {MODOS_LIMIAR}, recebido: {modo_limiar!r}")
+    if streaming and incremental is not None:
+        raise ValueError("incremental não se aplica ao modo streaming")
+    
+    opcoes = {'modo_cantos': modo_cantos, 'usar_roi': usar_roi, 'avaliacao': avaliacao,
+              'modo_limiar': modo_limiar}
+    estado = None
+    if streaming:
+        tabela, imagens_validas, transformados = _parte1_em_streaming(dataset_path, opcoes, dtype,
+                                                                      profundidade_leitura)
+    elif incremental is not None:
+        tabela, imagens_validas, transformados, estado = _parte1_incremental(
+            dataset_path, opcoes, n_workers, chunksize, cache, dtype, profundidade_leitura, incremental
+        )
+    else:
+        tabela, imagens_validas, transformados = _parte1_em_lote(
+            dataset_path, opcoes, n_workers, chunksize, cache, dtype, profundidade_leitura
+        )
+    
+    tabela.parametros = parametros_descritores_base(**opcoes)
+    
+    # Distâncias e desvios por descritor de todas as imagens de uma vez
+    desvios_desc = desvios(tabela.valores, transformados, normalizacao)
+    
+    if estado is not None and normalizacao == "nenhuma":
+        # médias mantidas pelo estado incremental (sem normalização, a parcela de cada imagem não muda)
+        distancias_medias = estado.distancias_medias()
+        resumo_abs = pd.DataFrame(estado.desvios_medios(), index=list(TRANSFORMACOES), columns=tabela.nomes)
+    else:
+        distancias = distancias_transformacoes(tabela.valores, transformados, normalizacao)
+        # Calcular distâncias médias (imagens sem contorno na transformação ficam de fora)
+        distancias_medias = {t: np.nanmean(distancias[:, j]) for j, t in enumerate(TRANSFORMACOES)}
+        resumo_abs = tabela_resumo(desvios_desc['absoluto'], TRANSFORMACOES, tabela.nomes)
     
     # Criar tabela
     print("\n3. RESULTADOS - Distâncias Médias:")
@@ -273,6 +679,21 @@ def parte1_robustez(dataset_path):
     print(df_distancias.to_string(index=False))
     print("-" * 60)
     
+    # Quais descritores respondem pela distância
+    resumo_rel = tabela_resumo(desvios_desc['relativo'], TRANSFORMACOES, tabela.nomes, "mediana")
+    print(f"\n4. Desvio absoluto médio por descritor (normalização: {normalizacao}):")
+    print(resumo_abs.round(4).to_string())
+    print("\n   Desvio relativo mediano por descritor (|t - b| / |b|):")
+    print(resumo_rel.round(4).to_string())
+    print("\n   Descritor menos estável por transformação (desvio absoluto):")
+    print(descritor_menos_estavel(resumo_abs).round(4).to_string())
+    
+    if saida_desvios is not None:
+        np.savez(saida_desvios, absoluto=desvios_desc['absoluto'], relativo=desvios_desc['relativo'],
+                 transformacoes=np.array(list(TRANSFORMACOES)), descritores=np.array(tabela.nomes),
+                 imagens=np.array([str(p) for p in imagens_validas]))
+        print(f"\n   Desvios salvos em {saida_desvios}")
+    
     # Visualização
     plt.figure(figsize=(10, 6))
     plt.bar(distancias_medias.keys(), distancias_medias.values(), color='steelblue')
@@ -281,43 +702,36 @@ def parte1_robustez(dataset_path):
     plt.title('Robustez dos Descritores por Transformação', fontsize=14, fontweight='bold')
     plt.xticks(rotation=45)
     plt.tight_layout()
-    plt.show()
+    mostrar_ou_salvar(plt.gcf(), saida_figura)
     
-    return descritores_base, imagens_validas, df_distancias
+    return tabela, imagens_validas, df_distancias
 
 # ============================================
 # PARTE 2: CAPACIDADE DISCRIMINATIVA
 # ============================================
 
-def parte2_discriminacao(descritores_base, imagens_validas):
-    """Avalia a capacidade discriminativa dos descritores"""
+def parte2_discriminacao(tabela, n_pares=10, saida=None, saida_figura=None, incremental=None):
+    """
+    Avalia a capacidade discriminativa dos descritores
+    
+    n_pares: quantos pares de classes mais próximos imprimir.
+    saida: caminho .npz para gravar todas as métricas de separação.
+    saida_figura: caminho .png/.svg do gráfico de dispersão; None abre a janela.
+    incremental: pasta do estado gravado por parte1_robustez(incremental=...); as
+    métricas vêm da separação mantida pelo estado, sem recalcular do zero.
+    """
     print("\n" + "=" * 60)
     print("PARTE 2: CAPACIDADE DISCRIMINATIVA")
     print("=" * 60)
     
-    # Extrair classes dos nomes dos arquivos
-    classes = []
-    for img_path in imagens_validas:
-        # Tentar extrair classe do nome do arquivo ou diretório
-        nome_arquivo = img_path.stem  # Nome sem extensão
-        # Assumindo padrão: trainimage1_1.png -> classe 1
-        if '_' in nome_arquivo:
-            classe_num = nome_arquivo.split('_')[0].replace('trainimage', '')
-            classes.append(f"Classe_{classe_num}")
-        else:
-            classe = img_path.parent.name
-            classes.append(classe)
-    
-    # Criar DataFrame
-    df = pd.DataFrame(descritores_base)
-    df['Classe'] = classes
+    # Classes extraídas dos nomes dos arquivos ao preencher a tabela
+    df = tabela.para_dataframe()
     
     print(f"\nClasses encontradas: {df['Classe'].nunique()}")
     print(f"Distribuição: \n{df['Classe'].value_counts()}")
     
-    # Escolher dois descritores (você pode modificar)
-    desc1 = 'Circularidade'
-    desc2 = 'Alongamento'
+    # Escolher dois descritores (DESCRITORES_SEPARACAO)
+    desc1, desc2 = DESCRITORES_SEPARACAO
     
     print(f"\n1. Descritores escolhidos: {desc1} e {desc2}")
     print("   Justificativa: Circularidade mede o quão próximo a forma está de um círculo,")
@@ -342,21 +756,40 @@ def parte2_discriminacao(descritores_base, imagens_validas):
     plt.legend(bbox_to_anchor=(1.05, 1), loc='upper left', fontsize=10)
     plt.grid(True, alpha=0.3)
     plt.tight_layout()
-    plt.show()
+    mostrar_ou_salvar(plt.gcf(), saida_figura)
     
     # Análise de separação
     print("\n2. Análise da Separação entre Classes:")
     print("-" * 60)
     
-    # Calcular centróides das classes
-    centroides = df.groupby('Classe')[[desc1, desc2]].mean()
-    
-    # Calcular distâncias entre centróides
-    print("\nDistâncias entre centróides das classes:")
-    for i, classe1 in enumerate(classes_unicas):
-        for classe2 in classes_unicas[i+1:]:
-            dist = distance.euclidean(centroides.loc[classe1], centroides.loc[classe2])
-            print(f"   {classe1} <-> {classe2}: {dist:.4f}")
+    # Métricas vetorizadas (centróides, silhueta, Fisher, margens) sobre os
+    # descritores escolhidos; qualquer subconjunto de tabela.nomes funciona
+    nomes = [desc1, desc2]
+    X = tabela.valores[:, [tabela.nomes.index(nome) for nome in nomes]]
+    estado = EstadoIncremental.ler(incremental) if incremental is not None else None
+    if estado is not None and estado.ids == tabela.ids and estado.nomes_separacao == nomes:
+        print("   (separação atualizada incrementalmente)")
+        resultados = estado.separacao.resultados(tabela.classes)
+    else:
+        if incremental is not None:
+            print(f"   Estado em {incremental} não corresponde à tabela: recalculando")
+        resultados = analisar_separacao(X, tabela.codigos_classe, len(tabela.classes))
+    
+    print(f"\nSilhueta média: {resultados['silhueta'].mean():.4f}")
+    print(f"Amostras mais perto de outra classe que da própria: "
+          f"{(resultados['margem_amostras'] < 0).sum()}/{len(X)}")
+    print("Razão de Fisher por descritor:")
+    for nome, razao in zip(nomes, resultados['razao_fisher']):
+        print(f"   {nome}: {razao:.4f}")
+    
+    print(f"\nPares de classes com centróides mais próximos (top {n_pares}):")
+    for i, j, dist in pares_mais_proximos(resultados['distancias_centroides'], n_pares):
+        classe1, classe2 = sorted((tabela.classes[i], tabela.classes[j]))
+        print(f"   {classe1} <-> {classe2}: {dist:.4f}")
+    
+    if saida is not None:
+        salvar_separacao(resultados, saida, tabela.classes, nomes)
+        print(f"\nMétricas de separação salvas em {saida}")
     
     return df
 
@@ -367,16 +800,37 @@ def parte2_discriminacao(descritores_base, imagens_validas):
 if __name__ == "__main__":
     # CONFIGURAR O CAMINHO DO DATASET
     dataset_path = "./Kimia99_DB"  # Ajuste conforme necessário
+    n_workers = None  # None = todos os núcleos, 1 = execução serial
+    modo_cantos = "harris"  # "harris" ou "contorno" (mais rápido)
+    usar_roi = False  # True = processa só a região em volta do objeto
+    cache = "descritores_cache.sqlite"  # None = sem cache em disco
+    pasta_figuras = None  # ex.: "figuras" = grava os gráficos em arquivo (sem janela)
+    modo_limiar = "fixo"  # "otsu" ou "adaptativo" (iluminação desigual, digitalizações)
+    incremental = None  # ex.: "estado_incremental" = reprocessa só as imagens novas ou alteradas
+    
+    figuras = {}
+    if pasta_figuras is not None:
+        modo_headless()
+        figuras = {'parte1': f"{pasta_figuras}/robustez.png", 'parte2': f"{pasta_figuras}/discriminacao.png"}
     
     print("ATIVIDADE: DESCRITORES DE FORMA - KIMIA 99")
     print("IFCE - Engenharia de Computação - 2025.2")
     print()
     
     # Parte 1
-    descritores_base, imagens_validas, df_distancias = parte1_robustez(dataset_path)
+    tabela, imagens_validas, df_distancias = parte1_robustez(dataset_path, n_workers=n_workers,
+                                                                       modo_cantos=modo_cantos,
+                                                                       usar_roi=usar_roi,
+                                                                       cache=cache,
+                                                                       modo_limiar=modo_limiar,
+                                                                       saida_figura=figuras.get('parte1'),
+                                                                       incremental=incremental)
     
     # Parte 2
-    df_resultados = parte2_discriminacao(descritores_base, imagens_validas)
+    df_resultados = parte2_discriminacao(tabela, saida="separacao_classes.npz",
+                                         saida_figura=figuras.get('parte2'),
+                                         incremental=incremental)
+    tabela.salvar("descritores_kimia99")
     
     print("\n" + "=" * 60)
     print("ANÁLISE CONCLUÍDA!")
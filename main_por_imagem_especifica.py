@@ -3,9 +3,11 @@ import numpy as np
 import matplotlib.pyplot as plt
 from pathlib import Path
 import pandas as pd
-from skimage import util, feature
 from scipy.ndimage import binary_fill_holes
 
+from utils.DescriptorEngine import PrimitivasForma, extrair_descritores
+from utils.ImageLoader import decodificar
+
 # ============================================
 # FUNÇÃO PARA ANÁLISE DETALHADA DE UMA IMAGEM
 # ============================================
@@ -20,12 +22,13 @@ def analisar_imagem_detalhada(img_path):
     
     # 1. CARREGAR IMAGEM
     print("\n[1] CARREGANDO IMAGEM...")
-    img_original = cv2.imread(str(img_path))
-    img_gray = cv2.imread(str(img_path), cv2.IMREAD_GRAYSCALE)
+    # uma decodificação só: o cinza sai do buffer colorido (ou é o próprio, se o arquivo for cinza)
+    img_original = decodificar(img_path, cor=True)
     
-    if img_gray is None:
+    if img_original is None:
         print(" Erro ao carregar a imagem!")
         return
+    img_gray = cv2.cvtColor(img_original, cv2.COLOR_BGR2GRAY) if img_original.ndim == 3 else img_original
     
     print(f"✓ Imagem carregada com sucesso!")
     print(f"  - Dimensões: {img_gray.shape[1]}x{img_gray.shape[0]} pixels")
@@ -101,83 +104,42 @@ def analisar_imagem_detalhada(img_path):
     print("\n[5] DESCRITORES DE FORMA...")
     print("-" * 80)
     
-    descritores = {}
-    
-    # Momentos
-    M = cv2.moments(contorno)
+    primitivas = PrimitivasForma(contorno, binary_filled, area=area, perimetro=perimetro,
+                                 bbox=(x, y, w, h), hull=hull, hull_area=hull_area)
+    descritores = extrair_descritores(primitivas)
+    coords = primitivas.coords_cantos
+    num_cantos = descritores['Num_Cantos']
     
     # 5.1 Excentricidade
-    if M['mu20'] + M['mu02'] != 0:
-        excentricidade = ((M['mu20'] - M['mu02'])**2 + 4*M['mu11']**2)**0.5 / (M['mu20'] + M['mu02'])
-    else:
-        excentricidade = 0
-    descritores['Excentricidade'] = excentricidade
-    print(f"  • Excentricidade: {excentricidade:.4f}")
+    print(f"  • Excentricidade: {descritores['Excentricidade']:.4f}")
     print(f"    (Mede o quão alongada é a forma - 0: circular, 1: muito alongada)")
     
     # 5.2 Circularidade
-    if perimetro > 0:
-        circularidade = (4 * np.pi * area) / (perimetro ** 2)
-    else:
-        circularidade = 0
-    descritores['Circularidade'] = circularidade
-    print(f"\n  • Circularidade: {circularidade:.4f}")
+    print(f"\n  • Circularidade: {descritores['Circularidade']:.4f}")
     print(f"    (Quão próximo de um círculo - 1: círculo perfeito, <1: menos circular)")
     
     # 5.3 Compacidade
-    if area > 0:
-        compacidade = (perimetro ** 2) / area
-    else:
-        compacidade = 0
-    descritores['Compacidade'] = compacidade
-    print(f"\n  • Compacidade: {compacidade:.4f}")
+    print(f"\n  • Compacidade: {descritores['Compacidade']:.4f}")
     print(f"    (Relação perímetro²/área - menor valor = mais compacta)")
     
     # 5.4 Razão Perímetro/Área
-    if area > 0:
-        razao_pa = perimetro / area
-    else:
-        razao_pa = 0
-    descritores['Razao_P_A'] = razao_pa
-    print(f"\n  • Razão Perímetro/Área: {razao_pa:.4f}")
+    print(f"\n  • Razão Perímetro/Área: {descritores['Razao_P_A']:.4f}")
     print(f"    (Complexidade da borda)")
     
     # 5.5 Solidez
-    if hull_area > 0:
-        solidez = area / hull_area
-    else:
-        solidez = 0
-    descritores['Solidez'] = solidez
-    print(f"\n  • Solidez: {solidez:.4f}")
+    print(f"\n  • Solidez: {descritores['Solidez']:.4f}")
     print(f"    (Proporção da área preenchida - 1: sem concavidades)")
     
     # 5.6 Alongamento
-    if h > 0:
-        alongamento = w / h
-    else:
-        alongamento = 0
-    descritores['Alongamento'] = alongamento
-    print(f"\n  • Alongamento (Aspect Ratio): {alongamento:.4f}")
+    print(f"\n  • Alongamento (Aspect Ratio): {descritores['Alongamento']:.4f}")
     print(f"    (Razão largura/altura - 1: quadrado, >1: horizontal, <1: vertical)")
     
     # 5.7 Extent
-    rect_area = w * h
-    if rect_area > 0:
-        extent = area / rect_area
-    else:
-        extent = 0
-    descritores['Extent'] = extent
-    print(f"\n  • Extent: {extent:.4f}")
+    print(f"\n  • Extent: {descritores['Extent']:.4f}")
     print(f"    (Proporção da área em relação ao bounding box)")
     
     # 5.8 Número de Cantos usando Harris Corner Detection
-    print(f"\n  • Detectando cantos com Harris Corner Detection...")
-    image_float = util.img_as_float(binary_filled)
-    harris_response = feature.corner_harris(image_float, k=0.04, sigma=1.5)
-    coords = feature.corner_peaks(harris_response, min_distance=5, threshold_rel=0.05)
-    num_cantos = len(coords)
-    descritores['Num_Cantos'] = num_cantos
-    print(f"  • Número de Cantos (Harris): {num_cantos}")
+    print(f"\n  • Número de Cantos (Harris): {num_cantos}")
     print(f"    (Pontos de curvatura detectados)")
     
     print("-" * 80)
@@ -243,46 +205,9 @@ def analisar_imagem_detalhada(img_path):
             else:
                 contorno_trans = max(valid_contours_trans, key=cv2.contourArea)
             
-            area_trans = cv2.contourArea(contorno_trans)
-            perimetro_trans = cv2.arcLength(contorno_trans, True)
-            
             # Calcular descritores
-            M_trans = cv2.moments(contorno_trans)
-            desc_trans = {}
-            
-            # Excentricidade
-            if M_trans['mu20'] + M_trans['mu02'] != 0:
-                desc_trans['Excentricidade'] = ((M_trans['mu20'] - M_trans['mu02'])**2 + 4*M_trans['mu11']**2)**0.5 / (M_trans['mu20'] + M_trans['mu02'])
-            else:
-                desc_trans['Excentricidade'] = 0
-            
-            # Circularidade
-            desc_trans['Circularidade'] = (4 * np.pi * area_trans) / (perimetro_trans ** 2) if perimetro_trans > 0 else 0
-            
-            # Compacidade
-            desc_trans['Compacidade'] = (perimetro_trans ** 2) / area_trans if area_trans > 0 else 0
-            
-            # Razão P/A
-            desc_trans['Razao_P_A'] = perimetro_trans / area_trans if area_trans > 0 else 0
-            
-            # Solidez
-            hull_trans = cv2.convexHull(contorno_trans)
-            hull_area_trans = cv2.contourArea(hull_trans)
-            desc_trans['Solidez'] = area_trans / hull_area_trans if hull_area_trans > 0 else 0
-            
-            # Alongamento
-            x_t, y_t, w_t, h_t = cv2.boundingRect(contorno_trans)
-            desc_trans['Alongamento'] = w_t / h_t if h_t > 0 else 0
-            
-            # Extent
-            rect_area_trans = w_t * h_t
-            desc_trans['Extent'] = area_trans / rect_area_trans if rect_area_trans > 0 else 0
-            
-            # Num Cantos (Harris)
-            image_float_trans = util.img_as_float(binary_trans)
-            harris_response_trans = feature.corner_harris(image_float_trans, k=0.04, sigma=1.5)
-            coords_trans = feature.corner_peaks(harris_response_trans, min_distance=5, threshold_rel=0.05)
-            desc_trans['Num_Cantos'] = len(coords_trans)
+            primitivas_trans = PrimitivasForma(contorno_trans, binary_trans)
+            desc_trans = extrair_descritores(primitivas_trans)
             
             # Calcular distância euclidiana
             vetor_trans = np.array(list(desc_trans.values()))
@@ -0,0 +1,108 @@
+# AnalyticTransforms.py
+import cv2
+import numpy as np
+
+from utils.DescriptorEngine import PrimitivasForma, extrair_descritores
+
+
+def matriz_rotacao(angulo, centro=(0, 0)):
+    """Matriz 2x3 da rotação (graus, anti-horário na tela), igual à do cv2.getRotationMatrix2D"""
+    return cv2.getRotationMatrix2D(tuple(map(float, centro)), angulo, 1.0)
+
+
+def matriz_escala(fator, centro=(0, 0)):
+    """Matriz 2x3 da escala uniforme em torno de centro"""
+    cx, cy = centro
+    return np.array([[fator, 0.0, (1 - fator) * cx],
+                     [0.0, fator, (1 - fator) * cy]])
+
+
+def matriz_espelhamento(horizontal=True, centro=(0, 0)):
+    """Matriz 2x3 do espelhamento (horizontal: x -> -x) em torno de centro"""
+    cx, cy = centro
+    if horizontal:
+        return np.array([[-1.0, 0.0, 2 * cx], [0.0, 1.0, 0.0]])
+    return np.array([[1.0, 0.0, 0.0], [0.0, -1.0, 2 * cy]])
+
+
+def grade_transformacoes(angulos=(0,), escalas=(1.0,), centro=(0, 0)):
+    """Todas as combinações rotação x escala: dict nome -> matriz 2x3"""
+    matrizes = {}
+    for escala in escalas:
+        for angulo in angulos:
+            A = matriz_escala(escala, centro)
+            R = matriz_rotacao(angulo, centro)
+            # escala depois da rotação: compõe as partes lineares e as translações
+            M = np.hstack([A[:, :2] @ R[:, :2], (A[:, :2] @ R[:, 2:] + A[:, 2:])])
+            matrizes[f"Rotacao_{angulo:g}_Escala_{escala:g}"] = M
+    return matrizes
+
+
+def transformar_primitivas(base, matrizes):
+    """
+    Primitivas da forma após cada transformação afim, sem rasterizar:
+    os pontos do contorno e do hull são transformados e as grandezas
+    integrais vêm de fórmulas fechadas (área e área do hull escalam com
+    |det A|, o tensor de segunda ordem dos momentos centrais vira
+    A C Aᵀ |det A|). Todas as matrizes são processadas de uma vez.
+
+    Os cantos seguem o modo da base e são sempre recalculados: no modo
+    "contorno" sobre o contorno transformado; no "harris" sobre o contorno
+    transformado rasterizado, só se Num_Cantos for pedido. Transformar os
+    cantos da base manteria a contagem constante: o Harris de sigma fixo
+    sobre pixels não é invariante à escala nem à rotação.
+
+    base: PrimitivasForma da forma original. matrizes: sequência de 2x3.
+    Retorna uma lista de PrimitivasForma (uma por matriz).
+    """
+    M = np.asarray(matrizes, dtype=np.float64).reshape(-1, 2, 3)
+    A, t = M[:, :, :2], M[:, :, 2]
+    det = np.abs(np.linalg.det(A))
+
+    # contorno e hull transformados: (T, N, 2)
+    pontos = np.einsum("tij,nj->tni", A, base.contorno.reshape(-1, 2).astype(np.float64)) + t[:, None, :]
+    hull = np.einsum("tij,nj->tni", A, base.hull.reshape(-1, 2).astype(np.float64)) + t[:, None, :]
+
+    # perímetro: soma dos lados do polígono fechado (como o cv2.arcLength)
+    lados = np.concatenate([pontos, pontos[:, :1]], axis=1)
+    perimetros = np.linalg.norm(np.diff(lados, axis=1), axis=2).sum(axis=1)
+
+    # bounding box a partir do hull; +1 como no cv2.boundingRect de pixels inteiros
+    minimos = np.rint(hull.min(axis=1)).astype(int)
+    larguras = np.rint(hull.max(axis=1) - hull.min(axis=1)).astype(int) + 1
+
+    # momentos: m00 escala com |det|, centróide transformado, C' = A C Aᵀ |det|
+    Mb = base.momentos
+    C = np.array([[Mb['mu20'], Mb['mu11']], [Mb['mu11'], Mb['mu02']]])
+    Cs = np.einsum("tij,jk,tlk->til", A, C, A) * det[:, None, None]
+    m00 = Mb['m00'] * det
+    centroide = np.array([Mb['m10'], Mb['m01']]) / Mb['m00'] if Mb['m00'] else np.zeros(2)
+    centroides = A @ centroide + t
+
+    transformadas = []
+    for i in range(len(M)):
+        conhecidas = {
+            "area": base.area * det[i],
+            "perimetro": float(perimetros[i]),
+            "bbox": (int(minimos[i, 0]), int(minimos[i, 1]), int(larguras[i, 0]), int(larguras[i, 1])),
+            "hull": hull[i].reshape(-1, 1, 2).astype(np.float32),
+            "hull_area": base.hull_area * det[i],
+            "momentos": {
+                "m00": m00[i],
+                "m10": m00[i] * centroides[i, 0],
+                "m01": m00[i] * centroides[i, 1],
+                "mu20": Cs[i, 0, 0],
+                "mu11": Cs[i, 0, 1],
+                "mu02": Cs[i, 1, 1],
+            },
+        }
+        transformadas.append(PrimitivasForma(pontos[i].reshape(-1, 1, 2), None, base.modo_cantos, **conhecidas))
+    return transformadas
+
+
+def descritores_analiticos(base, matrizes, nomes=None):
+    """Descritores da forma após cada transformação: array (transformações x descritores)"""
+    return np.array([
+        list(extrair_descritores(primitivas, nomes).values())
+        for primitivas in transformar_primitivas(base, matrizes)
+    ], dtype=np.float64)
@@ -1,18 +1,87 @@
+import logging
 import cv2
 import numpy as np
 from scipy.ndimage import binary_fill_holes
 
-def binarize_and_fill(img_gray, mean_val):
-    print("\n[2] BINARIZAÇÃO...")
+from utils.ContourProcessing import recortar_roi, componente_principal, BACKENDS, MARGEM_ROI
+from utils.Instrumentation import instrumentar
+from utils.Thresholding import binarizar, analisar_intensidade
 
-    if mean_val > 127:
-        print("  - Detectado: Fundo BRANCO, Objeto PRETO")
-        _, binary = cv2.threshold(img_gray, 127, 255, cv2.THRESH_BINARY_INV)
+logger = logging.getLogger(__name__)
+
+def binarize(img_gray, intensidade=None, modo="fixo"):
+    """intensidade: dict de analisar_intensidade (histograma e polaridade); modo: ver MODOS_LIMIAR"""
+    if intensidade is None:
+        intensidade = analisar_intensidade(img_gray)
+    if intensidade["fundo_claro"]:
+        logger.info("  - Detectado: Fundo BRANCO, Objeto PRETO")
     else:
-        print("  - Detectado: Fundo PRETO, Objeto BRANCO")
-        _, binary = cv2.threshold(img_gray, 127, 255, cv2.THRESH_BINARY)
+        logger.info("  - Detectado: Fundo PRETO, Objeto BRANCO")
+
+    binary, limiar = binarizar(img_gray, intensidade, modo)
+    logger.info("  - Limiar (%s): %s", modo, "local" if limiar is None else limiar)
+    return binary
+
+
+def fill_holes(binary, roi=None, margem=MARGEM_ROI):
+    # modo ROI: só a região em volta da bbox do objeto é preenchida
+    if roi is None:
+        return binary_fill_holes(binary > 0).astype(np.uint8) * 255
+
+    binary_filled = binary.copy()
+    recorte, (x0, y0) = recortar_roi(binary, roi, margem)
+    h, w = recorte.shape
+    binary_filled[y0:y0 + h, x0:x0 + w] = binary_fill_holes(recorte > 0).astype(np.uint8) * 255
+    return binary_filled
+
+
+def preencher_buracos_mascara(mascara):
+    """Preenche os buracos de uma máscara uint8 (0/255) por flood fill do fundo a partir da borda"""
+    h, w = mascara.shape
+    fundo = np.zeros((h + 2, w + 2), dtype=np.uint8)
+    fundo[1:-1, 1:-1] = mascara
+    cv2.floodFill(fundo, None, (0, 0), 255)
+    # o que o flood fill não alcançou (e não é objeto) é buraco
+    return mascara | (255 - fundo[1:-1, 1:-1])
 
-    binary_filled = binary_fill_holes(binary > 0).astype(np.uint8) * 255
-    print("✓ Imagem binarizada e buracos preenchidos")
 
+def fill_holes_componente(binary):
+    """
+    Backend "componentes": só o componente principal (componente_principal),
+    com os buracos preenchidos dentro da bbox dele; o resto da imagem fica zerado.
+    Retorna a máscara e a bbox do componente (None se não houver).
+    """
+    binary_filled = np.zeros_like(binary)
+    componente = componente_principal(binary)
+    if componente is None:
+        return binary_filled, None
+
+    x, y, w, h = componente["bbox"]
+    recorte = (componente["rotulos"][y:y + h, x:x + w] == componente["rotulo"]).astype(np.uint8) * 255
+    binary_filled[y:y + h, x:x + w] = preencher_buracos_mascara(recorte)
+    return binary_filled, componente["bbox"]
+
+
+@instrumentar("binarize_and_fill")
+def binarize_and_fill(img_gray, intensidade=None, backend="contornos", modo_limiar="fixo", com_bbox=False):
+    """
+    backend: "contornos" (preenche a imagem inteira) ou "componentes" (só o objeto principal).
+    modo_limiar: "fixo", "otsu" ou "adaptativo" (ver utils/Thresholding.py).
+    com_bbox: retorna também a bbox do componente principal (None no backend
+    "contornos"), para passar a find_main_contour(bbox_componente=...).
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"backend deve ser um de {BACKENDS}, recebido: {backend!r}")
+    logger.info("\n[2] BINARIZAÇÃO...")
+
+    binary = binarize(img_gray, intensidade, modo_limiar)
+    bbox = None
+    if backend == "componentes":
+        binary_filled, bbox = fill_holes_componente(binary)
+    else:
+        binary_filled = fill_holes(binary)
+    logger.info("✓ Imagem binarizada e buracos preenchidos")
+
+    if com_bbox:
+        return binary, binary_filled, bbox
     return binary, binary_filled
@@ -0,0 +1,256 @@
+# Checkpoints.py
+import json
+import sqlite3
+import time
+import numpy as np
+
+from utils.DescriptorCache import assinatura_parametros
+
+# Etapas da análise detalhada que podem ser retomadas, na ordem em que rodam:
+# "segmentacao" (binary, binary_filled e contorno_info), "cantos" (coords) e
+# "transformacoes" (distâncias aos vetores das imagens transformadas)
+ETAPAS = ("segmentacao", "cantos", "transformacoes")
+
+
+# ============================================
+# CODIFICAÇÃO COMPACTA
+# ============================================
+
+def _menor_inteiro(valores, tipos=(np.int16, np.int32, np.int64)):
+    # menor tipo inteiro que representa todos os valores
+    if len(valores) == 0:
+        return tipos[0]
+    minimo, maximo = int(valores.min()), int(valores.max())
+    for tipo in tipos:
+        info = np.iinfo(tipo)
+        if info.min <= minimo and maximo <= info.max:
+            return tipo
+    raise ValueError(f"valores fora do intervalo de {tipos[-1].__name__}")
+
+
+def codificar_contorno(contorno):
+    """
+    Pontos (n x 1 x 2, formato do findContours) em deltas entre pontos
+    consecutivos (o primeiro delta é o próprio ponto inicial). Os passos do
+    contorno são curtos, então cabem em int16 (int32 se não couberem).
+    """
+    pontos = contorno.reshape(-1, 2).astype(np.int64)
+    deltas = np.diff(pontos, axis=0, prepend=np.zeros((1, 2), dtype=np.int64))
+    return deltas.astype(_menor_inteiro(deltas))
+
+
+def decodificar_contorno(deltas):
+    return np.cumsum(deltas, axis=0, dtype=np.int32).reshape(-1, 1, 2)
+
+
+def codificar_mascara(mascara):
+    """
+    Máscara binária (0 e um único valor v) em comprimentos de sequências
+    (RLE) na ordem das linhas, alternando 0 e v, começando por 0 (a primeira
+    sequência tem comprimento 0 se a máscara começar com v).
+    Retorna (comprimentos, v).
+    """
+    plana = mascara.ravel()
+    valores = plana[np.flatnonzero(plana)[:1]]
+    valor = int(valores[0]) if len(valores) else 255
+    if np.count_nonzero((plana != 0) & (plana != valor)):
+        raise ValueError("a máscara deve ter só dois valores (0 e o do objeto)")
+
+    mudancas = np.flatnonzero(plana[1:] != plana[:-1]) + 1
+    limites = np.concatenate([[0], mudancas, [plana.size]])
+    comprimentos = np.diff(limites)
+    if plana.size and plana[0] != 0:
+        comprimentos = np.concatenate([[0], comprimentos])
+    return comprimentos.astype(_menor_inteiro(comprimentos, (np.uint16, np.uint32, np.uint64))), valor
+
+
+def decodificar_mascara(comprimentos, forma, valor=255):
+    valores = np.zeros(len(comprimentos), dtype=np.uint8)
+    valores[1::2] = valor
+    return np.repeat(valores, comprimentos.astype(np.intp)).reshape(forma)
+
+
+def indices_hull(contorno, hull):
+    """
+    Posição de cada ponto do hull no contorno (o hull é um subconjunto dos
+    pontos do contorno): o hull volta como contorno[indices], sem gravar os pontos.
+    """
+    pontos = contorno.reshape(-1, 2).astype(np.int64)
+    chaves = (pontos[:, 0] << 32) | (pontos[:, 1] & 0xFFFFFFFF)
+    ordem = np.argsort(chaves, kind="stable")
+    alvo = hull.reshape(-1, 2).astype(np.int64)
+    posicoes = np.searchsorted(chaves[ordem], (alvo[:, 0] << 32) | (alvo[:, 1] & 0xFFFFFFFF))
+    indices = ordem[np.minimum(posicoes, len(ordem) - 1)]
+    if not np.array_equal(pontos[indices], alvo):
+        raise ValueError("o hull tem pontos que não estão no contorno")
+    return indices.astype(_menor_inteiro(indices, (np.uint16, np.uint32, np.uint64)))
+
+
+def serializar(arrays=None, valores=None):
+    """
+    Arrays e valores simples (JSON) num único bloco de bytes: tamanho do
+    cabeçalho (uint32), cabeçalho JSON (dtype e forma de cada array, valores)
+    e os bytes dos arrays, em sequência.
+    """
+    arrays = {nome: np.ascontiguousarray(a) for nome, a in (arrays or {}).items()}
+    cabecalho = json.dumps({
+        "arrays": {nome: [a.dtype.str, list(a.shape)] for nome, a in arrays.items()},
+        "valores": valores or {},
+    }).encode("utf-8")
+    return b"".join([np.uint32(len(cabecalho)).tobytes(), cabecalho, *(a.tobytes() for a in arrays.values())])
+
+
+def desserializar(dados):
+    """Inverso de serializar; os arrays são views de dados (somente leitura)"""
+    tamanho = int(np.frombuffer(dados, dtype=np.uint32, count=1)[0])
+    cabecalho = json.loads(bytes(dados[4:4 + tamanho]).decode("utf-8"))
+    arrays, inicio = {}, 4 + tamanho
+    for nome, (tipo, forma) in cabecalho["arrays"].items():
+        tipo = np.dtype(tipo)
+        n = int(np.prod(forma))
+        arrays[nome] = np.frombuffer(dados, dtype=tipo, count=n, offset=inicio).reshape(forma)
+        inicio += n * tipo.itemsize
+    return arrays, cabecalho["valores"]
+
+
+# ============================================
+# ETAPAS
+# ============================================
+
+def codificar_segmentacao(binary, binary_filled, contorno_info):
+    """Resultado das etapas 2-4 (None = sem contorno) em bytes"""
+    if contorno_info is None:
+        return serializar(valores={"vazio": True})
+    contorno = contorno_info["contorno"]
+    arrays = {
+        "contorno": codificar_contorno(contorno),
+        "hull": indices_hull(contorno, contorno_info["hull"]),
+    }
+    arrays["binary"], valor_binary = codificar_mascara(binary)
+    # sem buracos (o caso comum nas silhuetas) as duas máscaras são iguais: grava uma só
+    preenchida_igual = np.array_equal(binary, binary_filled)
+    valor_filled = valor_binary
+    if not preenchida_igual:
+        arrays["binary_filled"], valor_filled = codificar_mascara(binary_filled)
+    return serializar(
+        arrays,
+        {
+            "forma": list(binary.shape),
+            "valor_binary": valor_binary,
+            "valor_filled": valor_filled,
+            "preenchida_igual": preenchida_igual,
+            # propriedades gravadas como calculadas (floats exatos no JSON)
+            **{chave: contorno_info[chave] for chave in ("img_area", "area", "perimetro", "hull_area")},
+            "bbox": list(contorno_info["bbox"]),
+        },
+    )
+
+
+def decodificar_segmentacao(dados):
+    """(binary, binary_filled, contorno_info) gravados por codificar_segmentacao; None se não havia contorno"""
+    arrays, valores = desserializar(dados)
+    if valores.get("vazio"):
+        return None
+    forma = tuple(valores["forma"])
+    contorno = decodificar_contorno(arrays["contorno"])
+    contorno_info = {
+        "contorno": contorno,
+        "img_area": valores["img_area"],
+        "area": valores["area"],
+        "perimetro": valores["perimetro"],
+        "bbox": tuple(valores["bbox"]),
+        "hull": contorno[arrays["hull"].astype(np.intp)],
+        "hull_area": valores["hull_area"],
+    }
+    binary = decodificar_mascara(arrays["binary"], forma, valores["valor_binary"])
+    if valores["preenchida_igual"]:
+        binary_filled = binary.copy()
+    else:
+        binary_filled = decodificar_mascara(arrays["binary_filled"], forma, valores["valor_filled"])
+    return binary, binary_filled, contorno_info
+
+
+def codificar_cantos(coords):
+    coords = np.asarray(coords).reshape(-1, 2)
+    return serializar({"coords": coords.astype(_menor_inteiro(coords))})
+
+
+def decodificar_cantos(dados):
+    arrays, _ = desserializar(dados)
+    return arrays["coords"].astype(np.intp)
+
+
+def codificar_distancias(distancias):
+    return serializar(valores={nome: float(dist) for nome, dist in distancias.items()})
+
+
+def decodificar_distancias(dados):
+    return desserializar(dados)[1]
+
+
+# ============================================
+# ARMAZENAMENTO
+# ============================================
+
+class CheckpointsEtapas:
+    """
+    Checkpoints persistentes (SQLite) dos resultados intermediários de cada
+    imagem, no formato compacto acima.
+
+    Chave: hash do conteúdo da imagem + etapa + assinatura dos parâmetros que
+    alteram aquela etapa. Diferente do CacheDescritores, mudar parâmetros não
+    apaga nada: mudar o modo de cantos, por exemplo, invalida só os cantos e
+    as etapas seguintes, e a segmentação continua aproveitada.
+    """
+
+    def __init__(self, caminho):
+        self.caminho = str(caminho)
+        self.acertos = 0
+        self.falhas = 0
+        self.gravadas = 0
+        self.bytes_gravados = 0
+
+        self._conn = sqlite3.connect(self.caminho)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS checkpoints (
+                hash TEXT NOT NULL,
+                etapa TEXT NOT NULL,
+                assinatura TEXT NOT NULL,
+                dados BLOB NOT NULL,
+                criado REAL NOT NULL,
+                PRIMARY KEY (hash, etapa, assinatura)
+            );
+        """)
+
+    def obter(self, hash_img, etapa, parametros):
+        """Bytes gravados para a etapa (None se não houver checkpoint)"""
+        linha = self._conn.execute(
+            "SELECT dados FROM checkpoints WHERE hash = ? AND etapa = ? AND assinatura = ?",
+            (hash_img, etapa, assinatura_parametros(parametros))
+        ).fetchone()
+        if linha is None:
+            self.falhas += 1
+            return None
+        self.acertos += 1
+        return linha[0]
+
+    def guardar(self, hash_img, etapa, parametros, dados):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?)",
+            (hash_img, etapa, assinatura_parametros(parametros), dados, time.time())
+        )
+        self.gravadas += 1
+        self.bytes_gravados += len(dados)
+
+    def salvar(self):
+        self._conn.commit()
+
+    def fechar(self):
+        self.salvar()
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
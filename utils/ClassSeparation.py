@@ -0,0 +1,386 @@
+# ClassSeparation.py
+import numpy as np
+from pathlib import Path
+
+
+def matriz_distancias(X, Y=None, bloco=2048, saida=None):
+    """
+    Distâncias euclidianas entre as linhas de X e de Y (Y=X por padrão),
+    calculadas em blocos de linhas. Com saida=caminho.npy o resultado é
+    escrito num arquivo mapeado em memória (para matrizes maiores que a RAM).
+    """
+    X = np.asarray(X, dtype=np.float64)
+    Y = X if Y is None else np.asarray(Y, dtype=np.float64)
+    normas_y = np.einsum("ij,ij->i", Y, Y)
+
+    if saida is None:
+        D = np.empty((len(X), len(Y)))
+    else:
+        D = np.lib.format.open_memmap(saida, mode="w+", dtype=np.float64, shape=(len(X), len(Y)))
+
+    for inicio in range(0, len(X), bloco):
+        fim = min(inicio + bloco, len(X))
+        D[inicio:fim] = _bloco_distancias(X[inicio:fim], Y, normas_y)
+
+    if saida is not None:
+        D.flush()
+    return D
+
+
+def _bloco_distancias(Xb, Y, normas_y):
+    # ||x - y||² = ||x||² + ||y||² - 2 x.y
+    d2 = np.einsum("ij,ij->i", Xb, Xb)[:, None] + normas_y - 2.0 * Xb @ Y.T
+    np.maximum(d2, 0, out=d2)
+    return np.sqrt(d2)
+
+
+def centroides_por_classe(X, codigos, n_classes=None):
+    """Centróide e número de amostras de cada classe (codigos inteiros 0..n_classes-1)"""
+    X = np.asarray(X, dtype=np.float64)
+    codigos = np.asarray(codigos)
+    if n_classes is None:
+        n_classes = int(codigos.max()) + 1
+    contagens = np.bincount(codigos, minlength=n_classes)
+    somas = np.zeros((n_classes, X.shape[1]))
+    np.add.at(somas, codigos, X)
+    return somas / np.maximum(contagens, 1)[:, None], contagens
+
+
+def razao_fisher(X, codigos, n_classes=None):
+    """Variância entre classes / variância dentro das classes, por descritor"""
+    X = np.asarray(X, dtype=np.float64)
+    centroides, contagens = centroides_por_classe(X, codigos, n_classes)
+    media = X.mean(axis=0)
+    entre = (contagens[:, None] * (centroides - media) ** 2).sum(axis=0)
+    dentro = ((X - centroides[codigos]) ** 2).sum(axis=0)
+    return np.divide(entre, dentro, out=np.full_like(entre, np.inf), where=dentro > 0)
+
+
+def _silhueta(a, b, proprio):
+    """
+    (b - a) / max(a, b), com os casos degenerados definidos como 0: amostra
+    sozinha na classe, nenhuma outra classe (b infinito) e max(a, b) = 0
+    (amostras duplicadas em classes diferentes).
+    """
+    maior = np.maximum(a, b)
+    definida = (proprio > 0) & np.isfinite(b) & (maior > 0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        s = (b - a) / maior
+    return np.where(definida, s, 0.0)
+
+
+def silhueta_e_margem(X, codigos, n_classes=None, bloco=2048):
+    """
+    Silhueta de cada amostra e margem até a classe mais próxima
+    (distância ao vizinho de outra classe - distância ao vizinho da mesma
+    classe; negativa = a amostra está mais perto de outra classe).
+    Calculadas em blocos, sem montar a matriz N x N inteira.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    codigos = np.asarray(codigos)
+    if n_classes is None:
+        n_classes = int(codigos.max()) + 1
+    n = len(X)
+    contagens = np.bincount(codigos, minlength=n_classes)
+    normas = np.einsum("ij,ij->i", X, X)
+
+    # matriz indicadora (amostra x classe): D @ indicadora = soma das distâncias por classe
+    indicadora = np.zeros((n, n_classes))
+    indicadora[np.arange(n), codigos] = 1.0
+
+    silhueta = np.empty(n)
+    margem = np.empty(n)
+    for inicio in range(0, n, bloco):
+        fim = min(inicio + bloco, n)
+        linhas = np.arange(fim - inicio)
+        cod_bloco = codigos[inicio:fim]
+        D = _bloco_distancias(X[inicio:fim], X, normas)
+
+        # silhueta: a = média na própria classe (sem a amostra), b = menor média entre as outras
+        medias = D @ indicadora
+        proprio = contagens[cod_bloco] - 1
+        a = np.divide(medias[linhas, cod_bloco], proprio,
+                      out=np.zeros(len(linhas)), where=proprio > 0)
+        medias /= np.maximum(contagens, 1)
+        medias[linhas, cod_bloco] = np.inf
+        medias[:, contagens == 0] = np.inf
+        b = medias.min(axis=1)
+        silhueta[inicio:fim] = _silhueta(a, b, proprio)
+
+        # margem: vizinho mais próximo de outra classe - da mesma classe
+        mesma = cod_bloco[:, None] == codigos[None, :]
+        D[linhas, linhas + inicio] = np.inf  # ignora a própria amostra
+        mais_prox_mesma = np.where(mesma, D, np.inf).min(axis=1)
+        mais_prox_outra = np.where(mesma, np.inf, D).min(axis=1)
+        margem[inicio:fim] = mais_prox_outra - mais_prox_mesma
+
+    return silhueta, margem
+
+
+def analisar_separacao(X, codigos, n_classes=None, bloco=2048):
+    """Métricas de separação entre classes, todas como arrays NumPy"""
+    X = np.asarray(X, dtype=np.float64)
+    centroides, contagens = centroides_por_classe(X, codigos, n_classes)
+    dist_centroides = matriz_distancias(centroides, bloco=bloco)
+
+    outras = dist_centroides.copy()
+    np.fill_diagonal(outras, np.inf)
+
+    silhueta, margem = silhueta_e_margem(X, codigos, len(centroides), bloco)
+    return {
+        "centroides": centroides,
+        "contagens": contagens,
+        "distancias_centroides": dist_centroides,
+        "centroide_mais_proximo": outras.argmin(axis=1),
+        "margem_centroides": outras.min(axis=1),
+        "razao_fisher": razao_fisher(X, codigos, len(centroides)),
+        "silhueta": silhueta,
+        "silhueta_por_classe": np.bincount(codigos, weights=silhueta, minlength=len(centroides))
+                               / np.maximum(contagens, 1),
+        "margem_amostras": margem,
+    }
+
+
+def pares_mais_proximos(dist_centroides, n=10):
+    """Os n pares de classes (i < j) com centróides mais próximos: (i, j, distância)"""
+    i, j = np.triu_indices(len(dist_centroides), k=1)
+    d = dist_centroides[i, j]
+    ordem = np.argsort(d)[:n]
+    return [(int(i[o]), int(j[o]), float(d[o])) for o in ordem]
+
+
+def salvar_separacao(resultados, caminho, nomes_classes=None, nomes_descritores=None):
+    """Grava as métricas num .npz (com os nomes das classes e dos descritores, se dados)"""
+    extras = {}
+    if nomes_classes is not None:
+        extras["classes"] = np.asarray(nomes_classes)
+    if nomes_descritores is not None:
+        extras["descritores"] = np.asarray(nomes_descritores)
+    np.savez(Path(caminho), **resultados, **extras)
+
+
+# ============================================
+# ATUALIZAÇÃO INCREMENTAL
+# ============================================
+
+class MomentosIncrementais:
+    """
+    Contagem, média e soma dos quadrados dos desvios (M2) de cada grupo, por
+    atributo, atualizados em lotes que entram ou saem (fórmula de combinação
+    de Chan et al.), sem rever as amostras antigas. NaN não entra na conta.
+    """
+
+    def __init__(self, n_atributos, n_grupos=1):
+        self.n = np.zeros((n_grupos, n_atributos))
+        self.media = np.zeros((n_grupos, n_atributos))
+        self.m2 = np.zeros((n_grupos, n_atributos))
+
+    def crescer(self, n_grupos):
+        falta = n_grupos - len(self.n)
+        if falta > 0:
+            zeros = np.zeros((falta, self.n.shape[1]))
+            self.n, self.media, self.m2 = (np.vstack([a, zeros]) for a in (self.n, self.media, self.m2))
+
+    def _lote(self, X, grupos):
+        X = np.asarray(X, dtype=np.float64).reshape(len(X), -1)
+        grupos = np.zeros(len(X), dtype=np.intp) if grupos is None else np.asarray(grupos, dtype=np.intp)
+        indicadora = np.zeros((len(X), len(self.n)))
+        indicadora[np.arange(len(X)), grupos] = 1.0
+        validos = ~np.isnan(X)
+        n = indicadora.T @ validos
+        media = np.divide(indicadora.T @ np.where(validos, X, 0.0), n, out=np.zeros_like(n), where=n > 0)
+        m2 = indicadora.T @ np.where(validos, (X - media[grupos]) ** 2, 0.0)
+        return n, media, m2
+
+    def adicionar(self, X, grupos=None):
+        n_b, media_b, m2_b = self._lote(X, grupos)
+        n = self.n + n_b
+        delta = media_b - self.media
+        fator = np.divide(n_b, n, out=np.zeros_like(n), where=n > 0)
+        self.m2 = self.m2 + m2_b + delta ** 2 * self.n * fator
+        self.media = self.media + delta * fator
+        self.n = n
+
+    def remover(self, X, grupos=None):
+        n_b, media_b, m2_b = self._lote(X, grupos)
+        n_a = self.n - n_b
+        media_a = np.divide(self.n * self.media - n_b * media_b, n_a, out=np.zeros_like(n_a), where=n_a > 0)
+        delta = media_b - media_a
+        fator = np.divide(n_a * n_b, self.n, out=np.zeros_like(n_a), where=self.n > 0)
+        self.m2 = np.where(n_a > 0, np.maximum(self.m2 - m2_b - delta ** 2 * fator, 0.0), 0.0)
+        self.media = media_a
+        self.n = n_a
+
+
+class SeparacaoIncremental:
+    """
+    Estado das métricas de analisar_separacao atualizado quando amostras entram
+    ou saem, sem recalcular do zero:
+      - centróides e variância dentro das classes (Fisher): MomentosIncrementais
+        por classe;
+      - silhueta: soma das distâncias de cada amostra a cada classe (amostras x
+        classes), corrigida só com as distâncias às amostras que entraram/saíram;
+      - margem: vizinho mais próximo da mesma classe e de outra classe, revisto só
+        para as amostras novas e as que perderam o vizinho.
+    Cada alteração custa O(amostras alteradas x n) em vez de O(n²).
+    As linhas seguem a ordem de entrada (removidas saem, novas vão para o fim).
+    """
+
+    def __init__(self, n_descritores, bloco=2048):
+        self.bloco = bloco
+        self.X = np.empty((0, n_descritores))
+        self.grupos = np.empty(0, dtype=np.intp)
+        self.classes = []
+        self._indice_classe = {}
+        self.momentos = MomentosIncrementais(n_descritores, 0)
+        self.somas_distancias = np.empty((0, 0))
+        self.vizinho_mesma = np.empty(0, dtype=np.intp)
+        self.dist_mesma = np.empty(0)
+        self.vizinho_outra = np.empty(0, dtype=np.intp)
+        self.dist_outra = np.empty(0)
+
+    def __len__(self):
+        return len(self.X)
+
+    def _codigo(self, classe):
+        if classe not in self._indice_classe:
+            self._indice_classe[classe] = len(self.classes)
+            self.classes.append(classe)
+            self.momentos.crescer(len(self.classes))
+            self.somas_distancias = np.hstack([self.somas_distancias, np.zeros((len(self.X), 1))])
+        return self._indice_classe[classe]
+
+    def _indicadora(self, grupos):
+        indicadora = np.zeros((len(grupos), len(self.classes)))
+        indicadora[np.arange(len(grupos)), grupos] = 1.0
+        return indicadora
+
+    def _distancias(self, linhas):
+        """Blocos (linhas, D[linhas x todas as amostras])"""
+        normas = np.einsum("ij,ij->i", self.X, self.X)
+        for inicio in range(0, len(linhas), self.bloco):
+            bloco = linhas[inicio:inicio + self.bloco]
+            yield bloco, _bloco_distancias(self.X[bloco], self.X, normas)
+
+    def _vizinhos(self, bloco, D):
+        # vizinhos mais próximos das linhas do bloco (D: bloco x todas), -1 se não houver
+        D = D.copy()
+        D[np.arange(len(bloco)), bloco] = np.inf  # ignora a própria amostra
+        mesma = self.grupos[bloco][:, None] == self.grupos[None, :]
+        for dist, vizinho, candidatos in ((self.dist_mesma, self.vizinho_mesma, np.where(mesma, D, np.inf)),
+                                          (self.dist_outra, self.vizinho_outra, np.where(mesma, np.inf, D))):
+            melhor = candidatos.argmin(axis=1)
+            dist[bloco] = candidatos[np.arange(len(bloco)), melhor]
+            vizinho[bloco] = np.where(np.isfinite(dist[bloco]), melhor, -1)
+
+    def _rever_vizinhos(self, linhas):
+        for bloco, D in self._distancias(linhas):
+            self._vizinhos(bloco, D)
+
+    def adicionar(self, X, classes):
+        X = np.asarray(X, dtype=np.float64).reshape(-1, self.X.shape[1])
+        if len(X) == 0:
+            return
+        grupos = np.array([self._codigo(classe) for classe in classes], dtype=np.intp)
+        self.momentos.adicionar(X, grupos)
+
+        n0 = len(self.X)
+        self.X = np.vstack([self.X, X])
+        self.grupos = np.concatenate([self.grupos, grupos])
+        self.somas_distancias = np.vstack([self.somas_distancias, np.zeros((len(X), len(self.classes)))])
+        self.vizinho_mesma = np.concatenate([self.vizinho_mesma, np.full(len(X), -1)])
+        self.vizinho_outra = np.concatenate([self.vizinho_outra, np.full(len(X), -1)])
+        self.dist_mesma = np.concatenate([self.dist_mesma, np.full(len(X), np.inf)])
+        self.dist_outra = np.concatenate([self.dist_outra, np.full(len(X), np.inf)])
+
+        indicadora = self._indicadora(self.grupos)
+        novas = np.arange(n0, len(self.X))
+        for bloco, D in self._distancias(novas):
+            # somas das novas a todas as classes; das antigas, só a parcela das novas
+            self.somas_distancias[bloco] = D @ indicadora
+            self.somas_distancias[:n0] += D[:, :n0].T @ indicadora[bloco]
+
+            # as antigas só podem ter ganhado um vizinho mais próximo entre as novas
+            D_antigas = D[:, :n0].T
+            mesma = self.grupos[:n0, None] == self.grupos[bloco][None, :]
+            for dist, vizinho, mascara in ((self.dist_mesma, self.vizinho_mesma, mesma),
+                                           (self.dist_outra, self.vizinho_outra, ~mesma)):
+                candidatos = np.where(mascara, D_antigas, np.inf)
+                if candidatos.shape[1] == 0:
+                    continue
+                melhor = candidatos.argmin(axis=1)
+                valor = candidatos[np.arange(n0), melhor]
+                trocar = valor < dist[:n0]
+                dist[:n0][trocar] = valor[trocar]
+                vizinho[:n0][trocar] = bloco[melhor[trocar]]
+            self._vizinhos(bloco, D)
+
+    def remover(self, linhas):
+        linhas = np.asarray(linhas, dtype=np.intp)
+        if len(linhas) == 0:
+            return
+        self.momentos.remover(self.X[linhas], self.grupos[linhas])
+        for bloco, D in self._distancias(linhas):
+            self.somas_distancias -= D.T @ self._indicadora(self.grupos[bloco])
+
+        manter = np.ones(len(self.X), dtype=bool)
+        manter[linhas] = False
+        novo_indice = np.cumsum(manter) - 1
+        perderam = np.isin(self.vizinho_mesma, linhas) | np.isin(self.vizinho_outra, linhas)
+
+        self.X = self.X[manter]
+        self.grupos = self.grupos[manter]
+        self.somas_distancias = self.somas_distancias[manter]
+        self.dist_mesma, self.dist_outra = self.dist_mesma[manter], self.dist_outra[manter]
+        self.vizinho_mesma = np.where(self.vizinho_mesma >= 0, novo_indice[self.vizinho_mesma], -1)[manter]
+        self.vizinho_outra = np.where(self.vizinho_outra >= 0, novo_indice[self.vizinho_outra], -1)[manter]
+        self._rever_vizinhos(np.flatnonzero(perderam[manter]))
+
+    def resultados(self, classes=None):
+        """
+        O mesmo dicionário de analisar_separacao. classes: ordem das classes na
+        saída (ex.: TabelaDescritores.classes); padrão: ordem de entrada, sem as
+        classes que ficaram vazias.
+        """
+        if classes is None:
+            classes = [c for i, c in enumerate(self.classes) if self.momentos.n[i, 0] > 0]
+        ordem = np.array([self._indice_classe[c] for c in classes], dtype=np.intp)
+        codigo_saida = np.full(len(self.classes), -1)
+        codigo_saida[ordem] = np.arange(len(ordem))
+        codigos = codigo_saida[self.grupos]
+
+        centroides = self.momentos.media[ordem]
+        contagens = self.momentos.n[ordem, 0].astype(np.int64)
+        dist_centroides = matriz_distancias(centroides, bloco=self.bloco)
+        outras = dist_centroides.copy()
+        np.fill_diagonal(outras, np.inf)
+
+        # Fisher: variância entre classes / dentro das classes, dos momentos por classe
+        media = (contagens[:, None] * centroides).sum(axis=0) / max(contagens.sum(), 1)
+        entre = (contagens[:, None] * (centroides - media) ** 2).sum(axis=0)
+        dentro = self.momentos.m2[ordem].sum(axis=0)
+        fisher = np.divide(entre, dentro, out=np.full_like(entre, np.inf), where=dentro > 0)
+
+        # silhueta, das somas de distâncias por classe (mesma regra de silhueta_e_margem)
+        linhas = np.arange(len(self.X))
+        somas = self.somas_distancias[:, ordem]
+        proprio = contagens[codigos] - 1
+        a = np.divide(somas[linhas, codigos], proprio, out=np.zeros(len(linhas)), where=proprio > 0)
+        medias = somas / np.maximum(contagens, 1)
+        medias[linhas, codigos] = np.inf
+        medias[:, contagens == 0] = np.inf
+        b = medias.min(axis=1) if len(ordem) else np.full(len(linhas), np.inf)
+        silhueta = _silhueta(a, b, proprio)
+
+        return {
+            "centroides": centroides,
+            "contagens": contagens,
+            "distancias_centroides": dist_centroides,
+            "centroide_mais_proximo": outras.argmin(axis=1),
+            "margem_centroides": outras.min(axis=1),
+            "razao_fisher": fisher,
+            "silhueta": silhueta,
+            "silhueta_por_classe": np.bincount(codigos, weights=silhueta, minlength=len(ordem))
+                                   / np.maximum(contagens, 1),
+            "margem_amostras": self.dist_outra - self.dist_mesma,
+        }
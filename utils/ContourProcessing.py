@@ -1,49 +1,166 @@
 # ContourProcessing.py
+import logging
 import cv2
+import numpy as np
 
-def find_main_contour(binary_filled, img_gray):
-    print("\n[3] DETECÇÃO DE CONTORNOS...")
-    contours, hierarchy = cv2.findContours(binary_filled, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-    print(f"✓ Contornos encontrados: {len(contours)}")
+from utils.Instrumentation import instrumentar
+
+logger = logging.getLogger(__name__)
+
+# margem (pixels) em volta da bounding box no modo ROI; cobre o suporte do
+# Gaussiano do Harris (sigma 1.5) e a borda excluída pelo corner_peaks
+MARGEM_ROI = 10
+
+# modo multiobjeto: contornos com área menor que isso (pixels²) são ruído
+AREA_MIN_OBJETO = 10
+
+# "contornos": findContours na imagem inteira + filtro de área por contorno;
+# "componentes": rotulagem de componentes conexos (área, bbox e centróide de
+# todos os objetos numa passada) e findContours só no componente escolhido
+BACKENDS = ("contornos", "componentes")
 
+def recortar_roi(img, bbox, margem=MARGEM_ROI):
+    """Recorte (view, sem cópia) em volta de bbox; retorna o recorte e o deslocamento (x0, y0)"""
+    x, y, w, h = bbox
+    x0, y0 = max(x - margem, 0), max(y - margem, 0)
+    x1 = min(x + w + margem, img.shape[1])
+    y1 = min(y + h + margem, img.shape[0])
+    return img[y0:y1, x0:x1], (x0, y0)
+
+def estatisticas_contornos(contours):
+    """
+    Área, perímetro e bounding box de todos os contornos de uma vez, por
+    reduções sobre os pontos concatenados (sem laço por contorno). A área é
+    a do polígono (a mesma de cv2.contourArea), o perímetro o do contorno
+    fechado (cv2.arcLength, a menos de arredondamento) e a bbox a de
+    cv2.boundingRect.
+    Retorna dict de arrays: "area", "perimetro" (n,) e "bbox" (n x 4: x, y, w, h).
+    """
+    tamanhos = np.fromiter((len(c) for c in contours), dtype=np.intp, count=len(contours))
+    pontos = np.concatenate(contours).reshape(-1, 2).astype(np.int64)
+    fins = np.cumsum(tamanhos)
+    inicios = fins - tamanhos
+
+    # ponto seguinte de cada ponto, voltando ao primeiro no fim de cada contorno
+    seguinte = np.empty_like(pontos)
+    seguinte[:-1] = pontos[1:]
+    seguinte[fins - 1] = pontos[inicios]
+    lado = seguinte - pontos
+
+    produto = pontos[:, 0] * lado[:, 1] - pontos[:, 1] * lado[:, 0]
+    minimo = np.minimum.reduceat(pontos, inicios)
+    maximo = np.maximum.reduceat(pontos, inicios)
+    return {
+        "area": np.abs(np.add.reduceat(produto, inicios)) / 2,
+        "perimetro": np.add.reduceat(np.sqrt((lado * lado).sum(axis=1)), inicios),
+        "bbox": np.column_stack([minimo, maximo - minimo + 1]),
+    }
+
+def componente_principal(binary, area_min_rel=0.01, area_max_rel=0.95):
+    """
+    Rotula os componentes conexos (8-vizinhança) e escolhe o maior com área
+    entre area_min_rel e area_max_rel da imagem (o maior de todos se nenhum
+    passar), a mesma regra de find_main_contour, mas com a área em pixels.
+    Retorna dict com "rotulo", "area_pixels", "bbox", "centroide" e a imagem
+    de "rotulos" (None se não houver objeto).
+    """
+    n, rotulos, stats, centroides = cv2.connectedComponentsWithStats(binary, connectivity=8)
+    if n <= 1:
+        return None
+
+    img_area = binary.shape[0] * binary.shape[1]
+    areas = stats[1:, cv2.CC_STAT_AREA]
+    validos = np.flatnonzero((areas > area_min_rel * img_area) & (areas < area_max_rel * img_area))
+    if len(validos) == 0:
+        validos = np.arange(len(areas))
+    k = int(validos[np.argmax(areas[validos])]) + 1  # rótulo 0 = fundo
+    return {
+        "rotulo": k,
+        "area_pixels": int(stats[k, cv2.CC_STAT_AREA]),
+        "bbox": tuple(int(v) for v in stats[k, :4]),
+        "centroide": tuple(float(v) for v in centroides[k]),
+        "rotulos": rotulos,
+    }
+
+def _contorno_componente(binary_filled, bbox=None):
+    # findContours só no recorte do componente principal; bbox: a do componente
+    # já isolado por fill_holes_componente (evita rotular a imagem de novo)
+    if bbox is not None:
+        x, y, w, h = bbox
+        mascara = binary_filled[y:y + h, x:x + w]
+    else:
+        componente = componente_principal(binary_filled)
+        if componente is None:
+            return None
+        x, y, w, h = componente["bbox"]
+        mascara = (componente["rotulos"][y:y + h, x:x + w] == componente["rotulo"]).astype(np.uint8)
+    contours, _ = cv2.findContours(mascara, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE, offset=(x, y))
     if len(contours) == 0:
-        print(" Nenhum contorno encontrado!")
         return None
+    logger.info("✓ Componente principal: bbox (%d, %d, %d, %d)", x, y, w, h)
+    return max(contours, key=cv2.contourArea)
 
+@instrumentar("find_main_contour", medidas=lambda r: {"pontos_contorno": len(r["contorno"])})
+def find_main_contour(binary_filled, img_gray, backend="contornos", bbox_componente=None):
+    """
+    backend: "contornos" (padrão) ou "componentes" (ver BACKENDS).
+    bbox_componente: bbox do componente principal devolvida por
+    binarize_and_fill(com_bbox=True) no backend "componentes".
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"backend deve ser um de {BACKENDS}, recebido: {backend!r}")
+    logger.info("\n[3] DETECÇÃO DE CONTORNOS...")
     img_area = img_gray.shape[0] * img_gray.shape[1]
-    print(f"  - Área total da imagem: {img_area} pixels²")
 
-    # log de áreas
-    for i, cnt in enumerate(contours):
-        area_cnt = cv2.contourArea(cnt)
-        percent = (area_cnt / img_area) * 100
-        print(f"  - Contorno {i}: {area_cnt:.0f} pixels² ({percent:.1f}% da imagem)")
+    if backend == "componentes":
+        contorno = _contorno_componente(binary_filled, bbox_componente)
+        if contorno is None:
+            logger.warning("Nenhum contorno encontrado!")
+            return None
+        return _propriedades_contorno(contorno, img_area)
+
+    contours, hierarchy = cv2.findContours(binary_filled, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    logger.info("✓ Contornos encontrados: %d", len(contours))
+
+    if len(contours) == 0:
+        logger.warning("Nenhum contorno encontrado!")
+        return None
+
+    logger.info("  - Área total da imagem: %d pixels²", img_area)
+
+    # área calculada uma única vez por contorno (o filtro e o máximo reaproveitam)
+    areas = np.array([cv2.contourArea(cnt) for cnt in contours])
+
+    # log de áreas (só no modo detalhado: imagens ruidosas têm milhares de contornos)
+    if logger.isEnabledFor(logging.DEBUG):
+        for i, area_cnt in enumerate(areas):
+            percent = (area_cnt / img_area) * 100
+            logger.debug("  - Contorno %d: %.0f pixels² (%.1f%% da imagem)", i, area_cnt, percent)
 
     # filtrar contornos válidos
-    valid_contours = []
-    for cnt in contours:
-        area_cnt = cv2.contourArea(cnt)
-        if 0.01 * img_area < area_cnt < 0.95 * img_area:
-            valid_contours.append(cnt)
-
-    if len(valid_contours) == 0:
-        contorno = max(contours, key=cv2.contourArea)
-        print("  ⚠ Usando o maior contorno (sem filtro)")
+    validos = np.flatnonzero((areas > 0.01 * img_area) & (areas < 0.95 * img_area))
+
+    if len(validos) == 0:
+        contorno = contours[int(np.argmax(areas))]
+        logger.warning("  ⚠ Usando o maior contorno (sem filtro)")
     else:
-        contorno = max(valid_contours, key=cv2.contourArea)
-        print("  ✓ Usando o maior contorno válido")
+        contorno = contours[validos[np.argmax(areas[validos])]]
+        logger.info("  ✓ Usando o maior contorno válido")
+
+    return _propriedades_contorno(contorno, img_area)
 
+def _propriedades_contorno(contorno, img_area):
     area = cv2.contourArea(contorno)
     perimetro = cv2.arcLength(contorno, True)
     x, y, w, h = cv2.boundingRect(contorno)
     hull = cv2.convexHull(contorno)
     hull_area = cv2.contourArea(hull)
 
-    print("\n[4] PROPRIEDADES BÁSICAS...")
-    print(f"  - Área: {area:.2f} pixels²")
-    print(f"  - Perímetro: {perimetro:.2f} pixels")
-    print(f"  - Bounding Box: ({x}, {y}) - Largura: {w}, Altura: {h}")
-    print(f"  - Área do Convex Hull: {hull_area:.2f} pixels²")
+    logger.info("\n[4] PROPRIEDADES BÁSICAS...")
+    logger.info("  - Área: %.2f pixels²", area)
+    logger.info("  - Perímetro: %.2f pixels", perimetro)
+    logger.info("  - Bounding Box: (%d, %d) - Largura: %d, Altura: %d", x, y, w, h)
+    logger.info("  - Área do Convex Hull: %.2f pixels²", hull_area)
 
     return {
         "contorno": contorno,
@@ -54,3 +171,38 @@ def find_main_contour(binary_filled, img_gray):
         "hull": hull,
         "hull_area": hull_area
     }
+
+@instrumentar("find_all_contours", medidas=lambda r: {"objetos": len(r)})
+def find_all_contours(binary_filled, img_gray, area_min=AREA_MIN_OBJETO, fracao_max=0.95):
+    """
+    Modo multiobjeto: todos os contornos externos com area_min < área <
+    fracao_max * área da imagem, do maior para o menor, cada um no formato
+    de find_main_contour. Área, perímetro e bbox vêm de estatisticas_contornos
+    (uma vez por contorno, vetorizado); só o hull é calculado objeto a objeto.
+    """
+    logger.info("\n[3] DETECÇÃO DE CONTORNOS (MULTIOBJETO)...")
+    contours, hierarchy = cv2.findContours(binary_filled, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    if len(contours) == 0:
+        logger.warning("Nenhum contorno encontrado!")
+        return []
+
+    img_area = img_gray.shape[0] * img_gray.shape[1]
+    estatisticas = estatisticas_contornos(contours)
+    areas = estatisticas["area"]
+    validos = np.flatnonzero((areas > area_min) & (areas < fracao_max * img_area))
+    validos = validos[np.argsort(-areas[validos], kind="stable")]
+    logger.info("✓ Objetos válidos: %d de %d contornos", len(validos), len(contours))
+
+    objetos = []
+    for i in validos:
+        hull = cv2.convexHull(contours[i])
+        objetos.append({
+            "contorno": contours[i],
+            "img_area": img_area,
+            "area": float(areas[i]),
+            "perimetro": float(estatisticas["perimetro"][i]),
+            "bbox": tuple(int(v) for v in estatisticas["bbox"][i]),
+            "hull": hull,
+            "hull_area": cv2.contourArea(hull)
+        })
+    return objetos
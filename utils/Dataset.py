@@ -0,0 +1,31 @@
+# Dataset.py
+from pathlib import Path
+
+EXTENSOES = ("*.png", "*.jpg", "*.bmp")
+
+def descobrir_imagens(dataset_path):
+    """
+    Gerador das imagens do dataset, na mesma ordem das buscas por extensão.
+    dataset_path pode ser um dataset empacotado (.kpak, ver utils/PackedDataset.py):
+    nesse caso gera referências às máscaras, aceitas no lugar dos caminhos.
+    """
+    from utils.PackedDataset import eh_pacote, DatasetEmpacotado
+    if eh_pacote(dataset_path):
+        yield from DatasetEmpacotado(dataset_path).referencias()
+        return
+    for padrao in EXTENSOES:
+        yield from Path(dataset_path).rglob(padrao)
+
+
+def listar_imagens(dataset_path):
+    return list(descobrir_imagens(dataset_path))
+
+
+def extrair_classe(img_path):
+    """Classe a partir do nome do arquivo (trainimage1_1.png -> Classe_1) ou da pasta"""
+    img_path = Path(img_path)
+    nome_arquivo = img_path.stem  # Nome sem extensão
+    if '_' in nome_arquivo:
+        classe_num = nome_arquivo.split('_')[0].replace('trainimage', '')
+        return f"Classe_{classe_num}"
+    return img_path.parent.name
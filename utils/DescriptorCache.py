@@ -0,0 +1,117 @@
+# DescriptorCache.py
+import hashlib
+import json
+import sqlite3
+import time
+import numpy as np
+
+
+def hash_conteudo(dados):
+    """SHA-1 dos bytes da imagem (bytes, caminho ou ReferenciaPacote)"""
+    if hasattr(dados, "conteudo"):
+        dados = dados.conteudo()
+    if not isinstance(dados, (bytes, bytearray, memoryview)):
+        with open(dados, "rb") as f:
+            dados = f.read()
+    return hashlib.sha1(dados).hexdigest()
+
+
+def assinatura_parametros(parametros):
+    """Hash estável de um dicionário de parâmetros do pipeline"""
+    texto = json.dumps(parametros, sort_keys=True, default=str)
+    return hashlib.sha1(texto.encode("utf-8")).hexdigest()
+
+
+class CacheDescritores:
+    """
+    Cache persistente (SQLite) de vetores de descritores.
+
+    Chave: hash do conteúdo da imagem + variante ("base", nome da
+    transformação, ...). Entradas gravadas com outros parâmetros do pipeline
+    são descartadas ao abrir o cache. Quando passa de max_entradas, as
+    entradas acessadas há mais tempo são removidas.
+
+    Um vetor vazio representa "sem resultado" (ex.: nenhum contorno), o que
+    é diferente de ausência no cache (obter retorna None).
+    """
+
+    def __init__(self, caminho, parametros, max_entradas=200_000):
+        self.caminho = str(caminho)
+        self.assinatura = assinatura_parametros(parametros)
+        self.max_entradas = max_entradas
+        self.acertos = 0
+        self.falhas = 0
+
+        self._conn = sqlite3.connect(self.caminho)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS meta (chave TEXT PRIMARY KEY, valor TEXT);
+            CREATE TABLE IF NOT EXISTS descritores (
+                hash TEXT NOT NULL,
+                variante TEXT NOT NULL,
+                vetor BLOB NOT NULL,
+                acesso REAL NOT NULL,
+                PRIMARY KEY (hash, variante)
+            );
+            CREATE INDEX IF NOT EXISTS idx_acesso ON descritores (acesso);
+        """)
+        self._invalidar_se_mudou(parametros)
+
+    def _invalidar_se_mudou(self, parametros):
+        linha = self._conn.execute("SELECT valor FROM meta WHERE chave = 'assinatura'").fetchone()
+        if linha is not None and linha[0] == self.assinatura:
+            return
+        self._conn.execute("DELETE FROM descritores")
+        self._conn.execute(
+            "INSERT OR REPLACE INTO meta VALUES ('assinatura', ?)", (self.assinatura,)
+        )
+        self._conn.execute(
+            "INSERT OR REPLACE INTO meta VALUES ('parametros', ?)",
+            (json.dumps(parametros, sort_keys=True, default=str),)
+        )
+        self._conn.commit()
+
+    def obter(self, hash_img, variante):
+        linha = self._conn.execute(
+            "SELECT vetor FROM descritores WHERE hash = ? AND variante = ?",
+            (hash_img, variante)
+        ).fetchone()
+        if linha is None:
+            self.falhas += 1
+            return None
+        self.acertos += 1
+        self._conn.execute(
+            "UPDATE descritores SET acesso = ? WHERE hash = ? AND variante = ?",
+            (time.time(), hash_img, variante)
+        )
+        return np.frombuffer(linha[0], dtype=np.float64)
+
+    def guardar(self, hash_img, variante, vetor):
+        vetor = np.asarray([] if vetor is None else vetor, dtype=np.float64)
+        self._conn.execute(
+            "INSERT OR REPLACE INTO descritores VALUES (?, ?, ?, ?)",
+            (hash_img, variante, vetor.tobytes(), time.time())
+        )
+
+    def _remover_antigas(self):
+        total = self._conn.execute("SELECT COUNT(*) FROM descritores").fetchone()[0]
+        excesso = total - self.max_entradas
+        if excesso > 0:
+            self._conn.execute(
+                "DELETE FROM descritores WHERE rowid IN "
+                "(SELECT rowid FROM descritores ORDER BY acesso LIMIT ?)",
+                (excesso,)
+            )
+
+    def salvar(self):
+        self._remover_antigas()
+        self._conn.commit()
+
+    def fechar(self):
+        self.salvar()
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
@@ -0,0 +1,296 @@
+# DescriptorEngine.py
+import cv2
+import numpy as np
+from scipy.ndimage import maximum_filter1d
+from skimage import util, feature
+
+from utils.ContourProcessing import recortar_roi, MARGEM_ROI
+
+# parâmetros do Harris usados por todos os pontos de entrada
+HARRIS_K = 0.04
+HARRIS_SIGMA = 1.5
+HARRIS_MIN_DISTANCE = 5
+HARRIS_THRESHOLD_REL = 0.05
+
+# parâmetros da contagem de cantos sobre o contorno (ajustados para
+# concordar com o Harris no Kimia99, ver comparar_cantos.py)
+CANTOS_PASSO_K = 3        # vizinhos usados no k-cosseno (pixels ao longo do contorno)
+CANTOS_ANGULO_MIN = 25.0  # mudança de direção mínima para ser canto (graus)
+CANTOS_JANELA = 8         # distância mínima entre cantos (pixels ao longo do contorno)
+
+MODOS_CANTOS = ("harris", "contorno")
+
+
+class PrimitivasForma:
+    """
+    Primitivas geométricas de um contorno (momentos, área, perímetro, hull,
+    bounding box, cantos), calculadas sob demanda e uma única vez.
+    Valores já conhecidos podem ser passados como argumentos nomeados.
+
+    modo_cantos: "harris" (imagem inteira) ou "contorno" (curvatura sobre os
+    pontos do contorno, não precisa da máscara).
+    roi_margem: se definido, o Harris roda só num recorte em volta da
+    bounding box (com essa margem) e as coordenadas voltam para a imagem inteira.
+    Sem binary_filled (primitivas de AnalyticTransforms), o Harris roda sobre
+    o contorno rasterizado (mascara_objeto).
+    """
+
+    def __init__(self, contorno, binary_filled=None, modo_cantos="harris", roi_margem=None, **conhecidas):
+        if modo_cantos not in MODOS_CANTOS:
+            raise ValueError(f"modo_cantos deve ser um de {MODOS_CANTOS}, recebido: {modo_cantos!r}")
+        self.contorno = contorno
+        self.binary_filled = binary_filled
+        self.modo_cantos = modo_cantos
+        self.roi_margem = roi_margem
+        self._cache = dict(conhecidas)
+
+    @classmethod
+    def de_contorno_info(cls, contorno_info, binary_filled=None, modo_cantos="harris", roi_margem=None,
+                         **conhecidas):
+        """Reaproveita as propriedades já calculadas por find_main_contour"""
+        return cls(
+            contorno_info["contorno"],
+            binary_filled,
+            modo_cantos,
+            roi_margem,
+            area=contorno_info["area"],
+            perimetro=contorno_info["perimetro"],
+            bbox=contorno_info["bbox"],
+            hull=contorno_info["hull"],
+            hull_area=contorno_info["hull_area"],
+            **conhecidas
+        )
+
+    def _obter(self, nome, calcular):
+        if nome not in self._cache:
+            self._cache[nome] = calcular()
+        return self._cache[nome]
+
+    @property
+    def momentos(self):
+        return self._obter("momentos", lambda: cv2.moments(self.contorno))
+
+    @property
+    def area(self):
+        return self._obter("area", lambda: cv2.contourArea(self.contorno))
+
+    @property
+    def perimetro(self):
+        return self._obter("perimetro", lambda: cv2.arcLength(self.contorno, True))
+
+    @property
+    def bbox(self):
+        return self._obter("bbox", lambda: cv2.boundingRect(self.contorno))
+
+    @property
+    def hull(self):
+        return self._obter("hull", lambda: cv2.convexHull(self.contorno))
+
+    @property
+    def hull_area(self):
+        return self._obter("hull_area", lambda: cv2.contourArea(self.hull))
+
+    @property
+    def coords_cantos(self):
+        if self.modo_cantos == "contorno":
+            return self._obter("coords_cantos", lambda: cantos_contorno(self.contorno))
+        return self._obter("coords_cantos", self._cantos_harris)
+
+    def _cantos_harris(self):
+        recortada = self.roi_margem is not None or self.binary_filled is None
+        if self.binary_filled is None:
+            contorno = np.rint(self.contorno).astype(np.int32)
+            mascara, deslocamento = mascara_objeto(contorno, cv2.boundingRect(contorno))
+        elif self.roi_margem is not None:
+            mascara, deslocamento = recortar_roi(self.binary_filled, self.bbox, self.roi_margem)
+        else:
+            mascara = self.binary_filled
+
+        image_float = util.img_as_float(mascara)
+        harris_response = feature.corner_harris(image_float, k=HARRIS_K, sigma=HARRIS_SIGMA)
+        coords = feature.corner_peaks(
+            harris_response,
+            min_distance=HARRIS_MIN_DISTANCE,
+            threshold_rel=HARRIS_THRESHOLD_REL
+        )
+        if recortada:
+            # (linha, coluna) do recorte -> imagem inteira
+            coords = coords + np.array([deslocamento[1], deslocamento[0]])
+        return coords
+
+
+def _reamostrar_contorno(contorno, passo=1.0):
+    """Pontos do contorno (fechado) igualmente espaçados ao longo do perímetro"""
+    pontos = contorno.reshape(-1, 2).astype(np.float64)
+    fechado = np.vstack([pontos, pontos[:1]])
+    comprimento = np.concatenate([[0], np.cumsum(np.linalg.norm(np.diff(fechado, axis=0), axis=1))])
+    t = np.arange(0, comprimento[-1], passo)
+    return np.column_stack([
+        np.interp(t, comprimento, fechado[:, 0]),
+        np.interp(t, comprimento, fechado[:, 1])
+    ])
+
+
+def cantos_contorno(contorno, k=CANTOS_PASSO_K, angulo_min=CANTOS_ANGULO_MIN, janela=CANTOS_JANELA):
+    """
+    Cantos pela curvatura k-cosseno ao longo do contorno: O(pontos do
+    contorno) em vez de O(pixels) do Harris. Retorna coordenadas (linha,
+    coluna) no mesmo formato de feature.corner_peaks.
+    """
+    pontos = _reamostrar_contorno(contorno)
+    n = len(pontos)
+    if n < 2 * k + 1:
+        return np.empty((0, 2), dtype=np.intp)
+
+    v1 = np.roll(pontos, k, axis=0) - pontos
+    v2 = np.roll(pontos, -k, axis=0) - pontos
+    cos = (v1 * v2).sum(axis=1) / (np.linalg.norm(v1, axis=1) * np.linalg.norm(v2, axis=1) + 1e-12)
+    # mudança de direção em graus (0 = reta, 180 = reversão)
+    mudanca = 180.0 - np.degrees(np.arccos(np.clip(cos, -1.0, 1.0)))
+
+    maximos = maximum_filter1d(mudanca, size=2 * janela + 1, mode="wrap")
+    candidatos = np.flatnonzero((mudanca >= maximos) & (mudanca > angulo_min))
+
+    # supressão de candidatos vizinhos (platôs) mantendo o primeiro
+    selecionados = []
+    for idx in candidatos:
+        if not selecionados or idx - selecionados[-1] > janela:
+            selecionados.append(idx)
+    if len(selecionados) > 1 and selecionados[0] + n - selecionados[-1] <= janela:
+        selecionados.pop()
+
+    coords = np.rint(pontos[selecionados]).astype(np.intp)
+    return coords[:, ::-1]
+
+
+# ============================================
+# REGISTRO DE DESCRITORES
+# ============================================
+
+# nome -> função(primitivas); a ordem de registro define a ordem do vetor
+DESCRITORES = {}
+
+
+def registrar_descritor(nome):
+    def decorador(func):
+        DESCRITORES[nome] = func
+        return func
+    return decorador
+
+
+@registrar_descritor("Excentricidade")
+def _excentricidade(p):
+    M = p.momentos
+    if M['mu20'] + M['mu02'] != 0:
+        return ((M['mu20'] - M['mu02'])**2 + 4*M['mu11']**2)**0.5 / (M['mu20'] + M['mu02'])
+    return 0
+
+
+@registrar_descritor("Circularidade")
+def _circularidade(p):
+    perimetro = p.perimetro
+    if perimetro > 0:
+        return (4 * np.pi * p.area) / (perimetro ** 2)
+    return 0
+
+
+@registrar_descritor("Compacidade")
+def _compacidade(p):
+    area = p.area
+    if area > 0:
+        return (p.perimetro ** 2) / area
+    return 0
+
+
+@registrar_descritor("Razao_P_A")
+def _razao_pa(p):
+    area = p.area
+    if area > 0:
+        return p.perimetro / area
+    return 0
+
+
+@registrar_descritor("Solidez")
+def _solidez(p):
+    hull_area = p.hull_area
+    if hull_area > 0:
+        return p.area / hull_area
+    return 0
+
+
+@registrar_descritor("Alongamento")
+def _alongamento(p):
+    _, _, w, h = p.bbox
+    if h > 0:
+        return w / h
+    return 0
+
+
+@registrar_descritor("Extent")
+def _extent(p):
+    _, _, w, h = p.bbox
+    rect_area = w * h
+    if rect_area > 0:
+        return p.area / rect_area
+    return 0
+
+
+@registrar_descritor("Num_Cantos")
+def _num_cantos(p):
+    return len(p.coords_cantos)
+
+
+def parametros_engine():
+    """Parâmetros do motor que alteram os valores dos descritores"""
+    return {
+        'harris_k': HARRIS_K,
+        'harris_sigma': HARRIS_SIGMA,
+        'harris_min_distance': HARRIS_MIN_DISTANCE,
+        'harris_threshold_rel': HARRIS_THRESHOLD_REL,
+        'cantos_passo_k': CANTOS_PASSO_K,
+        'cantos_angulo_min': CANTOS_ANGULO_MIN,
+        'cantos_janela': CANTOS_JANELA,
+        'harris_sem_mascara': 'contorno_rasterizado',
+        'descritores': list(DESCRITORES),
+    }
+
+
+def extrair_descritores(primitivas, nomes=None):
+    """
+    Calcula os descritores pedidos (todos, se nomes=None) a partir das
+    primitivas. Primitivas não usadas pelos descritores pedidos não são calculadas.
+    """
+    if nomes is None:
+        nomes = DESCRITORES.keys()
+    else:
+        desconhecidos = set(nomes) - set(DESCRITORES)
+        if desconhecidos:
+            raise KeyError(f"Descritores desconhecidos: {sorted(desconhecidos)}")
+        # mantém a ordem do registro para que os vetores sejam comparáveis
+        nomes = [nome for nome in DESCRITORES if nome in nomes]
+
+    return {nome: DESCRITORES[nome](primitivas) for nome in nomes}
+
+
+def mascara_objeto(contorno, bbox, margem=MARGEM_ROI):
+    """Máscara só do objeto (contorno preenchido) num recorte em volta de bbox; retorna a máscara e o deslocamento (x0, y0)"""
+    x, y, w, h = bbox
+    x0, y0 = x - margem, y - margem
+    mascara = np.zeros((h + 2 * margem, w + 2 * margem), dtype=np.uint8)
+    cv2.drawContours(mascara, [contorno], -1, 255, cv2.FILLED, offset=(-x0, -y0))
+    return mascara, (x0, y0)
+
+
+def descritores_objetos(objetos, modo_cantos="contorno", nomes=None):
+    """
+    Descritores de cada objeto de find_all_contours: array (objetos x descritores),
+    na ordem do registro. No modo "harris" cada objeto usa a própria máscara
+    (o contorno rasterizado, ver PrimitivasForma), então cantos de objetos
+    vizinhos não entram na contagem e coords_cantos fica em coordenadas da imagem.
+    """
+    linhas = []
+    for objeto in objetos:
+        primitivas = PrimitivasForma.de_contorno_info(objeto, None, modo_cantos)
+        linhas.append(list(extrair_descritores(primitivas, nomes).values()))
+    n_descritores = len(DESCRITORES) if nomes is None else len(nomes)
+    return np.array(linhas, dtype=np.float64).reshape(-1, n_descritores)
@@ -0,0 +1,112 @@
+# DescriptorTable.py
+import json
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+from utils.DescriptorEngine import DESCRITORES
+
+
+class TabelaDescritores:
+    """
+    Tabela colunar de descritores: uma matriz (formas x descritores) com
+    esquema fixo, mais IDs das imagens e códigos de classe como índices.
+    Pode ser salva em .npy (mapeável em memória) + .json com os metadados.
+
+    parametros: com que parâmetros os descritores foram calculados (ex.:
+    main.parametros_descritores_base); gravados com a tabela, para quem a
+    carrega conferir se ela é compatível (None = desconhecidos).
+    """
+
+    def __init__(self, nomes=None, dtype=np.float64, capacidade=1024):
+        self.nomes = list(DESCRITORES) if nomes is None else list(nomes)
+        self._valores = np.empty((capacidade, len(self.nomes)), dtype=dtype)
+        self._codigos = np.empty(capacidade, dtype=np.int32)
+        self._n = 0
+        self.ids = []
+        self.classes = []  # nomes das classes; _codigos indexa esta lista
+        self._indice_classe = {}
+        self.parametros = None
+
+    def __len__(self):
+        return self._n
+
+    @property
+    def valores(self):
+        """Matriz (n x descritores); view, sem cópia"""
+        return self._valores[:self._n]
+
+    @property
+    def codigos_classe(self):
+        return self._codigos[:self._n]
+
+    @property
+    def rotulos(self):
+        """Classe de cada linha"""
+        return [self.classes[c] for c in self.codigos_classe]
+
+    def coluna(self, nome):
+        return self.valores[:, self.nomes.index(nome)]
+
+    def linha(self, i):
+        return dict(zip(self.nomes, self.valores[i]))
+
+    def _crescer(self):
+        capacidade = max(2 * len(self._valores), 1)
+        valores = np.empty((capacidade, len(self.nomes)), dtype=self._valores.dtype)
+        valores[:self._n] = self._valores[:self._n]
+        codigos = np.empty(capacidade, dtype=np.int32)
+        codigos[:self._n] = self._codigos[:self._n]
+        self._valores, self._codigos = valores, codigos
+
+    def _codigo(self, classe):
+        if classe not in self._indice_classe:
+            self._indice_classe[classe] = len(self.classes)
+            self.classes.append(classe)
+        return self._indice_classe[classe]
+
+    def adicionar(self, id_imagem, vetor, classe=None):
+        """Adiciona uma forma; vetor segue a ordem de self.nomes"""
+        if self._n == len(self._valores):
+            self._crescer()
+        self._valores[self._n] = vetor
+        self._codigos[self._n] = self._codigo(classe)
+        self.ids.append(str(id_imagem))
+        self._n += 1
+
+    def para_dataframe(self):
+        df = pd.DataFrame(self.valores, columns=self.nomes)
+        df['Classe'] = self.rotulos
+        df.index = pd.Index(self.ids, name='Imagem')
+        return df
+
+    def salvar(self, caminho):
+        """Grava <caminho>.npy (valores) e <caminho>.json (nomes, IDs, classes)"""
+        caminho = Path(caminho).with_suffix("")
+        np.save(caminho.with_suffix(".npy"), self.valores)
+        with open(caminho.with_suffix(".json"), "w", encoding="utf-8") as f:
+            json.dump({
+                "nomes": self.nomes,
+                "ids": self.ids,
+                "classes": self.classes,
+                "codigos_classe": self.codigos_classe.tolist(),
+                "parametros": self.parametros,
+            }, f, ensure_ascii=False, default=str)
+
+    @classmethod
+    def carregar(cls, caminho, mmap=True):
+        """Lê uma tabela salva; com mmap=True os valores ficam mapeados em memória (somente leitura)"""
+        caminho = Path(caminho).with_suffix("")
+        with open(caminho.with_suffix(".json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        valores = np.load(caminho.with_suffix(".npy"), mmap_mode="r" if mmap else None)
+
+        tabela = cls(meta["nomes"], dtype=valores.dtype, capacidade=0)
+        tabela._valores = valores
+        tabela._codigos = np.asarray(meta["codigos_classe"], dtype=np.int32)
+        tabela._n = len(valores)
+        tabela.ids = meta["ids"]
+        tabela.classes = meta["classes"]
+        tabela._indice_classe = {c: i for i, c in enumerate(tabela.classes)}
+        tabela.parametros = meta.get("parametros")  # tabelas antigas não têm
+        return tabela
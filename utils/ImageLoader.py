@@ -1,22 +1,145 @@
+import itertools
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import cv2
 import numpy as np
 from pathlib import Path
 
-def load_image(img_path: str):
-    print("\n[1] CARREGANDO IMAGEM...")
-    img_original = cv2.imread(str(img_path))
-    img_gray = cv2.imread(str(img_path), cv2.IMREAD_GRAYSCALE)
+from utils.Instrumentation import instrumentar
+from utils.Thresholding import analisar_intensidade
+from utils.PackedDataset import ReferenciaPacote
 
-    if img_gray is None:
-        print(" Erro ao carregar a imagem!")
+logger = logging.getLogger(__name__)
+
+# Fatores de redução aceitos na decodificação. O JPEG decodifica direto na
+# resolução reduzida (escala da DCT, bem mais barato); os outros formatos são
+# decodificados inteiros e reduzidos em seguida.
+REDUCOES = {
+    1: 0,
+    2: cv2.IMREAD_REDUCED_GRAYSCALE_2,
+    4: cv2.IMREAD_REDUCED_GRAYSCALE_4,
+    8: cv2.IMREAD_REDUCED_GRAYSCALE_8,
+}
+
+
+# Leitura antecipada: imagens lidas e ainda não consumidas
+PROFUNDIDADE_LEITURA = 8
+
+
+def _nome(fonte):
+    return Path(fonte).name if isinstance(fonte, (str, os.PathLike)) else f"<{type(fonte).__name__}>"
+
+
+@instrumentar("decodificar", medidas=lambda r: {"pixels": r.size} if r is not None else {})
+def decodificar(fonte, cor=False, reducao=1):
+    """
+    Decodifica uma imagem uma única vez. fonte: caminho, bytes já lidos (bytes,
+    bytearray, memoryview, array uint8) ou ReferenciaPacote (máscara de um dataset
+    empacotado, sem decodificação). cor=False decodifica direto em cinza;
+    cor=True mantém os canais do arquivo (cinza continua com 1 canal, sem conversão).
+    reducao: 1, 2, 4 ou 8 (divide largura e altura). Retorna None se falhar.
+    """
+    if reducao not in REDUCOES:
+        raise ValueError(f"reducao deve ser uma de {tuple(REDUCOES)}, recebido: {reducao!r}")
+    if isinstance(fonte, ReferenciaPacote):
+        return fonte.mascara(reducao)
+    if isinstance(fonte, (str, Path)):
+        try:
+            dados = np.fromfile(str(fonte), dtype=np.uint8)
+        except OSError:
+            return None
+    else:
+        dados = np.frombuffer(fonte, dtype=np.uint8)
+    if dados.size == 0:
+        return None
+    return cv2.imdecode(dados, (cv2.IMREAD_ANYCOLOR if cor else cv2.IMREAD_GRAYSCALE) | REDUCOES[reducao])
+
+
+@instrumentar("load_image", medidas=lambda r: {"pixels": r[1].size} if r[1] is not None else {})
+def load_image(img_path, cor=True, reducao=1):
+    """
+    Retorna (img_original, img_gray, intensidade); intensidade = analisar_intensidade(img_gray).
+    img_path: caminho ou bytes. Uma decodificação só: com cor=True o cinza sai do buffer
+    colorido (ou é o próprio buffer, se o arquivo já for cinza); com cor=False
+    img_original é None. reducao: ver decodificar.
+    """
+    logger.info("\n[1] CARREGANDO IMAGEM...")
+    inicio = time.perf_counter()
+    img = decodificar(img_path, cor, reducao)
+    tempo_ms = (time.perf_counter() - inicio) * 1000
+
+    if img is None:
+        logger.error("Erro ao carregar a imagem: %s", _nome(img_path))
         return None, None, None
 
-    mean_val = float(np.mean(img_gray))
+    img_original = img if cor else None
+    img_gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY) if img.ndim == 3 else img
+
+    # histograma e polaridade calculados uma vez e reaproveitados pelas etapas seguintes
+    intensidade = analisar_intensidade(img_gray)
+
+    logger.info("✓ Imagem carregada com sucesso!")
+    logger.info("  - Arquivo: %s", _nome(img_path))
+    logger.info("  - Dimensões: %dx%d pixels%s", img_gray.shape[1], img_gray.shape[0],
+                f" (reduzida 1/{reducao})" if reducao > 1 else "")
+    logger.info("  - Tipo: %s", img_gray.dtype)
+    logger.info("  - Decodificação: %.1f ms", tempo_ms)
+    logger.info("  - Valor médio: %.2f (borda: %.2f)", intensidade["media"], intensidade["media_borda"])
+
+    return img_original, img_gray, intensidade
+
+
+class LeitorImagens:
+    """
+    Lê e decodifica as próximas imagens em threads enquanto a atual é processada
+    (o OpenCV libera o GIL na leitura e na decodificação). Iterável em pares
+    (fonte, resultado de carregar(fonte)), na ordem de fontes.
+
+    No máximo `profundidade` imagens ficam lidas à espera do consumidor: quando o
+    processamento é mais lento que o disco, a leitura para (back-pressure) e a
+    memória fica limitada. profundidade=0 lê cada imagem só quando pedida (sem
+    antecipação). n_threads=None usa uma thread por imagem em leitura: a latência
+    do disco (rede) de cada arquivo se sobrepõe à dos outros, não só ao cálculo.
+    espera_ms acumula o tempo que o consumidor ficou parado esperando leitura:
+    perto de zero, a profundidade é suficiente.
+    """
+
+    def __init__(self, fontes, profundidade=PROFUNDIDADE_LEITURA, n_threads=None, carregar=decodificar):
+        self.fontes = fontes
+        self.profundidade = profundidade
+        self.n_threads = n_threads or max(profundidade, 1)
+        self.carregar = carregar
+        self.lidas = 0
+        self.espera_ms = 0.0
+
+    def _esperar(self, obter):
+        inicio = time.perf_counter()
+        resultado = obter()
+        self.espera_ms += (time.perf_counter() - inicio) * 1000
+        self.lidas += 1
+        return resultado
 
-    print(f"✓ Imagem carregada com sucesso!")
-    print(f"  - Arquivo: {Path(img_path).name}")
-    print(f"  - Dimensões: {img_gray.shape[1]}x{img_gray.shape[0]} pixels")
-    print(f"  - Tipo: {img_gray.dtype}")
-    print(f"  - Valor médio: {mean_val:.2f}")
+    def __iter__(self):
+        fontes = iter(self.fontes)
+        if self.profundidade <= 0:
+            for fonte in fontes:
+                yield fonte, self._esperar(lambda: self.carregar(fonte))
+            return
 
-    return img_original, img_gray, mean_val
+        executor = ThreadPoolExecutor(max_workers=self.n_threads, thread_name_prefix="leitura")
+        try:
+            pendentes = deque((fonte, executor.submit(self.carregar, fonte))
+                              for fonte in itertools.islice(fontes, self.profundidade))
+            while pendentes:
+                fonte, futuro = pendentes.popleft()
+                resultado = self._esperar(futuro.result)
+                # repõe a vaga antes de entregar: a leitura continua durante o processamento
+                for proxima in itertools.islice(fontes, 1):
+                    pendentes.append((proxima, executor.submit(self.carregar, proxima)))
+                yield fonte, resultado
+        finally:
+            # consumidor parou antes do fim: as leituras ainda não iniciadas são descartadas
+            executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,220 @@
+# Incremental.py
+import json
+import logging
+import os
+from pathlib import Path
+
+import numpy as np
+
+from utils.ClassSeparation import MomentosIncrementais, SeparacaoIncremental
+from utils.DescriptorCache import hash_conteudo, assinatura_parametros
+from utils.Robustness import desvios, distancias
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================
+# MANIFESTO
+# ============================================
+
+def _tamanho_mtime(img_path):
+    # imagens de um dataset empacotado não têm arquivo próprio: sempre pelo hash
+    if hasattr(img_path, "conteudo"):
+        return None, None
+    try:
+        info = os.stat(img_path)
+    except OSError:
+        return None, None
+    return info.st_size, info.st_mtime_ns
+
+
+def comparar_manifesto(imagens, anterior):
+    """
+    Compara as imagens atuais com o manifesto da execução anterior
+    ({id: {"tamanho", "mtime_ns", "hash"}}). Tamanho e mtime iguais = inalterada,
+    sem ler o arquivo; se mudaram, o hash do conteúdo decide (um arquivo só
+    tocado continua inalterado).
+    Retorna (manifesto atual, novas, alteradas, ids removidos); novas e
+    alteradas são listas de imagens, na ordem de imagens.
+    """
+    manifesto, novas, alteradas = {}, [], []
+    for img_path in imagens:
+        id_imagem = str(img_path)
+        tamanho, mtime = _tamanho_mtime(img_path)
+        entrada = anterior.get(id_imagem)
+        if entrada is not None and tamanho is not None \
+                and (entrada["tamanho"], entrada["mtime_ns"]) == (tamanho, mtime):
+            manifesto[id_imagem] = entrada
+            continue
+
+        h = hash_conteudo(img_path)
+        manifesto[id_imagem] = {"tamanho": tamanho, "mtime_ns": mtime, "hash": h}
+        if entrada is None:
+            novas.append(img_path)
+        elif entrada["hash"] != h:
+            alteradas.append(img_path)
+    removidas = [id_imagem for id_imagem in anterior if id_imagem not in manifesto]
+    return manifesto, novas, alteradas, removidas
+
+
+# ============================================
+# ESTADO ENTRE EXECUÇÕES
+# ============================================
+
+class EstadoIncremental:
+    """
+    Resultados da Parte 1 guardados entre execuções (pasta com estado.json e
+    estado.npz): manifesto das imagens, vetores base e transformados de cada
+    imagem válida, médias das distâncias e dos desvios por transformação e o
+    estado da separação entre classes (SeparacaoIncremental) nos descritores
+    `nomes_separacao`. Imagens que saem têm a sua parcela retirada dos agregados
+    e as que entram são somadas; nada é recalculado do zero.
+
+    parametros: os do pipeline (parametros_pipeline); se mudarem, o estado
+    anterior é descartado e tudo é recalculado.
+    """
+
+    def __init__(self, parametros, nomes, transformacoes, nomes_separacao):
+        self.parametros = parametros
+        self.assinatura = assinatura_parametros(parametros)
+        self.nomes = list(nomes)
+        self.transformacoes = list(transformacoes)
+        self.nomes_separacao = list(nomes_separacao)
+        self.manifesto = {}
+        self.ids = []
+        self.classes = []
+        self.base = np.empty((0, len(self.nomes)))
+        self.transformados = np.empty((0, len(self.transformacoes), len(self.nomes)))
+        self.medias_distancias = MomentosIncrementais(len(self.transformacoes))
+        self.medias_desvios = MomentosIncrementais(len(self.transformacoes) * len(self.nomes))
+        self.separacao = SeparacaoIncremental(len(self.nomes_separacao))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _colunas_separacao(self, base):
+        return base[:, [self.nomes.index(nome) for nome in self.nomes_separacao]]
+
+    def _agregar(self, base, transformados, operacao):
+        # distâncias e desvios absolutos sem normalização: parcelas de cada imagem
+        getattr(self.medias_distancias, operacao)(distancias(base, transformados))
+        getattr(self.medias_desvios, operacao)(desvios(base, transformados)["absoluto"])
+
+    def remover(self, ids):
+        """Retira as imagens (IDs) do estado e dos agregados; IDs sem linha são ignorados"""
+        indice = {id_imagem: i for i, id_imagem in enumerate(self.ids)}
+        linhas = np.array(sorted(indice[i] for i in ids if i in indice), dtype=np.intp)
+        if len(linhas) == 0:
+            return
+        self._agregar(self.base[linhas], self.transformados[linhas], "remover")
+        self.separacao.remover(linhas)
+
+        manter = np.ones(len(self.ids), dtype=bool)
+        manter[linhas] = False
+        self.ids = [i for i, m in zip(self.ids, manter) if m]
+        self.classes = [c for c, m in zip(self.classes, manter) if m]
+        self.base = self.base[manter]
+        self.transformados = self.transformados[manter]
+
+    def adicionar(self, ids, classes, base, transformados):
+        base = np.asarray(base, dtype=np.float64).reshape(-1, len(self.nomes))
+        transformados = np.asarray(transformados, dtype=np.float64).reshape(
+            -1, len(self.transformacoes), len(self.nomes))
+        if len(base) == 0:
+            return
+        self._agregar(base, transformados, "adicionar")
+        self.separacao.adicionar(self._colunas_separacao(base), classes)
+        self.ids += [str(i) for i in ids]
+        self.classes += list(classes)
+        self.base = np.vstack([self.base, base])
+        self.transformados = np.concatenate([self.transformados, transformados])
+
+    def distancias_medias(self):
+        """Distância média por transformação (NaN onde nenhuma imagem teve contorno)"""
+        n, media = self.medias_distancias.n[0], self.medias_distancias.media[0]
+        return dict(zip(self.transformacoes, np.where(n > 0, media, np.nan)))
+
+    def desvios_medios(self):
+        """Desvio absoluto médio (transformações x descritores), sem normalização"""
+        n, media = self.medias_desvios.n[0], self.medias_desvios.media[0]
+        return np.where(n > 0, media, np.nan).reshape(len(self.transformacoes), len(self.nomes))
+
+    # ----- persistência -----
+
+    _ARRAYS = {
+        "base": ("", "base"),
+        "transformados": ("", "transformados"),
+        "dist_n": ("medias_distancias", "n"),
+        "dist_media": ("medias_distancias", "media"),
+        "dist_m2": ("medias_distancias", "m2"),
+        "desv_n": ("medias_desvios", "n"),
+        "desv_media": ("medias_desvios", "media"),
+        "desv_m2": ("medias_desvios", "m2"),
+        "sep_X": ("separacao", "X"),
+        "sep_grupos": ("separacao", "grupos"),
+        "sep_somas": ("separacao", "somas_distancias"),
+        "sep_viz_mesma": ("separacao", "vizinho_mesma"),
+        "sep_dist_mesma": ("separacao", "dist_mesma"),
+        "sep_viz_outra": ("separacao", "vizinho_outra"),
+        "sep_dist_outra": ("separacao", "dist_outra"),
+        "sep_n": ("separacao.momentos", "n"),
+        "sep_media": ("separacao.momentos", "media"),
+        "sep_m2": ("separacao.momentos", "m2"),
+    }
+
+    def _objeto(self, caminho):
+        objeto = self
+        for parte in filter(None, caminho.split(".")):
+            objeto = getattr(objeto, parte)
+        return objeto
+
+    def salvar(self, pasta):
+        pasta = Path(pasta)
+        pasta.mkdir(parents=True, exist_ok=True)
+        np.savez(pasta / "estado.npz", **{chave: getattr(self._objeto(dono), atributo)
+                                          for chave, (dono, atributo) in self._ARRAYS.items()})
+        with open(pasta / "estado.json", "w", encoding="utf-8") as f:
+            json.dump({
+                "assinatura": self.assinatura,
+                "parametros": self.parametros,
+                "nomes": self.nomes,
+                "transformacoes": self.transformacoes,
+                "nomes_separacao": self.nomes_separacao,
+                "classes_separacao": self.separacao.classes,
+                "ids": self.ids,
+                "classes": self.classes,
+                "manifesto": self.manifesto,
+            }, f, ensure_ascii=False, default=str)
+
+    @classmethod
+    def ler(cls, pasta):
+        """Estado gravado em pasta, com os parâmetros com que foi gravado (None se não houver)"""
+        pasta = Path(pasta)
+        if not (pasta / "estado.json").exists():
+            return None
+        with open(pasta / "estado.json", encoding="utf-8") as f:
+            meta = json.load(f)
+        estado = cls(meta["parametros"], meta["nomes"], meta["transformacoes"], meta["nomes_separacao"])
+        estado.assinatura = meta["assinatura"]
+        with np.load(pasta / "estado.npz") as arrays:
+            for chave, (dono, atributo) in cls._ARRAYS.items():
+                setattr(estado._objeto(dono), atributo, arrays[chave])
+        estado.ids = meta["ids"]
+        estado.classes = meta["classes"]
+        estado.manifesto = meta["manifesto"]
+        estado.separacao.classes = meta["classes_separacao"]
+        estado.separacao._indice_classe = {c: i for i, c in enumerate(estado.separacao.classes)}
+        return estado
+
+    @classmethod
+    def carregar(cls, pasta, parametros, nomes, transformacoes, nomes_separacao):
+        """Estado gravado em pasta; um estado novo (vazio) se não houver ou se o esquema ou os parâmetros mudaram"""
+        novo = cls(parametros, nomes, transformacoes, nomes_separacao)
+        estado = cls.ler(pasta)
+        if estado is None:
+            return novo
+        esquema = (novo.assinatura, novo.nomes, novo.transformacoes, novo.nomes_separacao)
+        if (estado.assinatura, estado.nomes, estado.transformacoes, estado.nomes_separacao) != esquema:
+            logger.warning("Parâmetros do pipeline mudaram: estado incremental em %s descartado", pasta)
+            return novo
+        return estado
@@ -0,0 +1,195 @@
+# Instrumentation.py
+import contextlib
+import contextvars
+import cProfile
+import functools
+import json
+import pstats
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+# sinks registrados; lista vazia = instrumentação desligada (custo de um teste por chamada)
+_sinks = []
+
+# imagem sendo processada na thread/contexto atual (vai em cada evento)
+_imagem = contextvars.ContextVar("imagem_atual", default=None)
+
+
+def registrar_sink(sink):
+    """Passa a enviar os eventos das etapas para sink (objeto com emitir(evento))"""
+    _sinks.append(sink)
+    return sink
+
+
+def remover_sink(sink):
+    _sinks.remove(sink)
+
+
+def ativa():
+    return bool(_sinks)
+
+
+@contextlib.contextmanager
+def imagem_atual(id_imagem):
+    """Marca os eventos emitidos dentro do bloco com o ID da imagem"""
+    if not _sinks:
+        yield
+        return
+    token = _imagem.set(str(id_imagem))
+    try:
+        yield
+    finally:
+        _imagem.reset(token)
+
+
+class _Medicao:
+    __slots__ = ("etapa", "campos", "_wall", "_cpu", "_mem")
+
+    def __init__(self, etapa, campos):
+        self.etapa = etapa
+        self.campos = campos
+        for sink in _sinks:
+            iniciar = getattr(sink, "iniciar", None)
+            if iniciar is not None:
+                iniciar(etapa)
+        # bytes só com tracemalloc ligado (caro demais para ligar por conta própria)
+        self._mem = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None
+        self._cpu = time.process_time()
+        self._wall = time.perf_counter()
+
+    def finalizar(self, resultado=None, medidas=None):
+        wall = time.perf_counter() - self._wall
+        cpu = time.process_time() - self._cpu
+        if medidas is not None and resultado is not None:
+            self.campos.update(medidas(resultado))
+        evento = {
+            "etapa": self.etapa,
+            "imagem": _imagem.get(),
+            "wall_ms": wall * 1000,
+            "cpu_ms": cpu * 1000,
+            "bytes": (tracemalloc.get_traced_memory()[0] - self._mem) if self._mem is not None else None,
+        }
+        evento.update(self.campos)
+        for sink in _sinks:
+            sink.emitir(evento)
+
+
+@contextlib.contextmanager
+def medir(etapa, **campos):
+    """Bloco instrumentado; campos extras (ex.: pontos_contorno) podem ser adicionados ao dict produzido"""
+    if not _sinks:
+        yield campos
+        return
+    medicao = _Medicao(etapa, campos)
+    try:
+        yield campos
+    finally:
+        medicao.finalizar()
+
+
+def instrumentar(etapa, medidas=None):
+    """
+    Decorador: cada chamada da função vira um evento da etapa.
+    medidas(resultado) -> dict acrescenta campos ao evento (ex.: número de pontos do contorno).
+    """
+    def decorador(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _sinks:
+                return func(*args, **kwargs)
+            medicao = _Medicao(etapa, {})
+            resultado = None
+            try:
+                resultado = func(*args, **kwargs)
+                return resultado
+            finally:
+                medicao.finalizar(resultado, medidas)
+        return wrapper
+    return decorador
+
+
+# ============================================
+# SINKS
+# ============================================
+
+class AgregadorMemoria:
+    """Acumula os eventos por etapa e resume (n, total, média, p50, p95, CPU, bytes)"""
+
+    def __init__(self, guardar_eventos=False):
+        self.por_etapa = {}
+        self.eventos = [] if guardar_eventos else None
+
+    def emitir(self, evento):
+        self.por_etapa.setdefault(evento["etapa"], []).append(
+            (evento["wall_ms"], evento["cpu_ms"], evento["bytes"] or 0)
+        )
+        if self.eventos is not None:
+            self.eventos.append(evento)
+
+    def resumo(self):
+        resumo = {}
+        for etapa, valores in self.por_etapa.items():
+            valores = np.asarray(valores, dtype=np.float64)
+            wall, cpu, bytes_ = valores.T
+            resumo[etapa] = {
+                "n": len(valores),
+                "total_ms": float(wall.sum()),
+                "media_ms": float(wall.mean()),
+                "p50_ms": float(np.percentile(wall, 50)),
+                "p95_ms": float(np.percentile(wall, 95)),
+                "cpu_ms": float(cpu.sum()),
+                "bytes_max": int(bytes_.max()),
+            }
+        # etapa mais cara primeiro
+        return dict(sorted(resumo.items(), key=lambda item: -item[1]["total_ms"]))
+
+
+class ArquivoJSONL:
+    """Grava um evento por linha (JSON) em caminho"""
+
+    def __init__(self, caminho):
+        self.caminho = Path(caminho)
+        self._arquivo = open(self.caminho, "a", encoding="utf-8")
+
+    def emitir(self, evento):
+        self._arquivo.write(json.dumps(evento, ensure_ascii=False, default=str) + "\n")
+
+    def fechar(self):
+        self._arquivo.close()
+
+
+class PerfilEtapas:
+    """
+    cProfile separado por etapa (só as etapas em etapas, ou todas).
+    Etapas aninhadas entram no perfil da mais externa; o tempo medido
+    das etapas perfiladas inclui o custo do profiler.
+    """
+
+    def __init__(self, etapas=None):
+        self.etapas = set(etapas) if etapas is not None else None
+        self.perfis = {}
+        self._ativa = None
+
+    def iniciar(self, etapa):
+        if self._ativa is not None or (self.etapas is not None and etapa not in self.etapas):
+            return
+        self._ativa = etapa
+        self.perfis.setdefault(etapa, cProfile.Profile()).enable()
+
+    def emitir(self, evento):
+        if evento["etapa"] == self._ativa:
+            self.perfis[self._ativa].disable()
+            self._ativa = None
+
+    def estatisticas(self, etapa):
+        return pstats.Stats(self.perfis[etapa]).sort_stats("cumulative")
+
+    def salvar(self, pasta):
+        """Um .prof por etapa (abre com pstats ou snakeviz)"""
+        pasta = Path(pasta)
+        pasta.mkdir(parents=True, exist_ok=True)
+        for etapa, perfil in self.perfis.items():
+            perfil.dump_stats(pasta / f"{etapa}.prof")
@@ -0,0 +1,58 @@
+# LogConfig.py
+import logging
+import sys
+from collections import Counter
+
+# todos os módulos de utils registram em filhos deste logger (utils.ImageLoader, ...)
+LOGGER_RAIZ = "utils"
+
+MODOS = {
+    "detalhado": logging.DEBUG,     # inclui a área de cada contorno
+    "normal": logging.INFO,         # saída da análise passo a passo
+    "silencioso": logging.WARNING,  # lote: só avisos e erros
+}
+
+
+class ResumoLog(logging.Handler):
+    """Conta as mensagens emitidas por nível e por modelo de mensagem (sem os argumentos)"""
+
+    def __init__(self):
+        super().__init__(logging.WARNING)
+        self.contagens = Counter()
+
+    def emit(self, record):
+        self.contagens[(record.levelname, record.msg)] += 1
+
+    def texto(self):
+        if not self.contagens:
+            return "Nenhum aviso ou erro registrado."
+        linhas = ["Avisos e erros:"]
+        for (nivel, msg), n in self.contagens.most_common():
+            linhas.append(f"  {n:6d}x [{nivel}] {msg}")
+        return "\n".join(linhas)
+
+
+def configurar_log(modo="normal"):
+    """
+    Configura a saída dos módulos de utils. Em "silencioso" as mensagens de
+    INFO/DEBUG são descartadas pelo nível do logger, antes de qualquer
+    formatação. Retorna o ResumoLog que acumula os avisos e erros da execução.
+    """
+    if modo not in MODOS:
+        raise ValueError(f"modo deve ser um de {tuple(MODOS)}, recebido: {modo!r}")
+
+    logger = logging.getLogger(LOGGER_RAIZ)
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+
+    logger.setLevel(MODOS[modo])
+    logger.propagate = False
+
+    # mesma aparência dos antigos prints
+    saida = logging.StreamHandler(sys.stdout)
+    saida.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(saida)
+
+    resumo = ResumoLog()
+    logger.addHandler(resumo)
+    return resumo
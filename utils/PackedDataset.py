@@ -0,0 +1,197 @@
+# PackedDataset.py
+import json
+import logging
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from utils.Dataset import descobrir_imagens, extrair_classe
+
+logger = logging.getLogger(__name__)
+
+# Arquivo único: MAGICO, tamanho do índice (uint64), índice JSON, preenchimento
+# até ALINHAMENTO bytes e os dados das máscaras, uma após a outra.
+# formato "bits": 1 bit por pixel, linhas completadas até o byte (np.packbits);
+# formato "bytes": uint8 0/255, 8x maior, mas cada máscara é uma view do arquivo.
+EXTENSAO_PACOTE = ".kpak"
+MAGICO = b"KPAK\x00\x01\x00\x00"
+ALINHAMENTO = 64
+FORMATOS_PACOTE = ("bits", "bytes")
+LIMIAR_PACOTE = 127  # pixel > limiar = 1 (as silhuetas já são 0/255)
+
+
+def eh_pacote(caminho):
+    return Path(caminho).suffix == EXTENSAO_PACOTE and Path(caminho).is_file()
+
+
+def _bytes_mascara(img, formato):
+    binaria = img > LIMIAR_PACOTE
+    if formato == "bits":
+        return np.packbits(binaria, axis=1).tobytes()
+    return (binaria.astype(np.uint8) * 255).tobytes()
+
+
+def empacotar(dataset_path, destino, formato="bits"):
+    """
+    Grava as imagens do dataset (mesma ordem de descobrir_imagens) num único arquivo,
+    binarizadas em LIMIAR_PACOTE, com o índice de IDs (caminho relativo ao dataset)
+    e classes (extrair_classe, como na Parte 2). Retorna o número de imagens.
+    """
+    from utils.ImageLoader import LeitorImagens
+
+    if formato not in FORMATOS_PACOTE:
+        raise ValueError(f"formato deve ser um de {FORMATOS_PACOTE}, recebido: {formato!r}")
+
+    ids, codigos, classes, formas, offsets, blocos = [], [], [], [], [], []
+    indice_classe = {}
+    tamanho, nao_binarias = 0, 0
+    for img_path, img in LeitorImagens(descobrir_imagens(dataset_path)):
+        if img is None:
+            logger.warning("Imagem ignorada (não foi possível ler): %s", img_path)
+            continue
+        if np.count_nonzero((img != 0) & (img != 255)):
+            nao_binarias += 1
+
+        classe = extrair_classe(img_path)
+        if classe not in indice_classe:
+            indice_classe[classe] = len(classes)
+            classes.append(classe)
+        dados = _bytes_mascara(img, formato)
+
+        ids.append(Path(img_path).relative_to(dataset_path).as_posix())
+        codigos.append(indice_classe[classe])
+        formas.append(img.shape)
+        offsets.append(tamanho)
+        blocos.append(dados)
+        tamanho += len(dados)
+
+    if nao_binarias:
+        logger.warning("%d imagens não eram binárias e foram limiarizadas em %d", nao_binarias, LIMIAR_PACOTE)
+
+    indice = json.dumps({
+        "formato": formato,
+        "ids": ids,
+        "classes": classes,
+        "codigos_classe": codigos,
+        "formas": formas,
+        "offsets": offsets,
+    }, ensure_ascii=False).encode("utf-8")
+    cabecalho = MAGICO + np.uint64(len(indice)).tobytes() + indice
+    cabecalho += b"\x00" * (-len(cabecalho) % ALINHAMENTO)
+
+    with open(destino, "wb") as f:
+        f.write(cabecalho)
+        for dados in blocos:
+            f.write(dados)
+    return len(ids)
+
+
+class DatasetEmpacotado:
+    """
+    Dataset gravado por empacotar. Os dados das máscaras são mapeados em memória
+    (mmap=True) ou lidos numa única leitura sequencial (mmap=False); percorrer o
+    dataset em ordem lê o arquivo sequencialmente, sem abrir um arquivo por imagem.
+    """
+
+    def __init__(self, caminho, mmap=True):
+        self.caminho = str(caminho)
+        with open(self.caminho, "rb") as f:
+            if f.read(len(MAGICO)) != MAGICO:
+                raise ValueError(f"não é um dataset empacotado: {self.caminho}")
+            tamanho_indice = int(np.frombuffer(f.read(8), dtype=np.uint64)[0])
+            indice = json.loads(f.read(tamanho_indice).decode("utf-8"))
+        inicio = len(MAGICO) + 8 + tamanho_indice
+        inicio += -inicio % ALINHAMENTO
+
+        self.formato = indice["formato"]
+        self.ids = indice["ids"]
+        self.classes = indice["classes"]
+        self.codigos_classe = np.asarray(indice["codigos_classe"], dtype=np.int32)
+        self.formas = [tuple(forma) for forma in indice["formas"]]
+        self._offsets = indice["offsets"]
+        if mmap:
+            self._dados = np.memmap(self.caminho, dtype=np.uint8, mode="r", offset=inicio)
+        else:
+            self._dados = np.fromfile(self.caminho, dtype=np.uint8, offset=inicio)
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def rotulos(self):
+        return [self.classes[c] for c in self.codigos_classe]
+
+    def dados(self, i):
+        """Máscara i como está no arquivo (view, sem cópia): bits (h x ceil(w/8)) ou bytes (h x w)"""
+        h, w = self.formas[i]
+        largura = -(-w // 8) if self.formato == "bits" else w
+        inicio = self._offsets[i]
+        return self._dados[inicio:inicio + h * largura].reshape(h, largura)
+
+    def __getitem__(self, i):
+        """Máscara i em uint8 0/255; no formato "bytes" é uma view somente leitura do arquivo"""
+        dados = self.dados(i)
+        if self.formato == "bytes":
+            return dados
+        return np.unpackbits(dados, axis=1, count=self.formas[i][1]) * np.uint8(255)
+
+    def __iter__(self):
+        """(id, máscara) em ordem"""
+        for i, id_imagem in enumerate(self.ids):
+            yield id_imagem, self[i]
+
+    def referencias(self):
+        return [ReferenciaPacote(self.caminho, i, id_imagem) for i, id_imagem in enumerate(self.ids)]
+
+
+# Pacotes abertos por processo: as referências enviadas ao pool só levam o
+# caminho e o índice, e cada processo mapeia o arquivo uma única vez
+_pacotes_abertos = {}
+
+
+def abrir_pacote(caminho):
+    if caminho not in _pacotes_abertos:
+        _pacotes_abertos[caminho] = DatasetEmpacotado(caminho)
+    return _pacotes_abertos[caminho]
+
+
+class ReferenciaPacote:
+    """
+    Uma imagem dentro de um dataset empacotado, usada no lugar do caminho do
+    arquivo (decodificar aceita as duas). str() e os.fspath() dão o ID (caminho
+    relativo original), então extrair_classe, Path(...).name e os IDs das
+    tabelas ficam iguais aos do dataset em pastas.
+    """
+    __slots__ = ("pacote", "indice", "id")
+
+    def __init__(self, pacote, indice, id_imagem):
+        self.pacote = pacote
+        self.indice = indice
+        self.id = id_imagem
+
+    def __str__(self):
+        return self.id
+
+    def __fspath__(self):
+        return self.id
+
+    def __repr__(self):
+        return f"ReferenciaPacote({self.pacote!r}, {self.indice}, {self.id!r})"
+
+    def __eq__(self, outra):
+        return isinstance(outra, ReferenciaPacote) and (self.pacote, self.indice) == (outra.pacote, outra.indice)
+
+    def __hash__(self):
+        return hash((self.pacote, self.indice))
+
+    def mascara(self, reducao=1):
+        mascara = abrir_pacote(self.pacote)[self.indice]
+        if reducao > 1:
+            h, w = mascara.shape
+            mascara = cv2.resize(mascara, (max(w // reducao, 1), max(h // reducao, 1)), interpolation=cv2.INTER_AREA)
+        return mascara
+
+    def conteudo(self):
+        """Bytes da máscara como gravados (para o hash do cache de descritores)"""
+        return abrir_pacote(self.pacote).dados(self.indice).tobytes()
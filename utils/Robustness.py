@@ -0,0 +1,66 @@
+# Robustness.py
+import numpy as np
+import pandas as pd
+
+# escala usada para comparar descritores de magnitudes diferentes
+# (Compacidade ~ 10-100, Solidez ~ 0-1): calculada sobre os vetores base
+NORMALIZACOES = ("nenhuma", "desvio_padrao", "amplitude")
+
+
+def escala_descritores(base, normalizacao="nenhuma"):
+    """Fator de escala de cada descritor (1 onde a escala é nula)"""
+    if normalizacao not in NORMALIZACOES:
+        raise ValueError(f"normalizacao deve ser uma de {NORMALIZACOES}, recebido: {normalizacao!r}")
+    base = np.asarray(base, dtype=np.float64)
+    if normalizacao == "nenhuma":
+        return np.ones(base.shape[-1])
+    if normalizacao == "desvio_padrao":
+        escala = np.nanstd(base, axis=0)
+    else:
+        escala = np.nanmax(base, axis=0) - np.nanmin(base, axis=0)
+    return np.where(escala > 0, escala, 1.0)
+
+
+def desvios(base, transformados, normalizacao="nenhuma"):
+    """
+    Desvios por descritor entre cada imagem transformada e a sua base.
+    base: (imagens x descritores); transformados: (imagens x transformações x descritores),
+    NaN onde a transformação não teve contorno.
+
+    Retorna dict de arrays (imagens x transformações x descritores):
+      "absoluto": |t - b| / escala (escala = 1 sem normalização);
+      "relativo": |t - b| / |b| (NaN onde b = 0).
+    """
+    base = np.asarray(base, dtype=np.float64)
+    diferenca = np.abs(np.asarray(transformados, dtype=np.float64) - base[:, None, :])
+    modulo_base = np.abs(base)[:, None, :]
+    return {
+        "absoluto": diferenca / escala_descritores(base, normalizacao),
+        "relativo": np.divide(diferenca, modulo_base, out=np.full_like(diferenca, np.nan),
+                              where=modulo_base > 0),
+    }
+
+
+def distancias(base, transformados, normalizacao="nenhuma"):
+    """Distância euclidiana (sobre os descritores) de cada transformação à base: (imagens x transformações)"""
+    base = np.asarray(base, dtype=np.float64)
+    diferenca = (np.asarray(transformados, dtype=np.float64) - base[:, None, :]) \
+        / escala_descritores(base, normalizacao)
+    return np.sqrt(np.einsum("itd,itd->it", diferenca, diferenca))
+
+
+def tabela_resumo(desvio, nomes_transformacoes, nomes_descritores, estatistica="media"):
+    """Resumo (transformações x descritores) de um array de desvios, ignorando NaN"""
+    funcoes = {
+        "media": lambda a: np.nanmean(a, axis=0),
+        "mediana": lambda a: np.nanmedian(a, axis=0),
+        "p95": lambda a: np.nanpercentile(a, 95, axis=0),
+        "max": lambda a: np.nanmax(a, axis=0),
+    }
+    return pd.DataFrame(funcoes[estatistica](desvio), index=list(nomes_transformacoes),
+                        columns=list(nomes_descritores))
+
+
+def descritor_menos_estavel(resumo):
+    """Para cada transformação, o descritor de maior desvio e o seu valor"""
+    return pd.DataFrame({"Descritor": resumo.idxmax(axis=1), "Desvio": resumo.max(axis=1)})
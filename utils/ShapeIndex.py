@@ -0,0 +1,93 @@
+# ShapeIndex.py
+import numpy as np
+from scipy.spatial import cKDTree
+from sklearn.preprocessing import StandardScaler
+
+METODOS = ("kdtree", "bruta")
+
+
+class IndiceFormas:
+    """
+    Índice de k vizinhos mais próximos sobre vetores de descritores.
+
+    Os vetores são normalizados com StandardScaler (média 0, desvio 1 por
+    descritor) para que Compacidade e Num_Cantos não dominem a distância.
+    metodo="kdtree" usa uma árvore k-d (consultas sub-lineares);
+    metodo="bruta" faz a busca exaustiva vetorizada, em blocos (referência).
+    """
+
+    def __init__(self, vetores, ids=None, rotulos=None, metodo="kdtree", bloco=65536):
+        if metodo not in METODOS:
+            raise ValueError(f"metodo deve ser um de {METODOS}, recebido: {metodo!r}")
+        vetores = np.asarray(vetores, dtype=np.float64)
+
+        self.metodo = metodo
+        self.bloco = bloco
+        self.ids = list(ids) if ids is not None else list(range(len(vetores)))
+        self.rotulos = list(rotulos) if rotulos is not None else None
+
+        self.scaler = StandardScaler().fit(vetores)
+        self.vetores = self.scaler.transform(vetores)
+        # aplicados direto nas consultas: evita a validação do sklearn a cada busca
+        self._media = self.scaler.mean_
+        self._escala = self.scaler.scale_
+
+        if metodo == "kdtree":
+            self._arvore = cKDTree(self.vetores, leafsize=32)
+        else:
+            self._normas = np.einsum("ij,ij->i", self.vetores, self.vetores)
+
+    @classmethod
+    def de_tabela(cls, tabela, metodo="kdtree", **kwargs):
+        """Índice sobre uma TabelaDescritores (IDs e classes da tabela)"""
+        return cls(tabela.valores, tabela.ids, tabela.rotulos, metodo=metodo, **kwargs)
+
+    def __len__(self):
+        return len(self.vetores)
+
+    def buscar(self, consultas, k=5):
+        """
+        k vizinhos de cada consulta (vetores crus, não normalizados).
+        Retorna (distancias, indices), ambos (n_consultas x k), do mais próximo ao mais distante.
+        """
+        consultas = np.atleast_2d(np.asarray(consultas, dtype=np.float64))
+        consultas = (consultas - self._media) / self._escala
+        k = min(k, len(self))
+
+        if self.metodo == "kdtree":
+            distancias, indices = self._arvore.query(consultas, k=k)
+            return distancias.reshape(len(consultas), k), indices.reshape(len(consultas), k)
+        return self._buscar_bruta(consultas, k)
+
+    def _buscar_bruta(self, consultas, k):
+        n_consultas = len(consultas)
+        melhores_d2 = np.full((n_consultas, k), np.inf)
+        melhores_idx = np.zeros((n_consultas, k), dtype=np.intp)
+        normas_q = np.einsum("ij,ij->i", consultas, consultas)[:, None]
+
+        # ||q - x||² = ||q||² + ||x||² - 2 q.x, bloco a bloco para limitar memória
+        for inicio in range(0, len(self), self.bloco):
+            fim = min(inicio + self.bloco, len(self))
+            d2 = normas_q + self._normas[inicio:fim] - 2.0 * consultas @ self.vetores[inicio:fim].T
+            np.maximum(d2, 0, out=d2)
+
+            kb = min(k, fim - inicio)
+            parcial = np.argpartition(d2, kb - 1, axis=1)[:, :kb]
+            candidatos_d2 = np.hstack([melhores_d2, np.take_along_axis(d2, parcial, axis=1)])
+            candidatos_idx = np.hstack([melhores_idx, parcial + inicio])
+
+            ordem = np.argpartition(candidatos_d2, k - 1, axis=1)[:, :k]
+            melhores_d2 = np.take_along_axis(candidatos_d2, ordem, axis=1)
+            melhores_idx = np.take_along_axis(candidatos_idx, ordem, axis=1)
+
+        ordem = np.argsort(melhores_d2, axis=1)
+        return (np.sqrt(np.take_along_axis(melhores_d2, ordem, axis=1)),
+                np.take_along_axis(melhores_idx, ordem, axis=1))
+
+    def buscar_formas(self, vetor, k=5):
+        """Resultado legível de uma consulta: lista de (id, classe, distância)"""
+        distancias, indices = self.buscar(vetor, k)
+        return [
+            (self.ids[i], self.rotulos[i] if self.rotulos is not None else None, float(d))
+            for d, i in zip(distancias[0], indices[0])
+        ]
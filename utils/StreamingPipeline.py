@@ -0,0 +1,105 @@
+# StreamingPipeline.py
+import queue
+import threading
+
+# tamanho padrão das filas entre etapas (itens em trânsito por etapa)
+TAMANHO_FILA = 8
+
+# intervalo (s) em que um put bloqueado confere se o consumidor parou
+ESPERA_PARADA = 0.1
+
+_FIM = object()
+
+
+def _colocar(fila, item, parar):
+    """put na fila que desiste quando parar é sinalizado; retorna se o item entrou"""
+    while not parar.is_set():
+        try:
+            fila.put(item, timeout=ESPERA_PARADA)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def _fechar(fluxo):
+    # fechar uma etapa fecha a anterior, e assim até a fonte: as threads de cima também param
+    fechar = getattr(fluxo, "close", None)
+    if fechar is not None:
+        fechar()
+
+
+def _produzir(fonte, fila, erros, parar):
+    try:
+        for item in fonte:
+            if not _colocar(fila, item, parar):
+                break
+    except BaseException as erro:
+        erros.append(erro)
+    finally:
+        _fechar(fonte)
+        _colocar(fila, _FIM, parar)
+
+
+def encadear(fonte, tamanho_fila=TAMANHO_FILA):
+    """
+    Consome o gerador fonte numa thread própria e entrega os itens por uma
+    fila limitada: a etapa anterior bloqueia quando a fila enche (back-pressure).
+    Se o consumo termina antes (erro numa etapa seguinte, close do gerador), a
+    thread é avisada, fecha a fonte e é esperada: nenhuma fica presa no put.
+    """
+    fila = queue.Queue(maxsize=tamanho_fila)
+    erros = []
+    parar = threading.Event()
+    thread = threading.Thread(target=_produzir, args=(fonte, fila, erros, parar), daemon=True)
+    thread.start()
+
+    try:
+        while True:
+            item = fila.get()
+            if item is _FIM:
+                break
+            yield item
+    finally:
+        parar.set()
+        thread.join()
+    if erros:
+        raise erros[0]
+
+
+def etapa(func, entrada):
+    """Aplica func a cada item; itens para os quais func retorna None são descartados"""
+    try:
+        for item in entrada:
+            saida = func(item)
+            if saida is not None:
+                yield saida
+    finally:
+        _fechar(entrada)
+
+
+def pipeline(fonte, etapas, tamanho_fila=TAMANHO_FILA):
+    """
+    Encadeia as etapas (funções item -> item) sobre a fonte, cada uma na sua
+    thread, ligadas por filas limitadas. A ordem da fonte é preservada e a
+    memória fica limitada aos itens em trânsito, qualquer que seja o tamanho
+    do dataset.
+    """
+    fluxo = fonte
+    for func in etapas:
+        fluxo = encadear(etapa(func, fluxo), tamanho_fila)
+    return fluxo
+
+
+def executar(fonte, etapas, sink, tamanho_fila=TAMANHO_FILA):
+    """Roda o pipeline entregando cada resultado ao sink assim que fica pronto; retorna o total"""
+    total = 0
+    fluxo = pipeline(fonte, etapas, tamanho_fila)
+    try:
+        for resultado in fluxo:
+            sink(resultado)
+            total += 1
+    finally:
+        # erro no sink: as threads das etapas são encerradas aqui, não no coletor de lixo
+        fluxo.close()
+    return total
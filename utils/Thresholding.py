@@ -0,0 +1,105 @@
+# Thresholding.py
+import logging
+import cv2
+import numpy as np
+
+from utils.Instrumentation import instrumentar
+
+logger = logging.getLogger(__name__)
+
+# "fixo": limiar global LIMIAR_FIXO (o comportamento original);
+# "otsu": limiar global escolhido pelo histograma da imagem;
+# "adaptativo": limiar local (média da vizinhança BLOCO_ADAPTATIVO x BLOCO_ADAPTATIVO
+# menos C_ADAPTATIVO), para iluminação desigual em imagens digitalizadas
+MODOS_LIMIAR = ("fixo", "otsu", "adaptativo")
+LIMIAR_FIXO = 127
+BLOCO_ADAPTATIVO = 51
+C_ADAPTATIVO = 10
+LARGURA_BORDA = 2  # pixels de cada lado usados para detectar a cor do fundo
+
+NIVEIS = np.arange(256, dtype=np.float64)
+
+
+def histograma(img_gray):
+    """Histograma de 256 níveis (float64) de uma imagem uint8"""
+    return cv2.calcHist([img_gray], [0], None, [256], [0, 256]).ravel().astype(np.float64)
+
+
+def _pixels_borda(img_gray, largura):
+    h, w = img_gray.shape
+    largura = max(1, min(largura, h // 2, w // 2))
+    return np.concatenate([
+        img_gray[:largura].ravel(), img_gray[h - largura:].ravel(),
+        img_gray[largura:h - largura, :largura].ravel(), img_gray[largura:h - largura, w - largura:].ravel(),
+    ])
+
+
+@instrumentar("analisar_intensidade")
+def analisar_intensidade(img_gray, largura_borda=LARGURA_BORDA):
+    """
+    Duas passadas: o histograma da imagem inteira (calcHist) e o da faixa de
+    borda (bincount, só sobre esses pixels); médias e polaridade saem dos histogramas.
+    O fundo é a cor da borda (o objeto não costuma tocar a borda); ele é claro se
+    a borda for mais clara que a imagem como um todo. Retorna um dict reaproveitado
+    pelas etapas seguintes (binarização, cor de preenchimento das transformações).
+    """
+    hist = histograma(img_gray)
+    hist_borda = np.bincount(_pixels_borda(img_gray, largura_borda), minlength=256).astype(np.float64)
+    media = float(hist @ NIVEIS / hist.sum())
+    media_borda = float(hist_borda @ NIVEIS / hist_borda.sum())
+
+    # imagem sem objeto (borda igual ao todo): volta ao critério da média
+    fundo_claro = media_borda > media if media_borda != media else media > LIMIAR_FIXO
+    return {
+        "histograma": hist,
+        "histograma_borda": hist_borda,
+        "media": media,
+        "media_borda": media_borda,
+        "fundo_claro": bool(fundo_claro),
+        "valor_fundo": 255 if fundo_claro else 0,
+    }
+
+
+def limiar_otsu(hist):
+    """Limiar de Otsu a partir de um histograma de 256 níveis (maior variância entre classes)"""
+    p = hist / hist.sum()
+    omega = np.cumsum(p)
+    mu = np.cumsum(p * NIVEIS)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        variancia = (mu[-1] * omega - mu) ** 2 / (omega * (1 - omega))
+    return int(np.nanargmax(variancia)) if np.isfinite(variancia).any() else LIMIAR_FIXO
+
+
+def _bloco(img_gray, bloco):
+    # ímpar e no máximo do tamanho da imagem
+    bloco = min(bloco, min(img_gray.shape))
+    return max(3, bloco - 1 + bloco % 2)
+
+
+def binarizar(img_gray, intensidade=None, modo="fixo", bloco=BLOCO_ADAPTATIVO, c=C_ADAPTATIVO):
+    """
+    Objeto branco (255) em fundo preto, para qualquer polaridade da imagem.
+    intensidade: dict de analisar_intensidade (calculado aqui se None); imagens
+    derivadas da mesma original (transformações) podem reaproveitar o da original.
+    Retorna (binary, limiar); no modo adaptativo o limiar é None (varia por pixel).
+    """
+    if modo not in MODOS_LIMIAR:
+        raise ValueError(f"modo deve ser um de {MODOS_LIMIAR}, recebido: {modo!r}")
+    if intensidade is None:
+        intensidade = analisar_intensidade(img_gray)
+    tipo = cv2.THRESH_BINARY_INV if intensidade["fundo_claro"] else cv2.THRESH_BINARY
+
+    if modo == "adaptativo":
+        # fundo claro: objeto = mais escuro que a vizinhança - c; fundo escuro: mais claro + c
+        binary = cv2.adaptiveThreshold(img_gray, 255, cv2.ADAPTIVE_THRESH_MEAN_C, tipo,
+                                       _bloco(img_gray, bloco), c if intensidade["fundo_claro"] else -c)
+        return binary, None
+
+    limiar = LIMIAR_FIXO
+    if modo == "otsu":
+        # calculado uma vez por histograma
+        if "limiar_otsu" not in intensidade:
+            intensidade["limiar_otsu"] = limiar_otsu(intensidade["histograma"])
+        limiar = intensidade["limiar_otsu"]
+    _, binary = cv2.threshold(img_gray, limiar, 255, tipo)
+    return binary, limiar
@@ -0,0 +1,242 @@
+# TransformSweep.py
+import itertools
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+import numpy as np
+import pandas as pd
+
+from utils.AnalyticTransforms import matriz_rotacao, matriz_escala, matriz_espelhamento, transformar_primitivas
+from utils.Binarization import binarize_and_fill
+from utils.ContourProcessing import find_main_contour
+from utils.DescriptorEngine import DESCRITORES, PrimitivasForma, extrair_descritores
+from utils.Robustness import desvios
+from utils.Thresholding import analisar_intensidade
+from utils.ImageLoader import decodificar
+
+# Especificação da varredura. Faixas aceitam lista de valores ou
+# {"inicio", "fim", "passo"} (fim exclusivo, como o range).
+# Os eixos geométricos (ângulos x escalas x espelhamentos) são combinados
+# em grade; as degradações (ruído, morfologia, oclusão) variam uma de cada
+# vez sobre a imagem original.
+ESPEC_PADRAO = {
+    "angulos": {"inicio": 0, "fim": 360, "passo": 15},
+    "escalas": [0.5, 1.0],
+    "espelhamentos": [None],        # None, "horizontal", "vertical"
+    "ruido": [5, 15, 30],           # desvio padrão do ruído gaussiano (níveis de cinza)
+    "morfologia": [-2, -1, 1, 2],   # raio: < 0 erode o objeto, > 0 dilata
+    "oclusao": [0.1, 0.2, 0.3],     # fração da largura da bbox coberta pelo fundo
+}
+
+TAMANHO_LOTE = 256
+
+
+def _faixa(valor):
+    if isinstance(valor, dict):
+        return np.arange(valor["inicio"], valor["fim"], valor["passo"]).tolist()
+    return list(valor)
+
+
+def gerar_transformacoes(espec):
+    """Transformações da varredura, uma a uma (dicts com "tipo" e os parâmetros)"""
+    for espelhamento in espec.get("espelhamentos", [None]):
+        for escala in _faixa(espec.get("escalas", [1.0])):
+            for angulo in _faixa(espec.get("angulos", [0])):
+                yield {"tipo": "afim", "angulo": angulo, "escala": escala, "espelhamento": espelhamento}
+    for tipo in ("ruido", "morfologia", "oclusao"):
+        for valor in _faixa(espec.get(tipo, [])):
+            yield {"tipo": tipo, "valor": valor}
+
+
+def contar_transformacoes(espec):
+    n_afins = (len(espec.get("espelhamentos", [None])) * len(_faixa(espec.get("escalas", [1.0])))
+               * len(_faixa(espec.get("angulos", [0]))))
+    return n_afins + sum(len(_faixa(espec.get(tipo, []))) for tipo in ("ruido", "morfologia", "oclusao"))
+
+
+def em_lotes(iteravel, tamanho=TAMANHO_LOTE):
+    iterador = iter(iteravel)
+    while lote := list(itertools.islice(iterador, tamanho)):
+        yield lote
+
+
+# ============================================
+# APLICAÇÃO DAS TRANSFORMAÇÕES
+# ============================================
+
+def matriz_afim(transformacao, centro):
+    """Matriz 2x3: rotação, depois escala, depois espelhamento, todas em torno de centro"""
+    M = np.vstack([matriz_rotacao(transformacao["angulo"], centro), [0, 0, 1]])
+    M = np.vstack([matriz_escala(transformacao["escala"], centro), [0, 0, 1]]) @ M
+    if transformacao["espelhamento"] is not None:
+        E = matriz_espelhamento(transformacao["espelhamento"] == "horizontal", centro)
+        M = np.vstack([E, [0, 0, 1]]) @ M
+    return M[:2]
+
+
+def aplicar_raster(img_gray, transformacao, bbox, rng, intensidade=None):
+    """
+    Imagem (cinza) com a transformação aplicada; bbox do objeto original para a oclusão.
+    intensidade: dict de analisar_intensidade da original (cor do fundo).
+    """
+    tipo = transformacao["tipo"]
+    if intensidade is None:
+        intensidade = analisar_intensidade(img_gray)
+    fundo = intensidade["valor_fundo"]
+    h, w = img_gray.shape
+
+    if tipo == "afim":
+        M = matriz_afim(transformacao, (w // 2, h // 2))
+        return cv2.warpAffine(img_gray, M, (w, h), borderValue=fundo)
+
+    valor = transformacao["valor"]
+    if tipo == "ruido":
+        ruidosa = img_gray + rng.normal(0, valor, img_gray.shape)
+        return np.clip(ruidosa, 0, 255).astype(np.uint8)
+
+    if tipo == "morfologia":
+        raio = abs(int(valor))
+        kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (2 * raio + 1, 2 * raio + 1))
+        # objeto escuro em fundo claro cresce com a erosão dos níveis de cinza
+        cresce = (valor > 0) != (fundo == 255)
+        return cv2.dilate(img_gray, kernel) if cresce else cv2.erode(img_gray, kernel)
+
+    if tipo == "oclusao":
+        x, y, bw, bh = bbox
+        ocluida = img_gray.copy()
+        largura = int(round(bw * valor))
+        ocluida[y:y + bh, x + bw - largura:x + bw] = fundo
+        return ocluida
+
+    raise ValueError(f"tipo de transformação desconhecido: {tipo!r}")
+
+
+def segmentar_primitivas(img_gray, modo_cantos="contorno", intensidade=None, modo_limiar="fixo",
+                         cantos_no_contorno=False):
+    """
+    Binarização + contorno principal -> PrimitivasForma (None se não houver contorno).
+    intensidade: dict de analisar_intensidade; as imagens transformadas usam o da original.
+    cantos_no_contorno: Harris sobre o contorno rasterizado em vez da imagem binária,
+    como nas primitivas analíticas (avaliacao="analitica": base e transformadas iguais).
+    """
+    binary, binary_filled = binarize_and_fill(img_gray, intensidade, modo_limiar=modo_limiar)
+    contorno_info = find_main_contour(binary_filled, img_gray)
+    if contorno_info is None:
+        return None
+    return PrimitivasForma.de_contorno_info(contorno_info, None if cantos_no_contorno else binary_filled,
+                                            modo_cantos)
+
+
+def avaliar_lote(img_gray, base, transformacoes, modo_cantos="contorno", avaliacao="analitica", semente=0,
+                 intensidade=None, modo_limiar="fixo"):
+    """
+    Descritores da forma em cada transformação do lote: array (transformações x descritores),
+    NaN onde a imagem transformada não tem contorno. Com avaliacao="analitica" as afins
+    são calculadas todas de uma vez sobre o contorno; as degradações sempre usam o raster
+    (com os cantos sobre o contorno rasterizado, como a base desse modo).
+    intensidade: dict de analisar_intensidade de img_gray (calculado aqui se None).
+    """
+    if intensidade is None:
+        intensidade = analisar_intensidade(img_gray)
+    valores = np.full((len(transformacoes), len(DESCRITORES)), np.nan)
+    rng = np.random.default_rng(semente)
+    h, w = img_gray.shape
+
+    afins = [i for i, t in enumerate(transformacoes) if t["tipo"] == "afim"]
+    if avaliacao == "analitica" and afins:
+        matrizes = [matriz_afim(transformacoes[i], (w // 2, h // 2)) for i in afins]
+        for i, primitivas in zip(afins, transformar_primitivas(base, matrizes)):
+            valores[i] = list(extrair_descritores(primitivas).values())
+        afins = set(afins)
+    else:
+        afins = set()
+
+    for i, transformacao in enumerate(transformacoes):
+        if i in afins:
+            continue
+        img_trans = aplicar_raster(img_gray, transformacao, base.bbox, rng, intensidade)
+        primitivas = segmentar_primitivas(img_trans, modo_cantos, intensidade, modo_limiar,
+                                          cantos_no_contorno=avaliacao == "analitica")
+        if primitivas is not None:
+            valores[i] = list(extrair_descritores(primitivas).values())
+    return valores
+
+
+# ============================================
+# VARREDURA NO DATASET (POOL DE PROCESSOS)
+# ============================================
+
+def _avaliar_imagem(unidade):
+    """
+    Unidade de trabalho do pool: todas as transformações de uma imagem, lote a
+    lote, com a imagem decodificada e a base segmentada uma única vez.
+    Retorna (vetor base, transformações x descritores); (None, None) sem contorno.
+    """
+    img_path, espec, lote, opcoes = unidade
+    img = decodificar(img_path)
+    if img is None:
+        return None, None
+    intensidade = analisar_intensidade(img)
+    base = segmentar_primitivas(img, opcoes["modo_cantos"], intensidade, opcoes["modo_limiar"],
+                                cantos_no_contorno=opcoes["avaliacao"] == "analitica")
+    if base is None:
+        return None, None
+
+    vetor_base = np.array(list(extrair_descritores(base).values()))
+    blocos = [
+        # semente fixa por (imagem, lote): mesmo resultado em série ou no pool
+        avaliar_lote(img, base, transformacoes, opcoes["modo_cantos"], opcoes["avaliacao"],
+                     [opcoes["semente"], zlib.crc32(str(img_path).encode()), i], intensidade, opcoes["modo_limiar"])
+        for i, transformacoes in enumerate(em_lotes(gerar_transformacoes(espec), lote))
+    ]
+    return vetor_base, np.vstack(blocos)
+
+
+def varredura(imagens, espec=ESPEC_PADRAO, n_workers=1, lote=TAMANHO_LOTE, modo_cantos="contorno",
+              avaliacao="analitica", semente=0, dtype=np.float32, modo_limiar="fixo"):
+    """
+    Avalia todas as transformações de espec em todas as imagens.
+    Cada imagem é uma unidade de trabalho (decodificada e segmentada uma vez,
+    transformações avaliadas em lotes de tamanho lote), distribuída num pool
+    de processos (n_workers=1: em série).
+
+    Retorna um dict:
+      "imagens": caminhos com contorno; "transformacoes": DataFrame com os parâmetros;
+      "base": (imagens x descritores); "valores": (imagens x transformações x descritores).
+    """
+    # percorrida duas vezes (unidades e coleta): um gerador se esgotaria na primeira
+    imagens = list(imagens)
+    n_trans = contar_transformacoes(espec)
+    opcoes = {"modo_cantos": modo_cantos, "avaliacao": avaliacao, "semente": semente, "modo_limiar": modo_limiar}
+    unidades = ((img_path, espec, lote, opcoes) for img_path in imagens)
+
+    executor = ProcessPoolExecutor(max_workers=n_workers) if n_workers > 1 else None
+    try:
+        resultados = executor.map(_avaliar_imagem, unidades) if executor is not None \
+            else map(_avaliar_imagem, unidades)
+
+        validas, bases, valores = [], [], []
+        for img_path, (vetor_base, valores_imagem) in zip(imagens, resultados):
+            if vetor_base is None:
+                continue
+            validas.append(img_path)
+            bases.append(vetor_base)
+            valores.append(valores_imagem)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return {
+        "imagens": validas,
+        "transformacoes": pd.DataFrame(list(gerar_transformacoes(espec))),
+        "base": np.array(bases, dtype=dtype).reshape(-1, len(DESCRITORES)),
+        "valores": np.array(valores, dtype=dtype).reshape(-1, n_trans, len(DESCRITORES)),
+    }
+
+
+def curvas_robustez(resultado, normalizacao="nenhuma"):
+    """Desvio absoluto médio (entre imagens) de cada descritor em cada transformação"""
+    absoluto = desvios(resultado["base"], resultado["valores"], normalizacao)["absoluto"]
+    curvas = pd.DataFrame(np.nanmean(absoluto, axis=0), columns=list(DESCRITORES))
+    return pd.concat([resultado["transformacoes"], curvas], axis=1)
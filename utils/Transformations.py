@@ -1,12 +1,30 @@
 # Transformations.py
+import logging
 import cv2
 import numpy as np
 from scipy.ndimage import binary_fill_holes
-from skimage import util, feature
-
-def generate_transformations(img_gray, mean_val):
-    print("\n[6] TESTANDO ROBUSTEZ COM TRANSFORMAÇÕES...")
-    print("-" * 80)
+from utils.DescriptorEngine import PrimitivasForma, extrair_descritores
+from utils.ContourProcessing import MARGEM_ROI
+from utils.Instrumentation import instrumentar
+from utils.Thresholding import analisar_intensidade, binarizar
+from utils.Binarization import fill_holes
+from utils.Robustness import desvios, distancias
+
+logger = logging.getLogger(__name__)
+
+@instrumentar("generate_transformations")
+def generate_transformations(img_gray, intensidade=None):
+    """
+    intensidade: dict de analisar_intensidade da imagem (dá a cor de fundo das bordas).
+    As transformações são sempre da imagem inteira, também no modo ROI: rotacionar
+    ou escalar só um recorte muda o centro e a amostragem e, com eles, os descritores.
+    """
+    logger.info("\n[6] TESTANDO ROBUSTEZ COM TRANSFORMAÇÕES...")
+    logger.info("-" * 80)
+
+    if intensidade is None:
+        intensidade = analisar_intensidade(img_gray)
+    border_value = intensidade["valor_fundo"]
 
     transformacoes = {
         'Original': img_gray,
@@ -18,7 +36,6 @@ def generate_transformations(img_gray, mean_val):
 
     h_img, w_img = img_gray.shape
     centro = (w_img // 2, h_img // 2)
-    border_value = 255 if mean_val > 127 else 0
 
     M_45 = cv2.getRotationMatrix2D(centro, 45, 1.0)
     transformacoes['Rotação 45°'] = cv2.warpAffine(img_gray, M_45, (w_img, h_img), borderValue=border_value)
@@ -42,22 +59,30 @@ def generate_transformations(img_gray, mean_val):
     return transformacoes
 
 
-def compare_transformations(transformacoes, img_area, descritores_base):
-    import cv2
-    distancias_trans = {}
+@instrumentar("compare_transformations", medidas=lambda r: {"transformacoes": len(r)})
+def compare_transformations(transformacoes, img_area, descritores_base, modo_cantos="harris",
+                            intensidade=None, modo_limiar="fixo", usar_roi=False):
+    """
+    intensidade: dict de analisar_intensidade da imagem original. As transformações
+    são geométricas e preenchem as bordas com o fundo, então a polaridade (e o
+    limiar de Otsu) da original valem para todas, sem recalcular por imagem.
+    usar_roi: o contorno sai da binária (o externo não muda com o preenchimento),
+    e o preenchimento e o Harris rodam só em volta dele; os resultados são os
+    mesmos da imagem inteira.
+    """
+    if intensidade is None:
+        intensidade = analisar_intensidade(transformacoes['Original'])
+    nomes_trans = []
+    vetores_trans = []
     vetor_base = np.array(list(descritores_base.values()))
 
     for nome_trans, img_trans in transformacoes.items():
         if nome_trans == 'Original':
             continue
 
-        mean_trans = np.mean(img_trans)
-        if mean_trans > 127:
-            _, binary_trans = cv2.threshold(img_trans, 127, 255, cv2.THRESH_BINARY_INV)
-        else:
-            _, binary_trans = cv2.threshold(img_trans, 127, 255, cv2.THRESH_BINARY)
-
-        binary_trans = binary_fill_holes(binary_trans > 0).astype(np.uint8) * 255
+        binary_trans, _ = binarizar(img_trans, intensidade, modo_limiar)
+        if not usar_roi:
+            binary_trans = binary_fill_holes(binary_trans > 0).astype(np.uint8) * 255
         contours_trans, _ = cv2.findContours(binary_trans, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
 
         if len(contours_trans) == 0:
@@ -73,41 +98,27 @@ def compare_transformations(transformacoes, img_area, descritores_base):
         else:
             contorno_trans = max(valid_contours_trans, key=cv2.contourArea)
 
-        area_trans = cv2.contourArea(contorno_trans)
-        perimetro_trans = cv2.arcLength(contorno_trans, True)
-
-        # momentos
-        M_trans = cv2.moments(contorno_trans)
-        desc_trans = {}
-
-        if M_trans['mu20'] + M_trans['mu02'] != 0:
-            desc_trans['Excentricidade'] = (
-                (M_trans['mu20'] - M_trans['mu02'])**2 + 4*M_trans['mu11']**2
-            )**0.5 / (M_trans['mu20'] + M_trans['mu02'])
-        else:
-            desc_trans['Excentricidade'] = 0
-
-        desc_trans['Circularidade'] = (4 * np.pi * area_trans) / (perimetro_trans ** 2) if perimetro_trans > 0 else 0
-        desc_trans['Compacidade'] = (perimetro_trans ** 2) / area_trans if area_trans > 0 else 0
-        desc_trans['Razao_P_A'] = perimetro_trans / area_trans if area_trans > 0 else 0
-
-        hull_trans = cv2.convexHull(contorno_trans)
-        hull_area_trans = cv2.contourArea(hull_trans)
-        desc_trans['Solidez'] = area_trans / hull_area_trans if hull_area_trans > 0 else 0
-
-        x_t, y_t, w_t, h_t = cv2.boundingRect(contorno_trans)
-        desc_trans['Alongamento'] = w_t / h_t if h_t > 0 else 0
-        rect_area_trans = w_t * h_t
-        desc_trans['Extent'] = area_trans / rect_area_trans if rect_area_trans > 0 else 0
-
-        image_float_trans = util.img_as_float(binary_trans)
-        harris_response_trans = feature.corner_harris(image_float_trans, k=0.04, sigma=1.5)
-        coords_trans = feature.corner_peaks(harris_response_trans, min_distance=5, threshold_rel=0.05)
-        desc_trans['Num_Cantos'] = len(coords_trans)
-
-        vetor_trans = np.array(list(desc_trans.values()))
-        distancia = np.linalg.norm(vetor_base - vetor_trans)
-        distancias_trans[nome_trans] = distancia
-        print(f"  • {nome_trans}: Distância = {distancia:.4f}")
+        roi_margem = None
+        if usar_roi:
+            roi_margem = MARGEM_ROI
+            binary_trans = fill_holes(binary_trans, roi=cv2.boundingRect(contorno_trans))
+        primitivas_trans = PrimitivasForma(contorno_trans, binary_trans, modo_cantos, roi_margem)
+        desc_trans = extrair_descritores(primitivas_trans, list(descritores_base.keys()))
+
+        nomes_trans.append(nome_trans)
+        vetores_trans.append(list(desc_trans.values()))
+
+    # todas as transformações de uma vez: (1 imagem x transformações x descritores)
+    transformados = np.array(vetores_trans, dtype=np.float64).reshape(1, -1, len(vetor_base))
+    dist = distancias(vetor_base[None], transformados)[0]
+    distancias_trans = dict(zip(nomes_trans, dist))
+
+    if logger.isEnabledFor(logging.INFO):
+        relativos = desvios(vetor_base[None], transformados)["relativo"][0]
+        for nome_trans, distancia, relativo in zip(nomes_trans, dist, relativos):
+            # descritor que mais variou (em relação ao próprio valor)
+            pior = int(np.nanargmax(relativo)) if np.isfinite(relativo).any() else 0
+            logger.info("  • %s: Distância = %.4f (maior variação: %s, %.1f%%)",
+                        nome_trans, distancia, list(descritores_base)[pior], 100 * relativo[pior])
 
     return distancias_trans
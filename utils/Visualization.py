@@ -1,9 +1,42 @@
 # Visualization.py
+import logging
+import time
 import cv2
+import matplotlib
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
+FORMATOS = ("png", "svg")
+
+
+def modo_headless():
+    """Troca para o backend Agg (sem janela): as figuras só podem ser salvas em arquivo"""
+    plt.switch_backend("Agg")
+
+
+def salvar_figura(fig, caminho, dpi=100):
+    """Grava a figura (formato pela extensão) e libera a memória dela"""
+    caminho = Path(caminho)
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    fig.savefig(caminho, dpi=dpi)
+    plt.close(fig)
+
+
+def mostrar_ou_salvar(fig, saida=None, dpi=100):
+    """plt.show() (interativo) ou, com saida, grava em arquivo sem bloquear"""
+    if saida is None:
+        plt.show()
+    else:
+        salvar_figura(fig, saida, dpi)
+
+
 def plot_full_analysis(
     img_path,
     img_original,
@@ -14,10 +47,31 @@ def plot_full_analysis(
     descritores,
     coords,
     transformacoes,
-    distancias_trans
+    distancias_trans,
+    saida=None
 ):
-    print("\n[7] GERANDO VISUALIZAÇÃO...")
+    """Figura completa da análise; com saida=caminho.png/.svg grava em vez de abrir a janela"""
+    logger.info("\n[7] GERANDO VISUALIZAÇÃO...")
+
+    fig = criar_figura_analise(img_path, img_original, img_gray, binary, binary_filled,
+                               contorno_info, descritores, coords, transformacoes, distancias_trans)
+    mostrar_ou_salvar(fig, saida)
 
+    logger.info("✓ Visualização gerada com sucesso!")
+
+
+def criar_figura_analise(
+    img_path,
+    img_original,
+    img_gray,
+    binary,
+    binary_filled,
+    contorno_info,
+    descritores,
+    coords,
+    transformacoes,
+    distancias_trans
+):
     contorno = contorno_info["contorno"]
     x, y, w, h = contorno_info["bbox"]
     hull = contorno_info["hull"]
@@ -162,6 +216,363 @@ Cantos Harris: {len(coords)}
     plt.suptitle(f'ANÁLISE COMPLETA: {Path(img_path).name}',
                  fontsize=16, fontweight='bold', y=0.98)
     plt.tight_layout(rect=[0, 0, 1, 0.97])
-    plt.show()
+    return fig
+
+
+# ============================================
+# MODELO REUTILIZÁVEL DE RELATÓRIO
+# ============================================
+
+def _para_rgba(img):
+    """BGR ou cinza -> RGBA uint8; cinza escalado entre mínimo e máximo, como o imshow(cmap='gray')"""
+    if img.ndim == 3:
+        return cv2.cvtColor(img, cv2.COLOR_BGR2RGBA)
+    return cv2.cvtColor(cv2.normalize(img, None, 0, 255, cv2.NORM_MINMAX, cv2.CV_8U), cv2.COLOR_GRAY2RGBA)
+
+
+def _imagem_contorno(img_gray, contorno_info):
+    img = cv2.cvtColor(img_gray, cv2.COLOR_GRAY2BGR)
+    cv2.drawContours(img, [contorno_info["contorno"]], -1, (0, 255, 0), 3)
+    return img
+
+
+def _imagem_features(img_gray, contorno_info):
+    x, y, w, h = contorno_info["bbox"]
+    img = cv2.cvtColor(img_gray, cv2.COLOR_GRAY2BGR)
+    cv2.drawContours(img, [contorno_info["contorno"]], -1, (0, 255, 0), 2)
+    cv2.drawContours(img, [contorno_info["hull"]], -1, (255, 0, 0), 2)
+    cv2.rectangle(img, (x, y), (x+w, y+h), (0, 0, 255), 2)
+    return img
+
+
+def _texto_info(img_path, img_gray, contorno_info, coords):
+    return f"""INFORMAÇÕES DA IMAGEM
+
+Arquivo: {Path(img_path).name}
+Dimensões: {img_gray.shape[1]}x{img_gray.shape[0]}
+Área: {contorno_info["area"]:.2f} px²
+Perímetro: {contorno_info["perimetro"]:.2f} px
+Contornos: ?
+Pontos: {len(contorno_info["contorno"])}
+Cantos Harris: {len(coords)}
+"""
+
+
+# texto sem hinting do FreeType: o desenho dos textos que mudam a cada
+# relatório é a maior parte do tempo do modelo, e o hinting o deixa ~25% mais lento
+ESTILO_MODELO = {'text.hinting': 'no_hinting'}
+
+# filtro PNG "up" (linha de cima) em todas as linhas: comprime ~1/3 mais
+# rápido que o filtro adaptativo padrão e, nas figuras, gera arquivos menores.
+# IMWRITE_PNG_FILTER só existe a partir do OpenCV 4.11
+PARAMETROS_PNG = [cv2.IMWRITE_PNG_FILTER, cv2.IMWRITE_PNG_FILTER_UP] if hasattr(cv2, "IMWRITE_PNG_FILTER") else []
+
+
+def _limites_barras(valores, margem=0.05):
+    """Limites do eixo de valores de um gráfico de barras como o autoscale do
+    matplotlib (margem de 5%, sem margem do lado do zero; valores não finitos
+    ignorados); None se todos forem zero"""
+    valores = np.asarray(valores, dtype=float)
+    valores = np.append(valores[np.isfinite(valores)], 0.0)
+    inferior, superior = valores.min(), valores.max()
+    if superior == inferior:
+        return None
+    folga = margem * (superior - inferior)
+    return (inferior - folga if inferior < 0 else 0.0), (superior + folga if superior > 0 else 0.0)
+
+
+class ModeloRelatorio:
+    """
+    A figura de criar_figura_analise montada uma única vez (eixos, tabela,
+    textos e tight_layout, na primeira imagem) e reaproveitada: nas seguintes
+    só os dados dos artistas mudam. O fundo estático (títulos fixos, nomes
+    das transformações, legenda, moldura da tabela) é guardado depois do
+    primeiro desenho e restaurado a cada relatório; só os artistas que mudam
+    são redesenhados (blitting), e as imagens são reduzidas com o OpenCV e
+    copiadas direto no buffer. O texto é desenhado sem hinting (ESTILO_MODELO).
+    Usa o canvas Agg direto, sem pyplot: não depende do backend nem acumula
+    figuras abertas. Só gera imagens raster (png, jpg...); SVG continua em
+    criar_figura_analise.
+    """
+
+    def __init__(self, dpi=100):
+        self.dpi = dpi
+        self.fig = None
+
+    def _montar(self, dados):
+        fig = Figure(figsize=(20, 14), dpi=self.dpi)
+        FigureCanvasAgg(fig)
+
+        def painel(posicao, titulo, fontsize=None):
+            ax = fig.add_subplot(4, 5, posicao)
+            ax.set_title(titulo, fontweight='bold', **({'fontsize': fontsize} if fontsize else {}))
+            ax.axis('off')
+            return ax
+
+        self._imagens = {
+            "img_original": painel(1, '1. Imagem Original'),
+            "img_gray": painel(2, '2. Escala de Cinza'),
+            "binary": painel(3, '3. Binarização'),
+            "binary_filled": painel(4, '4. Buracos Preenchidos'),
+            "contorno": painel(5, '5. Contorno'),
+            "features": painel(6, 'Features\n(Verde: Contorno, Azul: Hull, Vermelho: BBox)', 9),
+            "harris": painel(7, '', 9),
+        }
+        self._cantos, = self._imagens["harris"].plot([], [], 'ro', markersize=6)
+        # nome da transformação fixo no título (fundo estático); a linha
+        # "Dist: ..." é um texto à parte, no mesmo lugar, redesenhado a cada imagem
+        self._nomes_trans = list(dados["transformacoes"])
+        self._eixos_trans = [painel(11 + i, f'{nome}\n' if nome in dados["distancias_trans"] else nome, 9)
+                             for i, nome in enumerate(self._nomes_trans)]
+        self._dist_trans = [ax.text(*ax.title.get_position(), '', transform=ax.title.get_transform(),
+                                    ha='center', va='baseline', fontweight='bold', fontsize=9)
+                            for ax in self._eixos_trans]
+
+        nomes_desc = list(dados["descritores"])
+        self._ax_desc = fig.add_subplot(4, 5, 16)
+        self._barras_desc = self._ax_desc.barh(nomes_desc, np.zeros(len(nomes_desc)), color='steelblue')
+        self._ax_desc.set_xlabel('Valor', fontweight='bold', fontsize=8)
+        self._ax_desc.set_title('Valores dos Descritores', fontweight='bold', fontsize=9)
+        self._ax_desc.tick_params(axis='both', labelsize=7)
+
+        self._nomes_dist = list(dados["distancias_trans"])
+        self._ax_dist = fig.add_subplot(4, 5, 17)
+        self._barras_dist = self._ax_dist.bar(self._nomes_dist, np.zeros(len(self._nomes_dist)), color='coral')
+        self._ax_dist.set_xlabel('Transformação', fontweight='bold', fontsize=8)
+        self._ax_dist.set_ylabel('Distância Euclidiana', fontweight='bold', fontsize=8)
+        self._ax_dist.set_title('Robustez às Transformações', fontweight='bold', fontsize=9)
+        self._ax_dist.tick_params(axis='x', labelrotation=45, labelsize=7)
+        for rotulo in self._ax_dist.get_xticklabels():
+            rotulo.set_horizontalalignment('right')
+        self._ax_dist.tick_params(axis='y', labelsize=7)
+
+        ax_tabela = fig.add_subplot(4, 5, 18)
+        ax_tabela.axis('tight')
+        ax_tabela.axis('off')
+        tabela = ax_tabela.table(
+            cellText=[[nome, ""] for nome in nomes_desc],
+            colLabels=['Descritor', 'Valor'],
+            cellLoc='left',
+            loc='center',
+            colWidths=[0.6, 0.4]
+        )
+        tabela.auto_set_font_size(False)
+        tabela.set_fontsize(7)
+        tabela.scale(1, 1.3)
+        ax_tabela.set_title('Tabela de Descritores', fontweight='bold', pad=20, fontsize=9)
+        # linha 0 = cabeçalho
+        self._celulas_valor = [tabela[i + 1, 1].get_text() for i in range(len(nomes_desc))]
+
+        ax_info = fig.add_subplot(4, 5, 19)
+        ax_info.axis('off')
+        self._info = ax_info.text(0.1, 0.5, "", fontsize=8, verticalalignment='center', family='monospace',
+                                  bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5))
+
+        ax_legenda = fig.add_subplot(4, 5, 20)
+        ax_legenda.axis('off')
+        ax_legenda.text(0.1, 0.5, """INTERPRETAÇÃO
+
+✓ Circularidade ≈ 1: forma circular
+✓ Alongamento > 1: forma horizontal
+✓ Solidez ≈ 1: sem concavidades
+✓ Distância baixa: descritor robusto
+""", fontsize=7, verticalalignment='center', family='monospace',
+                        bbox=dict(boxstyle='round', facecolor='lightblue', alpha=0.5))
+
+        self._titulo = fig.suptitle("", fontsize=16, fontweight='bold', y=0.98)
+        self.fig = fig
+
+        # layout calculado uma vez, com os dados da primeira imagem
+        self._atualizar(dados)
+        fig.tight_layout(rect=[0, 0, 1, 0.97])
+
+        # só o que muda entre imagens é redesenhado: os cantos, as barras e o
+        # eixo de valores dos gráficos e os textos variáveis (as imagens são
+        # coladas no buffer)
+        self._dinamicos = (
+            [self._cantos] + [self._imagens["harris"].title] + self._dist_trans
+            + list(self._barras_desc) + list(self._barras_dist) + [self._ax_desc.xaxis, self._ax_dist.yaxis]
+            + self._celulas_valor + [self._info, self._titulo]
+        )
+        for artista in self._dinamicos:
+            artista.set_animated(True)
+        for texto in self._celulas_valor:
+            texto.set_text("")
+        fig.canvas.draw()
+        self._fundo = fig.canvas.copy_from_bbox(fig.bbox)
+        for ax, texto in zip(self._eixos_trans, self._dist_trans):
+            texto.set_position(ax.title.get_position())
+
+    def _mostrar(self, ax, img):
+        h, w = img.shape[:2]
+        self._quadros.append((ax, img))
+        # caixa do eixo fixa, com a imagem centrada e pixels quadrados dentro
+        # dela: títulos e posições não dependem das dimensões de cada imagem;
+        # os limites só posicionam os cantos de Harris sobre a imagem
+        escala = max(w / ax.bbox.width, h / ax.bbox.height) / 2
+        meia_largura, meia_altura = ax.bbox.width * escala, ax.bbox.height * escala
+        ax.set_xlim((w - 1) / 2 - meia_largura, (w - 1) / 2 + meia_largura)
+        ax.set_ylim((h - 1) / 2 + meia_altura, (h - 1) / 2 - meia_altura)
+
+    def _atualizar(self, dados):
+        img_gray = dados["img_gray"]
+        contorno_info = dados["contorno_info"]
+        coords = dados["coords"]
+        distancias_trans = dados["distancias_trans"]
+
+        self._quadros = []
+        self._mostrar(self._imagens["img_original"], dados["img_original"])
+        self._mostrar(self._imagens["img_gray"], img_gray)
+        self._mostrar(self._imagens["binary"], dados["binary"])
+        self._mostrar(self._imagens["binary_filled"], dados["binary_filled"])
+        self._mostrar(self._imagens["contorno"], _imagem_contorno(img_gray, contorno_info))
+        self._mostrar(self._imagens["features"], _imagem_features(img_gray, contorno_info))
+        self._mostrar(self._imagens["harris"], dados["binary_filled"])
+        if len(coords) > 0:
+            self._cantos.set_data(coords[:, 1], coords[:, 0])
+        else:
+            self._cantos.set_data([], [])
+        self._imagens["harris"].set_title(f'Cantos Harris ({len(coords)} pontos)', fontweight='bold', fontsize=9)
+
+        for ax, texto, nome_trans in zip(self._eixos_trans, self._dist_trans, self._nomes_trans):
+            img_trans = dados["transformacoes"].get(nome_trans)
+            if img_trans is not None:
+                self._mostrar(ax, img_trans)
+            # mesma quebra de linha do título: as duas linhas ficam alinhadas
+            texto.set_text(f'\nDist: {distancias_trans[nome_trans]:.3f}'
+                           if img_trans is not None and nome_trans in distancias_trans else '')
+
+        for barra, valor in zip(self._barras_desc, dados["descritores"].values()):
+            barra.set_width(valor)
+        for barra, nome in zip(self._barras_dist, self._nomes_dist):
+            barra.set_height(distancias_trans.get(nome, 0.0))
+        # limites do eixo de valores calculados direto (relim/autoscale_view
+        # percorrem todas as barras); autoscale só nos casos degenerados
+        valores_eixos = ((self._ax_desc, 'x', list(dados["descritores"].values())),
+                         (self._ax_dist, 'y', [distancias_trans.get(nome, 0.0) for nome in self._nomes_dist]))
+        for ax, eixo, valores in valores_eixos:
+            limites = _limites_barras(valores)
+            if limites is None:
+                ax.relim()
+                ax.autoscale_view()
+            elif eixo == 'x':
+                ax.set_xlim(limites)
+            else:
+                ax.set_ylim(limites)
+
+        for texto, valor in zip(self._celulas_valor, dados["descritores"].values()):
+            texto.set_text(f"{valor:.4f}")
+        self._info.set_text(_texto_info(dados["img_path"], img_gray, contorno_info, coords))
+        self._titulo.set_text(f'ANÁLISE COMPLETA: {Path(dados["img_path"]).name}')
+
+    def desenhar(self, **dados):
+        """Relatório de uma imagem (dados = argumentos de criar_figura_analise); retorna o RGBA (h x w x 4)"""
+        with matplotlib.rc_context(ESTILO_MODELO):
+            if self.fig is None:
+                self._montar(dados)
+            self._atualizar(dados)
+            canvas = self.fig.canvas
+            canvas.restore_region(self._fundo)
+            buffer = np.asarray(canvas.buffer_rgba())
+            for ax, img in self._quadros:
+                self._colar(buffer, ax.bbox, img)
+            for artista in self._dinamicos:
+                self.fig.draw_artist(artista)
+        return buffer
+
+    @staticmethod
+    def _colar(buffer, caixa, img):
+        # caixa em coordenadas de tela (origem embaixo); buffer com a linha 0 em cima
+        h, w = img.shape[:2]
+        escala = min(caixa.width / w, caixa.height / h)
+        nw, nh = max(1, int(round(w * escala))), max(1, int(round(h * escala)))
+        x0 = int(round(caixa.x0 + (caixa.width - nw) / 2))
+        y0 = int(round(buffer.shape[0] - caixa.y1 + (caixa.height - nh) / 2))
+        buffer[y0:y0 + nh, x0:x0 + nw] = cv2.resize(_para_rgba(img), (nw, nh), interpolation=cv2.INTER_AREA)
+
+    def salvar(self, caminho, **dados):
+        """Grava o relatório em caminho (formato raster pela extensão); retorna o tempo em ms"""
+        inicio = time.perf_counter()
+        rgba = self.desenhar(**dados)
+        caminho = Path(caminho)
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+        parametros = PARAMETROS_PNG if caminho.suffix.lower() == ".png" else []
+        cv2.imwrite(str(caminho), cv2.cvtColor(rgba, cv2.COLOR_RGBA2BGR), parametros)
+        return (time.perf_counter() - inicio) * 1000
+
+
+# ============================================
+# RENDERIZAÇÃO EM SEGUNDO PLANO
+# ============================================
+
+def _iniciar_worker_render():
+    modo_headless()
+
+
+# modelo de relatório do processo, montado na primeira figura e reaproveitado
+_modelo = None
+
+
+def _renderizar(caminho, dados, dpi, usar_modelo=False):
+    global _modelo
+    if usar_modelo:
+        if _modelo is None or _modelo.dpi != dpi:
+            _modelo = ModeloRelatorio(dpi)
+        return caminho, _modelo.salvar(caminho, **dados)
+    inicio = time.perf_counter()
+    salvar_figura(criar_figura_analise(**dados), caminho, dpi)
+    return caminho, (time.perf_counter() - inicio) * 1000
+
+
+class RenderizadorRelatorios:
+    """
+    Gera as figuras de plot_full_analysis em arquivos num pool de processos
+    (backend Agg), enquanto o processo principal segue calculando.
+    n_workers=0 renderiza no próprio processo. No máximo max_pendentes
+    figuras ficam na fila; acima disso submeter espera a mais antiga.
+    usar_modelo: em PNG, cada processo reaproveita um ModeloRelatorio em vez
+    de montar a figura do zero (SVG sempre usa criar_figura_analise).
+    """
+
+    def __init__(self, pasta, formato="png", n_workers=1, dpi=100, max_pendentes=None, usar_modelo=True):
+        if formato not in FORMATOS:
+            raise ValueError(f"formato deve ser um de {FORMATOS}, recebido: {formato!r}")
+        self.pasta = Path(pasta)
+        self.formato = formato
+        self.dpi = dpi
+        self.usar_modelo = usar_modelo and formato == "png"
+        self.max_pendentes = max_pendentes or 2 * max(n_workers, 1)
+        self.tempos_ms = {}
+        self._pendentes = []
+        self._executor = ProcessPoolExecutor(n_workers, initializer=_iniciar_worker_render) \
+            if n_workers > 0 else None
+
+    def submeter(self, nome, **dados):
+        """Agenda a figura nome.formato; dados = argumentos de criar_figura_analise"""
+        caminho = self.pasta / f"{nome}.{self.formato}"
+        if self._executor is None:
+            self._registrar(_renderizar(caminho, dados, self.dpi, self.usar_modelo))
+            return caminho
+        while len(self._pendentes) >= self.max_pendentes:
+            self._registrar(self._pendentes.pop(0).result())
+        self._pendentes.append(self._executor.submit(_renderizar, caminho, dados, self.dpi, self.usar_modelo))
+        return caminho
+
+    def _registrar(self, resultado):
+        caminho, tempo_ms = resultado
+        self.tempos_ms[caminho] = tempo_ms
+
+    def fechar(self):
+        """Espera as figuras pendentes; retorna {caminho: tempo de renderização (ms)}"""
+        for futuro in self._pendentes:
+            self._registrar(futuro.result())
+        self._pendentes = []
+        if self._executor is not None:
+            self._executor.shutdown()
+        return self.tempos_ms
+
+    def __enter__(self):
+        return self
 
-    print("✓ Visualização gerada com sucesso!")
+    def __exit__(self, *exc):
+        self.fechar()
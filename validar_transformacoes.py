@@ -0,0 +1,126 @@
+import math
+import time
+import cv2
+import pandas as pd
+
+from main import TRANSFORMACOES, descritores_transformacao, primitivas_base, processar_imagem
+from utils.Dataset import listar_imagens
+from utils.DescriptorEngine import DESCRITORES, MODOS_CANTOS, extrair_descritores
+from utils.AnalyticTransforms import grade_transformacoes, descritores_analiticos, transformar_primitivas
+from utils.Thresholding import analisar_intensidade
+from utils.TransformSweep import varredura
+
+IDENTIDADE = [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]]
+
+# ============================================
+# AVALIAÇÃO ANALÍTICA x RASTER (REFERÊNCIA)
+# ============================================
+
+def comparar_avaliacoes(dataset_path, modo_cantos="contorno"):
+    """Diferença entre os descritores analíticos e os do raster, por transformação e descritor"""
+    imagens = listar_imagens(dataset_path)
+
+    linhas = []
+    for img_path in imagens:
+        img = cv2.imread(str(img_path), cv2.IMREAD_GRAYSCALE)
+        if img is None:
+            continue
+        # segmentação da original fora da medição: é compartilhada pelas transformações
+        intensidade = analisar_intensidade(img)
+        primitivas = primitivas_base(img, modo_cantos, intensidade=intensidade)
+        for nome_trans in TRANSFORMACOES:
+            vetores = {}
+            for avaliacao in ("raster", "analitica"):
+                inicio = time.perf_counter()
+                desc = descritores_transformacao(img, nome_trans, modo_cantos, avaliacao=avaliacao,
+                                                 intensidade=intensidade, primitivas=primitivas)
+                vetores[avaliacao] = desc
+                vetores[f"tempo_{avaliacao}"] = (time.perf_counter() - inicio) * 1000
+            if vetores["raster"] is None or vetores["analitica"] is None:
+                continue
+
+            linha = {'Imagem': img_path.name, 'Transformação': nome_trans,
+                     'Tempo_raster_ms': vetores["tempo_raster"],
+                     'Tempo_analitica_ms': vetores["tempo_analitica"]}
+            for nome in DESCRITORES:
+                linha[nome] = abs(vetores["analitica"][nome] - vetores["raster"][nome])
+            linhas.append(linha)
+
+    df = pd.DataFrame(linhas)
+    # erro absoluto médio por transformação e descritor
+    resumo = df.groupby('Transformação')[list(DESCRITORES) + ['Tempo_raster_ms', 'Tempo_analitica_ms']].mean()
+    return df, resumo
+
+
+def verificar_identidade(dataset_path, modos_cantos=MODOS_CANTOS, tolerancia=1e-6):
+    """
+    Na avaliação analítica, a identidade não muda o vetor de descritores: a base e
+    as formas transformadas contam os cantos do mesmo jeito. Confere o caminho de
+    main.py (primitivas_base) e o da varredura (TransformSweep), em cada modo de
+    cantos. Retorna as falhas [(imagem, modo, origem)]; vazia = tudo igual.
+    """
+    def iguais(a, b):
+        return all(math.isclose(x, y, rel_tol=tolerancia, abs_tol=tolerancia) for x, y in zip(a, b))
+
+    falhas = []
+    for img_path in listar_imagens(dataset_path):
+        img = cv2.imread(str(img_path), cv2.IMREAD_GRAYSCALE)
+        if img is None:
+            continue
+        for modo_cantos in modos_cantos:
+            resultado = processar_imagem(img_path, modo_cantos, img=img, avaliacao="analitica")
+            if resultado is None:
+                continue
+            base = list(resultado[0].values())
+            transformada = extrair_descritores(transformar_primitivas(primitivas_base(img, modo_cantos),
+                                                                      [IDENTIDADE])[0])
+            if not iguais(base, transformada.values()):
+                falhas.append((img_path.name, modo_cantos, "main"))
+
+            sweep = varredura([img_path], {"angulos": [0]}, modo_cantos=modo_cantos, dtype=float)
+            if not iguais(sweep["base"][0], sweep["valores"][0, 0]):
+                falhas.append((img_path.name, modo_cantos, "varredura"))
+    return falhas
+
+
+def varredura_densa(img_path, angulos=range(0, 360, 5), escalas=(0.25, 0.5, 0.75, 1.0, 1.5, 2.0),
+                    modo_cantos="contorno"):
+    """Descritores numa grade densa de rotações x escalas (analítico); retorna o DataFrame e o tempo em ms"""
+    img = cv2.imread(str(img_path), cv2.IMREAD_GRAYSCALE)
+    primitivas = primitivas_base(img, modo_cantos)
+    h, w = img.shape
+    matrizes = grade_transformacoes(angulos, escalas, (w // 2, h // 2))
+
+    inicio = time.perf_counter()
+    valores = descritores_analiticos(primitivas, list(matrizes.values()))
+    tempo_ms = (time.perf_counter() - inicio) * 1000
+
+    return pd.DataFrame(valores, index=list(matrizes), columns=list(DESCRITORES)), tempo_ms
+
+# ============================================
+# EXECUÇÃO PRINCIPAL
+# ============================================
+
+if __name__ == "__main__":
+    dataset_path = "./Kimia99_DB"  # Ajuste conforme necessário
+    modo_cantos = "contorno"
+
+    print("=" * 60)
+    print("TRANSFORMAÇÕES: ANALÍTICA x RASTER")
+    print("=" * 60)
+
+    falhas = verificar_identidade(dataset_path)
+    if falhas:
+        raise AssertionError(f"a identidade mudou os descritores em {len(falhas)} casos: {falhas[:5]}")
+    print(f"\nIdentidade: descritores inalterados em todas as imagens (modos {', '.join(MODOS_CANTOS)})")
+
+    df, resumo = comparar_avaliacoes(dataset_path, modo_cantos)
+    print("\nErro absoluto médio (analítica - raster) por transformação:")
+    print(resumo.round(4).T.to_string())
+    df.to_csv("comparacao_transformacoes.csv", index=False)
+    print("\nTabela por imagem salva em comparacao_transformacoes.csv")
+
+    img_path = listar_imagens(dataset_path)[0]
+    grade, tempo_ms = varredura_densa(img_path, modo_cantos=modo_cantos)
+    print(f"\nVarredura densa em {img_path.name}: {len(grade)} transformações em {tempo_ms:.1f} ms")
+    print(grade.std().round(4).to_string())
@@ -0,0 +1,71 @@
+import os
+import time
+import matplotlib.pyplot as plt
+import numpy as np
+
+from utils.Dataset import listar_imagens
+from utils.DescriptorEngine import DESCRITORES
+from utils.Visualization import mostrar_ou_salvar
+from utils.TransformSweep import ESPEC_PADRAO, contar_transformacoes, varredura, curvas_robustez
+
+# ============================================
+# CURVAS DE ROBUSTEZ POR DESCRITOR
+# ============================================
+
+def plotar_curvas(curvas, saida=None):
+    """Uma linha por escala (desvio x ângulo) e as degradações, um painel por descritor; saida grava em arquivo"""
+    afins = curvas[curvas['tipo'] == 'afim']
+    degradacoes = curvas[curvas['tipo'] != 'afim']
+
+    fig, eixos = plt.subplots(2, len(DESCRITORES), figsize=(3 * len(DESCRITORES), 7))
+    for j, nome in enumerate(DESCRITORES):
+        for (escala, espelhamento), grupo in afins.groupby(['escala', afins['espelhamento'].fillna('-')]):
+            rotulo = f"escala {escala:g}" + (f" ({espelhamento})" if espelhamento != '-' else "")
+            eixos[0, j].plot(grupo['angulo'], grupo[nome], label=rotulo)
+        eixos[0, j].set_title(nome, fontsize=10, fontweight='bold')
+        eixos[0, j].set_xlabel('Ângulo (°)')
+
+        rotulos = [f"{t} {v:g}" for t, v in zip(degradacoes['tipo'], degradacoes['valor'])]
+        eixos[1, j].barh(rotulos, degradacoes[nome], color='steelblue')
+        eixos[1, j].tick_params(axis='y', labelsize=7)
+        if j > 0:
+            eixos[1, j].set_yticklabels([])
+
+    eixos[0, 0].set_ylabel('Desvio absoluto médio')
+    eixos[0, 0].legend(fontsize=7)
+    plt.suptitle('Robustez dos Descritores por Transformação', fontsize=14, fontweight='bold')
+    plt.tight_layout()
+    mostrar_ou_salvar(fig, saida)
+
+# ============================================
+# EXECUÇÃO PRINCIPAL
+# ============================================
+
+if __name__ == "__main__":
+    dataset_path = "./Kimia99_DB"  # Ajuste conforme necessário
+    n_workers = os.cpu_count() or 1
+    modo_cantos = "contorno"       # "harris": Harris sobre o contorno rasterizado de cada forma (mais lento)
+    avaliacao = "analitica"        # "raster" reprocessa cada imagem transformada (referência, bem mais lento)
+
+    espec = dict(ESPEC_PADRAO)
+    espec["angulos"] = {"inicio": 0, "fim": 360, "passo": 1}
+    espec["escalas"] = [0.5, 0.75, 1.0, 1.5]
+
+    imagens = listar_imagens(dataset_path)
+
+    print("=" * 60)
+    print("VARREDURA DE TRANSFORMAÇÕES")
+    print("=" * 60)
+    print(f"{len(imagens)} imagens x {contar_transformacoes(espec)} transformações, {n_workers} processos")
+
+    inicio = time.perf_counter()
+    resultado = varredura(imagens, espec, n_workers=n_workers, modo_cantos=modo_cantos, avaliacao=avaliacao)
+    print(f"Concluída em {time.perf_counter() - inicio:.1f} s")
+
+    curvas = curvas_robustez(resultado)
+    curvas.to_csv("curvas_robustez.csv", index=False)
+    np.save("varredura_valores.npy", resultado["valores"])
+    print("Curvas salvas em curvas_robustez.csv; valores (imagens x transformações x descritores) "
+          "em varredura_valores.npy")
+
+    plotar_curvas(curvas)